@@ -4,28 +4,44 @@ Implementace metodiky TOPSIS pro hodnocení platforem.
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+from caching import set_cache_backend
+
+# The core modules are Streamlit-free; cache their loaders across reruns and sessions
+# (the score catalog is a shared resource, so it is not pickled and copied per call)
+set_cache_backend(st.cache_data, st.cache_resource)
+
 from data_loader import (
-    load_platform_scores, load_default_weights, load_metric_definitions,
+    load_platform_scores, load_default_weights, load_metric_definitions, load_catalog,
     prepare_topsis_input, get_dimension_order, get_platform_colors
 )
-from topsis import (
-    run_topsis_analysis, calculate_dimension_scores, 
-    calculate_hierarchical_weights, normalize_weights
-)
-from visualization import (
-    create_radar_chart, create_topsis_bar_chart, 
-    create_dimension_weights_pie, create_ranking_table
-)
-from export import (
-    export_to_csv, export_detailed_csv, 
-    generate_pdf_report, create_download_filename
-)
+from topsis import normalize_weights
+from weight_hierarchy import WeightHierarchy
+from sensitivity import run_sensitivity_analysis
+from incremental import IncrementalTopsis
+from results_cache import run_cached_analysis
+from tracing import trace
+
+# visualization (Plotly) and export (ReportLab) are imported inside the views
+# that render charts and reports, so the landing page does not pay for them.
+
+# Ranked platforms kept per analysis, and rows per page of the result tables
+RESULTS_TOP_K = 100
+RESULTS_PAGE_SIZE = 20
+
+# Platforms shown as result cards and in the bar and radar charts
+RESULT_CARD_COUNT = 3
+CHART_PLATFORM_COUNT = 20
+RADAR_PLATFORM_COUNT = 8
+
+# Weight vectors sampled by the sensitivity tab (started on request)
+SENSITIVITY_SAMPLES = 50_000
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 st.set_page_config(
@@ -184,6 +200,12 @@ def init_session():
         st.session_state.dim_weights = {}
     if 'results' not in st.session_state:
         st.session_state.results = None
+    if 'pdf_requested' not in st.session_state:
+        st.session_state.pdf_requested = False
+    if 'xlsx_requested' not in st.session_state:
+        st.session_state.xlsx_requested = False
+    if 'sensitivity_requested' not in st.session_state:
+        st.session_state.sensitivity_requested = False
 
 
 def reset_session():
@@ -191,6 +213,9 @@ def reset_session():
     st.session_state.metric_weights = {}
     st.session_state.dim_weights = {}
     st.session_state.results = None
+    st.session_state.pdf_requested = False
+    st.session_state.xlsx_requested = False
+    st.session_state.sensitivity_requested = False
 
 
 def show_landing():
@@ -273,25 +298,21 @@ def show_landing():
                 """)
 
 
-def get_platform_color(platform_name):
-    """Get the color for a specific platform."""
-    colors = get_platform_colors()
-    return colors.get(platform_name, '#667eea')
-
-
 def display_result_cards(ranking, scores):
-    """Display results as professional cards with platform colors."""
-    platforms = list(ranking.index)
+    """Display the best platforms as professional cards with platform colors."""
+    platforms = list(ranking.index[:RESULT_CARD_COUNT])
+    if not platforms:
+        return
+    colors = get_platform_colors(platforms)
     
-    col1, col2, col3 = st.columns(3)
-    cols = [col1, col2, col3]
+    cols = st.columns(len(platforms))
     
     for i, (col, platform) in enumerate(zip(cols, platforms)):
         with col:
             platform_name = platform.replace('_', ' ')
             score = scores.get(platform, 0)
             rank = i + 1
-            color = get_platform_color(platform)
+            color = colors[platform]
             
             st.markdown(f"""
             <div class="result-card" style="background: {color};">
@@ -303,58 +324,47 @@ def display_result_cards(ranking, scores):
             """, unsafe_allow_html=True)
 
 
+def display_top_k_note(topsis_results):
+    """Point out that only the best platforms are shown when the ranking was cut to RESULTS_TOP_K."""
+    total = len(topsis_results['topsis_scores'])
+    if len(topsis_results['ranking']) < total:
+        st.caption(f"Zobrazeno {len(topsis_results['ranking'])} nejlepších z {total} platforem; "
+                   "exporty (CSV, Excel, PDF) obsahují všechny platformy.")
+
+
+def paginate(platforms, key):
+    """Return one page of ranked platforms and the rank of its first platform."""
+    platforms = list(platforms)
+    if len(platforms) <= RESULTS_PAGE_SIZE:
+        return platforms, 1
+    
+    pages = (len(platforms) - 1) // RESULTS_PAGE_SIZE + 1
+    page = st.number_input(f"Stránka (1–{pages})", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * RESULTS_PAGE_SIZE
+    return platforms[start:start + RESULTS_PAGE_SIZE], start + 1
+
+
 def display_detailed_weights(dim_weights, metric_weights):
     """Display detailed breakdown of dimension and metric weights."""
     st.markdown("### Rozložení vah dimenzí")
     
-    # Create simple bar chart
-    dim_data = pd.DataFrame({
-        'Dimenze': [d.replace('_', ' ') for d in dim_weights.keys()],
-        'Váha (%)': [v * 100 for v in dim_weights.values()]
-    })
-    
-    import plotly.graph_objects as go
-    
-    fig = go.Figure(data=[
-        go.Bar(
-            x=dim_data['Váha (%)'],
-            y=dim_data['Dimenze'],
-            orientation='h',
-            marker=dict(
-                color=['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b'],
-                line=dict(color='rgba(0,0,0,0.2)', width=1)
-            ),
-            text=dim_data['Váha (%)'].apply(lambda x: f'{x:.1f}%'),
-            textposition='auto',
-        )
-    ])
-    
-    fig.update_layout(
-        height=300,
-        margin=dict(l=20, r=20, t=20, b=20),
-        xaxis_title="Váha (%)",
-        yaxis_title="",
-        showlegend=False,
-        xaxis=dict(range=[0, max(dim_data['Váha (%)']) * 1.1])
-    )
+    from visualization import create_dimension_weights_bar
     
+    fig = create_dimension_weights_bar(dim_weights)
     st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
     st.markdown("### Detailní breakdown metrik")
     
-    scores_df, _ = load_platform_scores()
+    catalog = load_catalog()
     
     for dimension in get_dimension_order():
         dim_name = dimension.replace('_', ' ')
         dim_weight = dim_weights.get(dimension, 0)
         
         with st.expander(f"**{dim_name}** — {dim_weight*100:.1f}%", expanded=False):
-            # Get metrics for this dimension
-            dim_metrics = scores_df[scores_df['Dimension'] == dimension]['Metric'].tolist()
-            
             # Create table
-            for metric in dim_metrics:
+            for metric in catalog.metrics_of(dimension):
                 metric_name = metric.replace('_', ' ')
                 if dimension in metric_weights and metric in metric_weights[dimension]:
                     metric_weight = metric_weights[dimension][metric]
@@ -371,6 +381,86 @@ def display_detailed_weights(dim_weights, metric_weights):
             st.caption("Levý sloupec: relativní váha v rámci dimenze | Pravý sloupec: finální hierarchická váha")
 
 
+def display_pdf_download(file_prefix, build_report):
+    """Offer the PDF report, building it only after the user asks for it."""
+    from export import create_download_filename
+    
+    if st.session_state.pdf_requested:
+        st.download_button(
+            "Stáhnout PDF zprávu",
+            build_report(),
+            create_download_filename(file_prefix, "pdf"),
+            "application/pdf",
+            use_container_width=True
+        )
+    elif st.button("Připravit PDF zprávu", use_container_width=True):
+        st.session_state.pdf_requested = True
+        st.rerun()
+
+
+def display_xlsx_download(file_prefix, build_workbook):
+    """Offer the Excel workbook, building it only after the user asks for it."""
+    from export import create_download_filename
+    
+    if st.session_state.xlsx_requested:
+        st.download_button(
+            "Stáhnout Excel (XLSX)",
+            build_workbook(),
+            create_download_filename(file_prefix, "xlsx"),
+            XLSX_MIME,
+            use_container_width=True
+        )
+    elif st.button("Připravit Excel (XLSX)", use_container_width=True,
+                   help="List Sensitivity obsahuje výsledky, pokud byla spuštěna analýza citlivosti."):
+        st.session_state.xlsx_requested = True
+        st.rerun()
+
+
+@st.cache_data(show_spinner=False)
+def get_sensitivity_results(topsis_input, dim_weights, metric_weights, metric_types):
+    """Run the weight-sensitivity simulation once per weight configuration."""
+    return run_sensitivity_analysis(
+        topsis_input, dim_weights, metric_weights, metric_types,
+        n_samples=SENSITIVITY_SAMPLES, workers=1, seed=42
+    )
+
+
+def requested_sensitivity(topsis_input, dim_weights, metric_weights, metric_types):
+    """Sensitivity results if the user has run the simulation, otherwise None."""
+    if not st.session_state.sensitivity_requested:
+        return None
+    return get_sensitivity_results(topsis_input, dim_weights, metric_weights, metric_types)
+
+
+def display_sensitivity(topsis_input, dim_weights, metric_weights, metric_types):
+    """Display rank stability of the platforms under perturbed weights, once the user starts the simulation."""
+    if not st.session_state.sensitivity_requested:
+        samples = f"{SENSITIVITY_SAMPLES:,}".replace(',', ' ')
+        st.caption(f"Simulace přepočítá TOPSIS pro {samples} náhodně perturbovaných vah kolem použitých vah.")
+        if st.button("Spustit analýzu citlivosti"):
+            st.session_state.sensitivity_requested = True
+            st.rerun()
+        return
+    
+    sensitivity = get_sensitivity_results(topsis_input, dim_weights, metric_weights, metric_types)
+    
+    samples = f"{sensitivity['samples']:,}".replace(',', ' ')
+    
+    st.markdown("### Stabilita pořadí")
+    st.caption(f"Pravděpodobnost umístění při náhodné perturbaci vah ({samples} vzorků kolem použitých vah)")
+    
+    probabilities = sensitivity['rank_probabilities'] * 100
+    probabilities.index = [p.replace('_', ' ') for p in probabilities.index]
+    probabilities.columns = [f"{rank}. místo (%)" for rank in probabilities.columns]
+    st.dataframe(probabilities.round(1), use_container_width=True)
+    
+    st.markdown("### Rozpětí TOPSIS skóre")
+    quantiles = sensitivity['score_quantiles'].copy()
+    quantiles.index = [p.replace('_', ' ') for p in quantiles.index]
+    quantiles.columns = [f"{q*100:.0f}. percentil" for q in quantiles.columns]
+    st.dataframe(quantiles.round(3), use_container_width=True)
+
+
 def show_average_mode():
     st.title("Hodnocení s průměrnými váhami")
     
@@ -385,9 +475,18 @@ def show_average_mode():
         # Display detailed weights
         display_detailed_weights(dim_weights, metric_weights)
     
-    topsis_input = prepare_topsis_input(scores_df)
-    topsis_results = run_topsis_analysis(topsis_input, hierarchical_weights, metric_types)
-    dimension_scores = calculate_dimension_scores(scores_df)
+    from visualization import create_radar_chart, create_topsis_bar_chart, create_ranking_table
+    from export import (export_to_csv, export_detailed_csv, get_xlsx_report, get_pdf_report,
+                            create_download_filename)
+    
+    catalog = load_catalog()
+    topsis_input = prepare_topsis_input(scores_df, catalog)
+    hierarchy = WeightHierarchy.from_dicts(dim_weights, metric_weights, metrics=catalog.metrics)
+    topsis_results, dimension_scores = run_cached_analysis(
+        scores_df, hierarchical_weights, metric_types,
+        metric_weights=hierarchy.metric_weights, top_k=RESULTS_TOP_K, catalog=catalog
+    )
+    ranked_platforms = list(topsis_results['ranking'].index)
     
     st.markdown("---")
     st.markdown("## Výsledky")
@@ -399,37 +498,44 @@ def show_average_mode():
     st.markdown("##")
     st.markdown("---")
     
-    tab1, tab2 = st.tabs(["TOPSIS skóre", "Srovnání podle dimenzí"])
+    tab1, tab2, tab3 = st.tabs(["TOPSIS skóre", "Srovnání podle dimenzí", "Citlivost vah"])
     
     with tab1:
         st.markdown("### Finální skóre")
-        platform_colors = get_platform_colors()
-        fig_bar = create_topsis_bar_chart(topsis_results['topsis_scores'], platform_colors)
+        platform_colors = get_platform_colors(ranked_platforms)
+        fig_bar = create_topsis_bar_chart(topsis_results['ranking'].head(CHART_PLATFORM_COUNT), platform_colors)
         st.plotly_chart(fig_bar, use_container_width=True)
         
         st.markdown("### Pořadí")
+        page_platforms, first_rank = paginate(ranked_platforms, "average_ranking_page")
         ranking_table = create_ranking_table(
             topsis_results['topsis_scores'],
             topsis_results['d_plus'],
-            topsis_results['d_minus']
+            topsis_results['d_minus'],
+            page_platforms, first_rank
         )
         st.dataframe(ranking_table, hide_index=True, use_container_width=True)
+        display_top_k_note(topsis_results)
     
     with tab2:
         st.markdown("### Srovnání podle dimenzí")
-        fig_radar = create_radar_chart(dimension_scores, platform_colors)
+        fig_radar = create_radar_chart(dimension_scores[ranked_platforms[:RADAR_PLATFORM_COUNT]], platform_colors)
         st.plotly_chart(fig_radar, use_container_width=True)
         
         st.markdown("### Skóre podle dimenzí")
-        display_scores = dimension_scores.copy()
+        page_platforms, _ = paginate(ranked_platforms, "average_dimension_page")
+        display_scores = dimension_scores[page_platforms].copy()
         display_scores.index = [idx.replace('_', ' ') for idx in display_scores.index]
         display_scores.columns = [col.replace('_', ' ') for col in display_scores.columns]
         st.dataframe(display_scores.T, use_container_width=True)
     
+    with tab3:
+        display_sensitivity(topsis_input, dim_weights, metric_weights, metric_types)
+    
     st.markdown("---")
     st.markdown("## Export")
     
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         csv_data = export_to_csv(topsis_results, dimension_scores, scores_df)
@@ -452,17 +558,39 @@ def show_average_mode():
         )
     
     with col3:
-        pdf_data = generate_pdf_report(
+        display_xlsx_download("topsis_analyza", lambda: get_xlsx_report(
+            topsis_results, dimension_scores, dim_weights, metric_weights,
+            requested_sensitivity(topsis_input, dim_weights, metric_weights, metric_types)
+        ))
+    
+    with col4:
+        display_pdf_download("topsis_zprava", lambda: get_pdf_report(
             topsis_results, dimension_scores, scores_df, 
             hierarchical_weights, dim_weights, mode="average"
-        )
-        st.download_button(
-            "Stáhnout PDF zprávu",
-            pdf_data,
-            create_download_filename("topsis_zprava", "pdf"),
-            "application/pdf",
-            use_container_width=True
-        )
+        ))
+
+
+def build_custom_weights(scores_df):
+    """Turn the session's metric ratings and dimension points into a normalized weight hierarchy."""
+    return WeightHierarchy.from_scores(
+        scores_df, st.session_state.dim_weights, st.session_state.metric_weights
+    ).normalized()
+
+
+def display_live_scores(scores_df, metric_types, weight_vector):
+    """Display TOPSIS scores updated incrementally as the weights change."""
+    if 'live_topsis' not in st.session_state:
+        st.session_state.live_topsis = IncrementalTopsis(prepare_topsis_input(scores_df, load_catalog()), metric_types)
+    
+    live = st.session_state.live_topsis
+    live.set_weights(weight_vector)
+    live_scores = live.topsis_scores.nlargest(RESULT_CARD_COUNT)
+    
+    st.markdown("#### Průběžné skóre")
+    cols = st.columns(len(live_scores))
+    for col, (platform, score) in zip(cols, live_scores.items()):
+        with col:
+            st.metric(platform.replace('_', ' '), f"{score:.3f}")
 
 
 def show_custom_mode():
@@ -486,13 +614,16 @@ def show_custom_mode():
             st.session_state.metric_weights = {}
             st.session_state.dim_weights = {}
             st.session_state.results = None
+            st.session_state.sensitivity_requested = False
+            st.session_state.xlsx_requested = False
             st.rerun()
     
     scores_df, metric_types = load_platform_scores()
+    catalog = load_catalog()
     metric_defs = load_metric_definitions()
     dimensions = get_dimension_order()
     
-    total_metrics = len(scores_df)
+    total_metrics = len(catalog.metrics)
     completed = len(st.session_state.metric_weights)
     
     st.markdown(f"### Krok 1: Ohodnoťte metriky ({completed}/{total_metrics})")
@@ -516,9 +647,7 @@ def show_custom_mode():
     for dimension in dimensions:
         # Always keep expanders open for better UX
         with st.expander(f"📊 {dimension.replace('_', ' ')}", expanded=True):
-            dim_metrics = scores_df[scores_df['Dimension'] == dimension]['Metric'].tolist()
-            
-            for metric in dim_metrics:
+            for metric in catalog.metrics_of(dimension):
                 col1, col2 = st.columns([2, 3])
                 
                 with col1:
@@ -586,43 +715,49 @@ def show_custom_mode():
             """, unsafe_allow_html=True)
             
             if valid:
+                from visualization import create_dimension_weights_pie
+                
                 fig_pie = create_dimension_weights_pie(
                     normalize_weights(st.session_state.dim_weights)
                 )
                 st.plotly_chart(fig_pie, use_container_width=True)
         
+        if total > 0:
+            display_live_scores(scores_df, metric_types, build_custom_weights(scores_df).hierarchical_vector())
+        
         st.markdown("---")
         
         if valid and st.button("Vypočítat TOPSIS skóre", type="primary", use_container_width=True):
             with st.spinner("Probíhá výpočet..."):
-                dim_weights_norm = normalize_weights(st.session_state.dim_weights)
-                
-                metric_weights_by_dim = {}
-                for dim in dimensions:
-                    dim_metrics = scores_df[scores_df['Dimension'] == dim]['Metric'].tolist()
-                    dim_metric_w = {m: st.session_state.metric_weights[m] for m in dim_metrics}
-                    metric_weights_by_dim[dim] = normalize_weights(dim_metric_w)
-                
-                hierarchical = calculate_hierarchical_weights(dim_weights_norm, metric_weights_by_dim)
+                hierarchy = build_custom_weights(scores_df)
                 
-                topsis_input = prepare_topsis_input(scores_df)
-                topsis_results = run_topsis_analysis(topsis_input, hierarchical, metric_types)
-                dimension_scores = calculate_dimension_scores(scores_df)
+                topsis_results, dimension_scores = run_cached_analysis(
+                    scores_df, hierarchy.hierarchical_vector(), metric_types,
+                    metric_weights=hierarchy.metric_weights, top_k=RESULTS_TOP_K, catalog=catalog
+                )
                 
+                st.session_state.pdf_requested = False
+                st.session_state.xlsx_requested = False
+                st.session_state.sensitivity_requested = False
                 st.session_state.results = {
                     'topsis': topsis_results,
                     'dimensions': dimension_scores,
-                    'hierarchical': hierarchical,
-                    'dim_weights': dim_weights_norm,
-                    'metric_weights': metric_weights_by_dim
+                    'hierarchical': hierarchy.hierarchical_dict(),
+                    'dim_weights': hierarchy.dimension_dict(),
+                    'metric_weights': hierarchy.metric_dicts()
                 }
                 
                 st.rerun()
     
     if st.session_state.results:
+        from visualization import create_radar_chart, create_topsis_bar_chart, create_ranking_table
+        from export import (export_to_csv, export_detailed_csv, get_xlsx_report, get_pdf_report,
+                            create_download_filename)
+        
         results = st.session_state.results
         topsis_results = results['topsis']
         dimension_scores = results['dimensions']
+        ranked_platforms = list(topsis_results['ranking'].index)
         
         st.markdown("---")
         st.markdown("## Vaše výsledky")
@@ -639,28 +774,37 @@ def show_custom_mode():
         
         st.markdown("---")
         
-        tab1, tab2 = st.tabs(["TOPSIS skóre", "Srovnání podle dimenzí"])
+        tab1, tab2, tab3 = st.tabs(["TOPSIS skóre", "Srovnání podle dimenzí", "Citlivost vah"])
         
         with tab1:
-            platform_colors = get_platform_colors()
-            fig_bar = create_topsis_bar_chart(topsis_results['topsis_scores'], platform_colors)
+            platform_colors = get_platform_colors(ranked_platforms)
+            fig_bar = create_topsis_bar_chart(topsis_results['ranking'].head(CHART_PLATFORM_COUNT), platform_colors)
             st.plotly_chart(fig_bar, use_container_width=True)
             
+            page_platforms, first_rank = paginate(ranked_platforms, "custom_ranking_page")
             ranking_table = create_ranking_table(
                 topsis_results['topsis_scores'],
                 topsis_results['d_plus'],
-                topsis_results['d_minus']
+                topsis_results['d_minus'],
+                page_platforms, first_rank
             )
             st.dataframe(ranking_table, hide_index=True, use_container_width=True)
+            display_top_k_note(topsis_results)
         
         with tab2:
-            fig_radar = create_radar_chart(dimension_scores, platform_colors)
+            fig_radar = create_radar_chart(dimension_scores[ranked_platforms[:RADAR_PLATFORM_COUNT]], platform_colors)
             st.plotly_chart(fig_radar, use_container_width=True)
         
+        with tab3:
+            display_sensitivity(
+                prepare_topsis_input(scores_df, catalog), results['dim_weights'],
+                results['metric_weights'], metric_types
+            )
+        
         st.markdown("---")
         st.markdown("## Export")
         
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             csv_data = export_to_csv(topsis_results, dimension_scores, scores_df)
@@ -683,28 +827,29 @@ def show_custom_mode():
             )
         
         with col3:
-            pdf_data = generate_pdf_report(
+            display_xlsx_download("vlastni_analyza", lambda: get_xlsx_report(
+                topsis_results, dimension_scores, results['dim_weights'], results['metric_weights'],
+                requested_sensitivity(prepare_topsis_input(scores_df, catalog), results['dim_weights'],
+                                      results['metric_weights'], metric_types)
+            ))
+        
+        with col4:
+            display_pdf_download("vlastni_zprava", lambda: get_pdf_report(
                 topsis_results, dimension_scores, scores_df,
                 results['hierarchical'], results['dim_weights'], mode="custom"
-            )
-            st.download_button(
-                "Stáhnout PDF zprávu",
-                pdf_data,
-                create_download_filename("vlastni_zprava", "pdf"),
-                "application/pdf",
-                use_container_width=True
-            )
+            ))
 
 
 def main():
     init_session()
     
-    if st.session_state.mode is None:
-        show_landing()
-    elif st.session_state.mode == "average":
-        show_average_mode()
-    elif st.session_state.mode == "custom":
-        show_custom_mode()
+    with trace(f"render.{st.session_state.mode or 'landing'}"):
+        if st.session_state.mode is None:
+            show_landing()
+        elif st.session_state.mode == "average":
+            show_average_mode()
+        elif st.session_state.mode == "custom":
+            show_custom_mode()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+"""
+Headless batch export for the DataOps Platform Comparison Tool.
+Runs TOPSIS for every weight profile in a file and writes a PDF report plus
+summary and detail CSVs per profile using a pool of worker processes.
+
+The profiles file uses the weights.csv layout with an extra Profile column;
+raw weights are normalized the same way as in custom mode (dimension
+weights across dimensions, metric weights within each dimension):
+
+    Profile,Level,Category,Item,Weight
+    client_a,dimension,all,Technical_Efficiency,20
+    client_a,metric,Technical_Efficiency,Pipeline_Speed,4
+    ...
+
+Usage:
+    python batch_export.py profiles.csv --output reports --workers 8
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from data_loader import load_platform_scores, prepare_topsis_input
+from topsis import run_topsis_analysis, calculate_dimension_scores, calculate_hierarchical_weights, normalize_weights
+from export import iter_summary_csv, iter_detailed_csv, generate_pdf_report
+
+
+def read_profiles(file_path: Path) -> Dict[str, Tuple[Dict[str, float], Dict[str, Dict[str, float]]]]:
+    """
+    Read weight profiles and normalize them.
+    
+    Args:
+        file_path: CSV file with Profile, Level, Category, Item and Weight columns
+    
+    Returns:
+        Dictionary mapping profile names to (dimension_weights, metric_weights)
+    """
+    df = pd.read_csv(file_path)
+    profiles = {}
+    
+    for profile, group in df.groupby('Profile', sort=False):
+        dimension_rows = group[group['Level'] == 'dimension']
+        dimension_weights = normalize_weights(dict(zip(dimension_rows['Item'], dimension_rows['Weight'])))
+        
+        metric_rows = group[group['Level'] == 'metric']
+        metric_weights = {
+            dimension: normalize_weights(dict(zip(rows['Item'], rows['Weight'])))
+            for dimension, rows in metric_rows.groupby('Category', sort=False)
+        }
+        
+        profiles[str(profile)] = (dimension_weights, metric_weights)
+    
+    return profiles
+
+
+def write_atomic(path: Path, data) -> None:
+    """
+    Write a file so that readers never observe a partially written result.
+    
+    Args:
+        path: Destination path
+        data: str or bytes content, or an iterable of bytes chunks (written as they arrive)
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    chunks = [data] if isinstance(data, bytes) else data
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def safe_filename(name: str) -> str:
+    """Replace characters that are not safe in file names."""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('._') or 'profile'
+
+
+def unique_filenames(names) -> Dict[str, str]:
+    """
+    Assign every profile a distinct safe file name.
+    
+    Names that sanitize to the same file name (case-insensitively, for
+    case-insensitive file systems), e.g. "client a" and "client_a", get a
+    numeric suffix in order of appearance so their outputs do not overwrite
+    each other.
+    
+    Returns:
+        Dictionary mapping profile names to file base names
+    """
+    used = set()
+    file_names = {}
+    for name in names:
+        base = candidate = safe_filename(name)
+        suffix = 2
+        while candidate.lower() in used:
+            candidate = f"{base}_{suffix}"
+            suffix += 1
+        used.add(candidate.lower())
+        file_names[name] = candidate
+    return file_names
+
+
+def export_profile(profile: str,
+                   dimension_weights: Dict[str, float],
+                   metric_weights: Dict[str, Dict[str, float]],
+                   output_dir: str,
+                   file_name: str = None) -> Tuple[str, float]:
+    """
+    Run TOPSIS for one profile and write its PDF, summary CSV and detail CSV.
+    
+    Args:
+        profile: Profile name
+        dimension_weights: Normalized dimension weights
+        metric_weights: Normalized metric weights per dimension
+        output_dir: Directory for the generated files
+        file_name: Base name of the files (default: the sanitized profile name)
+    
+    Returns:
+        Tuple of (profile, elapsed seconds)
+    """
+    start = time.perf_counter()
+    
+    scores_df, metric_types = load_platform_scores()
+    hierarchical = calculate_hierarchical_weights(dimension_weights, metric_weights)
+    topsis_results = run_topsis_analysis(prepare_topsis_input(scores_df), hierarchical, metric_types)
+    dimension_scores = calculate_dimension_scores(
+        scores_df, metric_weights={m: w for weights in metric_weights.values() for m, w in weights.items()}
+    )
+    
+    base = Path(output_dir) / (file_name or safe_filename(profile))
+    write_atomic(base.with_name(f"{base.name}_souhrn.csv"),
+                 iter_summary_csv(topsis_results, dimension_scores))
+    write_atomic(base.with_name(f"{base.name}_detail.csv"),
+                 iter_detailed_csv(scores_df, hierarchical))
+    write_atomic(base.with_name(f"{base.name}_zprava.pdf"),
+                 generate_pdf_report(topsis_results, dimension_scores, scores_df,
+                                     hierarchical, dimension_weights, mode="custom"))
+    
+    return profile, time.perf_counter() - start
+
+
+def run_batch_export(profiles_file: Path, output_dir: Path, workers: int = None) -> Dict:
+    """
+    Export reports for all profiles in parallel.
+    
+    Args:
+        profiles_file: CSV file with weight profiles
+        output_dir: Directory for the generated files
+        workers: Number of worker processes (defaults to all CPU cores)
+    
+    Returns:
+        Dictionary with reports, failures, elapsed, reports_per_sec, p50 and p95
+    """
+    profiles = read_profiles(profiles_file)
+    file_names = unique_filenames(profiles)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    durations = []
+    failures = {}
+    start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(export_profile, profile, dim_w, metric_w, str(output_dir), file_names[profile]): profile
+            for profile, (dim_w, metric_w) in profiles.items()
+        }
+        for future in as_completed(futures):
+            try:
+                durations.append(future.result()[1])
+            except Exception as exc:
+                failures[futures[future]] = repr(exc)
+    
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'reports': len(durations),
+        'failures': failures,
+        'elapsed': elapsed,
+        'reports_per_sec': len(durations) / elapsed if elapsed > 0 else 0.0,
+        'p50': float(np.percentile(durations, 50)) if durations else 0.0,
+        'p95': float(np.percentile(durations, 95)) if durations else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch export of TOPSIS reports for weight profiles")
+    parser.add_argument("profiles", type=Path, help="CSV file with weight profiles")
+    parser.add_argument("--output", type=Path, default=Path("reports"), help="Output directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+    
+    summary = run_batch_export(args.profiles, args.output, args.workers)
+    
+    print(f"Reports:      {summary['reports']}")
+    print(f"Elapsed:      {summary['elapsed']:.2f} s")
+    print(f"Throughput:   {summary['reports_per_sec']:.2f} reports/sec")
+    print(f"Per report:   p50 {summary['p50'] * 1000:.0f} ms, p95 {summary['p95'] * 1000:.0f} ms")
+    
+    if summary['failures']:
+        print(f"Failed:       {len(summary['failures'])}")
+        for profile, error in summary['failures'].items():
+            print(f"  {profile}: {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
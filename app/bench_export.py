@@ -0,0 +1,178 @@
+"""
+Throughput of the Excel export against the CSV export.
+Builds a TOPSIS analysis on random score matrices over a grid of platform
+and metric counts and writes every sheet of the workbook (see
+export.workbook_sheets) once as CSV, the way export_to_csv serializes its
+chunks, and once as a write-only XLSX sheet. Prints rows per second of both
+paths and the peak memory of the XLSX writer (tracemalloc, measured in a
+separate untimed call).
+
+Usage:
+    python bench_export.py [--platforms 3 100 1000 10000] [--metrics 20 200] [--repeat 3]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from export import _csv_chunks, workbook_sheets, write_xlsx
+from topsis import run_topsis_analysis, calculate_dimension_scores
+
+
+DEFAULT_PLATFORMS = [3, 100, 1000, 10000]
+DEFAULT_METRICS = [20]
+DIMENSIONS = 5
+
+
+def make_analysis(n_metrics: int, n_platforms: int, seed: int = 0) -> Dict:
+    """
+    Random Likert-style scores in DIMENSIONS dimensions with equal weights, and their analysis.
+    
+    Returns:
+        Keyword arguments of workbook_sheets (without sensitivity results)
+    """
+    rng = np.random.default_rng(seed)
+    metrics = [f"metric_{i}" for i in range(n_metrics)]
+    dimensions = [f"dimension_{i % DIMENSIONS}" for i in range(n_metrics)]
+    platforms = [f"platform_{j}" for j in range(n_platforms)]
+    values = rng.integers(1, 6, size=(n_metrics, n_platforms)).astype(np.float64)
+    
+    scores_df = pd.concat([
+        pd.DataFrame({'Dimension': dimensions, 'Metric': metrics}),
+        pd.DataFrame(values, columns=platforms)
+    ], axis=1)
+    metric_types = {metric: 'cost' if i % 5 == 0 else 'benefit' for i, metric in enumerate(metrics)}
+    
+    dimension_weights = {dimension: 1 / DIMENSIONS for dimension in sorted(set(dimensions))}
+    per_dimension = pd.Series(dimensions).value_counts()
+    metric_weights = {dimension: {} for dimension in dimension_weights}
+    for metric, dimension in zip(metrics, dimensions):
+        metric_weights[dimension][metric] = 1 / per_dimension[dimension]
+    hierarchical = {metric: dimension_weights[dimension] * metric_weights[dimension][metric]
+                    for metric, dimension in zip(metrics, dimensions)}
+    
+    topsis_input = scores_df.set_index('Metric')[platforms]
+    return {
+        'topsis_results': run_topsis_analysis(topsis_input, hierarchical, metric_types),
+        'dimension_scores': calculate_dimension_scores(scores_df),
+        'dimension_weights': dimension_weights,
+        'metric_weights': metric_weights
+    }
+
+
+def time_call(function: Callable[[], object], repeat: int) -> float:
+    """Median wall time of a call in seconds (after one warm-up call)."""
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def peak_memory(function: Callable[[], object]) -> int:
+    """Peak bytes allocated by one call."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(platform_counts: Sequence[int],
+              metric_counts: Sequence[int],
+              repeat: int = 3) -> List[Dict]:
+    """
+    Write every workbook sheet as CSV and as XLSX for each matrix size.
+    
+    Args:
+        platform_counts: Numbers of platforms
+        metric_counts: Numbers of metrics
+        repeat: Timed calls per measurement
+    
+    Returns:
+        One record per matrix size and sheet with rows, columns, rows/sec of both paths and the XLSX peak memory
+    """
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "sheet.csv"
+        xlsx_path = Path(tmp) / "sheet.xlsx"
+        
+        for n_metrics in metric_counts:
+            for n_platforms in platform_counts:
+                analysis = make_analysis(n_metrics, n_platforms)
+                
+                def sheet_chunks(name):
+                    return workbook_sheets(**analysis)[name]
+                
+                for name in workbook_sheets(**analysis):
+                    chunks = list(sheet_chunks(name))
+                    rows = sum(len(chunk) for chunk in chunks)
+                    
+                    def write_csv():
+                        with open(csv_path, 'wb') as f:
+                            for data in _csv_chunks(sheet_chunks(name)):
+                                f.write(data)
+                    
+                    def write_sheet():
+                        write_xlsx({name: sheet_chunks(name)}, xlsx_path)
+                    
+                    csv_seconds = time_call(write_csv, repeat)
+                    xlsx_seconds = time_call(write_sheet, repeat)
+                    records.append({
+                        'platforms': n_platforms,
+                        'metrics': n_metrics,
+                        'sheet': name,
+                        'rows': rows,
+                        'columns': chunks[0].shape[1],
+                        'csv_rows_per_sec': rows / csv_seconds,
+                        'xlsx_rows_per_sec': rows / xlsx_seconds,
+                        'xlsx_peak_bytes': peak_memory(write_sheet)
+                    })
+    return records
+
+
+def format_table(records: List[Dict]) -> List[str]:
+    """Console table of the throughput of both paths."""
+    lines = [f"{'metrics':>7} {'platforms':>9} {'sheet':<11} {'rows':>7} {'cols':>5} "
+             f"{'CSV rows/s':>12} {'XLSX rows/s':>12} {'XLSX/CSV':>9} {'XLSX peak MB':>13}"]
+    for record in records:
+        lines.append(
+            f"{record['metrics']:>7} {record['platforms']:>9} {record['sheet']:<11} {record['rows']:>7} "
+            f"{record['columns']:>5} {record['csv_rows_per_sec']:>12,.0f} {record['xlsx_rows_per_sec']:>12,.0f} "
+            f"{record['xlsx_rows_per_sec'] / record['csv_rows_per_sec']:>9.2f} "
+            f"{record['xlsx_peak_bytes'] / 1e6:>13.2f}"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the throughput of the XLSX and CSV exports")
+    parser.add_argument("--platforms", type=int, nargs='+', default=DEFAULT_PLATFORMS)
+    parser.add_argument("--metrics", type=int, nargs='+', default=DEFAULT_METRICS)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per measurement")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the records as JSON")
+    args = parser.parse_args()
+    
+    records = benchmark(args.platforms, args.metrics, args.repeat)
+    print('\n'.join(format_table(records)))
+    
+    if args.output:
+        args.output.write_text(json.dumps(records, indent=2), encoding='utf-8')
+        print(f"\n-> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Cost of the MCDA methods as the score matrix grows.
+Times the shared normalization stage and every registered method in
+src/mcda.py on random score matrices over a grid of platform and metric
+counts, and prints the median time per call.
+
+Usage:
+    python bench_mcda.py [--platforms 3 100 1000 10000] [--metrics 20 200] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from mcda import MCDA_METHODS
+from topsis import _benefit_mask, _normalize_array
+
+
+DEFAULT_PLATFORMS = [3, 100, 1000, 10000]
+DEFAULT_METRICS = [20, 200]
+
+
+def time_call(function: Callable[[], object], repeat: int) -> float:
+    """Median wall time of a call in seconds (after one warm-up call)."""
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def benchmark(platform_counts: Sequence[int],
+              metric_counts: Sequence[int],
+              repeat: int = 5,
+              seed: int = 0) -> List[Dict]:
+    """
+    Time normalization and every method for each matrix size.
+    
+    Args:
+        platform_counts: Numbers of platforms (matrix columns)
+        metric_counts: Numbers of metrics (matrix rows)
+        repeat: Timed calls per measurement
+        seed: Seed of the random score matrices
+    
+    Returns:
+        One record per matrix size with the median seconds per stage
+    """
+    rng = np.random.default_rng(seed)
+    records = []
+    
+    for n_metrics in metric_counts:
+        for n_platforms in platform_counts:
+            # Likert-style scores as in platform_scores.csv, a fifth of the metrics are costs
+            values = rng.integers(1, 6, size=(n_metrics, n_platforms)).astype(np.float64)
+            benefit = _benefit_mask(range(n_metrics), {i: 'cost' for i in range(0, n_metrics, 5)})
+            weights = rng.dirichlet(np.ones(n_metrics))
+            normalized = _normalize_array(values, benefit)
+            
+            timings = {'normalize': time_call(lambda: _normalize_array(values, benefit), repeat)}
+            for name, method in MCDA_METHODS.items():
+                timings[name] = time_call(lambda: method(normalized, weights), repeat)
+            
+            records.append({'platforms': n_platforms, 'metrics': n_metrics, 'seconds': timings})
+    
+    return records
+
+
+def format_table(records: List[Dict]) -> List[str]:
+    """Console table of the median milliseconds per stage."""
+    stages = list(records[0]['seconds'])
+    lines = [f"{'metrics':>7} {'platforms':>9} " + ' '.join(f"{stage:>12}" for stage in stages)]
+    for record in records:
+        cells = ' '.join(f"{record['seconds'][stage] * 1000:>9.3f} ms" for stage in stages)
+        lines.append(f"{record['metrics']:>7} {record['platforms']:>9} {cells}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the MCDA methods over growing score matrices")
+    parser.add_argument("--platforms", type=int, nargs='+', default=DEFAULT_PLATFORMS)
+    parser.add_argument("--metrics", type=int, nargs='+', default=DEFAULT_METRICS)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per measurement")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the records as JSON")
+    args = parser.parse_args()
+    
+    records = benchmark(args.platforms, args.metrics, args.repeat)
+    print('\n'.join(format_table(records)))
+    
+    if args.output:
+        args.output.write_text(json.dumps(records, indent=2), encoding='utf-8')
+        print(f"\n-> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Microbenchmarks of the TOPSIS engine with a regression gate.
+Times normalize_metrics, calculate_weighted_matrix, calculate_distances and
+run_topsis_analysis over a grid of platform and metric counts, and
+run_topsis_batch over batches of weight vectors. Every case is called at
+least `repeat` times and until it has run for a minimum total time, and
+records operations per second from the fastest call (the least disturbed by
+other load) and the peak memory allocated by one call (tracemalloc,
+measured in a separate untimed call).
+
+Runs are appended to a JSON history. Each run is compared with a baseline
+from the same machine and environment: the latest pinned run (--pin), or
+else the per-case median of the last BASELINE_RUNS runs. The script exits
+with status 1 when a case got slower or allocates more than the threshold
+allows. Cases faster than MIN_GATED_SECONDS are too noisy for the timing
+gate and only have their memory checked. Failing runs are not recorded.
+
+Usage:
+    python bench_topsis.py [--platforms 3 100 1000 10000 100000] [--metrics 20 200 2000]
+                           [--batch-sizes 1 100 1000] [--threshold 0.25] [--no-record] [--pin]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from topsis import (normalize_metrics, calculate_weighted_matrix, find_ideal_solutions,
+                    calculate_distances, run_topsis_analysis, run_topsis_batch)
+
+
+HISTORY_FILE = Path(__file__).parent / "bench_history" / "topsis.json"
+
+DEFAULT_PLATFORMS = [3, 100, 1000, 10000, 100000]
+DEFAULT_METRICS = [20, 200, 2000]
+DEFAULT_BATCH_SIZES = [1, 100, 1000]
+
+# Cases whose working set (cells x batch size) exceeds this are skipped
+DEFAULT_MAX_CELLS = 20_000_000
+
+# Allowed relative slowdown (ops/sec) and memory growth before the gate fails
+DEFAULT_THRESHOLD = 0.25
+
+# Minimum total time spent calling each case
+DEFAULT_MIN_TIME = 0.2
+
+# Unpinned baseline: per-case median over this many latest runs
+BASELINE_RUNS = 5
+
+# Cases whose baseline call is faster than this are not gated on time
+MIN_GATED_SECONDS = 1e-3
+
+
+def make_inputs(n_metrics: int, n_platforms: int, seed: int = 0) -> Tuple[pd.DataFrame, Dict[str, str], Dict[str, float]]:
+    """Random Likert-style score matrix, metric types (every fifth metric is a cost) and weights."""
+    rng = np.random.default_rng(seed)
+    metrics = [f"metric_{i}" for i in range(n_metrics)]
+    scores = pd.DataFrame(rng.integers(1, 6, size=(n_metrics, n_platforms)).astype(np.float64),
+                          index=metrics, columns=[f"platform_{j}" for j in range(n_platforms)])
+    metric_types = {metric: 'cost' if i % 5 == 0 else 'benefit' for i, metric in enumerate(metrics)}
+    weights = dict(zip(metrics, rng.dirichlet(np.ones(n_metrics))))
+    return scores, metric_types, weights
+
+
+def measure(function: Callable[[], object], repeat: int, min_time: float = DEFAULT_MIN_TIME) -> Dict[str, float]:
+    """
+    Time a call and measure its peak allocation.
+    
+    Args:
+        function: Call to measure
+        repeat: Minimum number of timed calls
+        min_time: Minimum total seconds of timed calls
+    
+    Returns:
+        Dictionary with best_s, median_s, calls, ops_per_sec (from best_s) and peak_bytes
+    """
+    function()
+    timings = []
+    while len(timings) < repeat or sum(timings) < min_time:
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    best = min(timings)
+    return {'best_s': best, 'median_s': statistics.median(timings), 'calls': len(timings),
+            'ops_per_sec': 1 / best if best > 0 else float('inf'), 'peak_bytes': peak}
+
+
+def case_key(case: Dict) -> Tuple:
+    """Identity of a case across runs."""
+    return case['function'], case['platforms'], case['metrics'], case.get('batch')
+
+
+def run_cases(platform_counts: Sequence[int],
+              metric_counts: Sequence[int],
+              batch_sizes: Sequence[int],
+              repeat: int = 5,
+              max_cells: int = DEFAULT_MAX_CELLS,
+              min_time: float = DEFAULT_MIN_TIME) -> List[Dict]:
+    """
+    Benchmark every function for each grid point.
+    
+    Args:
+        platform_counts: Numbers of platforms
+        metric_counts: Numbers of metrics
+        batch_sizes: Numbers of weight vectors for run_topsis_batch
+        repeat: Minimum timed calls per case
+        max_cells: Skip cases whose metrics x platforms (x batch) exceeds this
+        min_time: Minimum total seconds of timed calls per case
+    
+    Returns:
+        One record per case with its measurements
+    """
+    cases = []
+    for n_metrics in metric_counts:
+        for n_platforms in platform_counts:
+            if n_metrics * n_platforms > max_cells:
+                continue
+            
+            scores, metric_types, weights = make_inputs(n_metrics, n_platforms)
+            normalized = normalize_metrics(scores, metric_types)
+            weighted = calculate_weighted_matrix(normalized, weights)
+            pis, nis = find_ideal_solutions(weighted)
+            
+            functions = {
+                'normalize_metrics': lambda: normalize_metrics(scores, metric_types),
+                'calculate_weighted_matrix': lambda: calculate_weighted_matrix(normalized, weights),
+                'calculate_distances': lambda: calculate_distances(weighted, pis, nis),
+                'run_topsis_analysis': lambda: run_topsis_analysis(scores, weights, metric_types)
+            }
+            for name, function in functions.items():
+                cases.append({'function': name, 'platforms': n_platforms, 'metrics': n_metrics,
+                              **measure(function, repeat, min_time)})
+            
+            weight_rows = np.array([weights[metric] for metric in scores.index])
+            for batch in batch_sizes:
+                if batch * n_metrics * n_platforms > max_cells:
+                    continue
+                weight_matrix = np.tile(weight_rows, (batch, 1))
+                cases.append({'function': 'run_topsis_batch', 'platforms': n_platforms, 'metrics': n_metrics,
+                              'batch': batch,
+                              **measure(lambda: run_topsis_batch(scores, weight_matrix, metric_types),
+                                        repeat, min_time)})
+    return cases
+
+
+def environment() -> Dict[str, str]:
+    """Machine and library versions; runs are only compared within the same environment."""
+    return {
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__
+    }
+
+
+def load_history(path: Path) -> List[Dict]:
+    """Runs recorded so far (empty if the history does not exist)."""
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def find_baseline(history: List[Dict], env: Dict[str, str], runs: int = BASELINE_RUNS) -> Optional[Dict]:
+    """
+    Baseline of the runs recorded from the same environment.
+    
+    A pinned run is used as it is, so slow drift across runs still fails the
+    gate. Without one, every case takes the median ops/sec and peak memory of
+    its last `runs` recordings, so one noisy run does not move the baseline.
+    
+    Returns:
+        Dictionary with description and cases, or None without earlier runs
+    """
+    matching = [run for run in history if run['environment'] == env]
+    if not matching:
+        return None
+    
+    pinned = [run for run in matching if run.get('pinned')]
+    if pinned:
+        return {'description': f"the pinned run of {pinned[-1]['recorded_at']}", 'cases': pinned[-1]['cases']}
+    
+    recent = matching[-runs:]
+    recordings: Dict[Tuple, List[Dict]] = {}
+    for run in recent:
+        for case in run['cases']:
+            recordings.setdefault(case_key(case), []).append(case)
+    cases = [{**cases[-1],
+              'ops_per_sec': statistics.median(case['ops_per_sec'] for case in cases),
+              'peak_bytes': statistics.median(case['peak_bytes'] for case in cases)}
+             for cases in recordings.values()]
+    return {'description': f"the median of the last {len(recent)} runs", 'cases': cases}
+
+
+def find_regressions(cases: List[Dict], baseline: Dict, threshold: float,
+                     min_seconds: float = MIN_GATED_SECONDS) -> List[str]:
+    """
+    Compare the cases with a baseline.
+    
+    Returns:
+        Description of every case that is slower than (1 - threshold) x the
+        baseline ops/sec or allocates more than (1 + threshold) x its peak
+        memory; cases whose baseline call takes less than min_seconds are
+        only checked for memory
+    """
+    previous = {case_key(case): case for case in baseline['cases']}
+    regressions = []
+    for case in cases:
+        old = previous.get(case_key(case))
+        if old is None:
+            continue
+        label = f"{case['function']} ({case['metrics']} metrics x {case['platforms']} platforms"
+        label += f", batch {case['batch']})" if case.get('batch') else ")"
+        
+        gated = 1 / old['ops_per_sec'] >= min_seconds
+        if gated and case['ops_per_sec'] < old['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{label}: {old['ops_per_sec']:,.1f} -> {case['ops_per_sec']:,.1f} ops/sec")
+        if case['peak_bytes'] > old['peak_bytes'] * (1 + threshold):
+            regressions.append(f"{label}: peak {old['peak_bytes'] / 1e6:,.2f} -> {case['peak_bytes'] / 1e6:,.2f} MB")
+    return regressions
+
+
+def format_table(cases: List[Dict]) -> List[str]:
+    """Console table of the measurements."""
+    lines = [f"{'function':<26} {'metrics':>7} {'platforms':>9} {'batch':>6} {'ops/sec':>12} {'peak MB':>10}"]
+    for case in cases:
+        lines.append(
+            f"{case['function']:<26} {case['metrics']:>7} {case['platforms']:>9} {case.get('batch') or '':>6} "
+            f"{case['ops_per_sec']:>12,.1f} {case['peak_bytes'] / 1e6:>10.2f}"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TOPSIS engine and gate performance regressions")
+    parser.add_argument("--platforms", type=int, nargs='+', default=DEFAULT_PLATFORMS)
+    parser.add_argument("--metrics", type=int, nargs='+', default=DEFAULT_METRICS)
+    parser.add_argument("--batch-sizes", type=int, nargs='+', default=DEFAULT_BATCH_SIZES,
+                        help="Weight vectors per run_topsis_batch call")
+    parser.add_argument("--repeat", type=int, default=5, help="Minimum timed calls per case")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="Minimum total seconds of timed calls per case")
+    parser.add_argument("--max-cells", type=int, default=DEFAULT_MAX_CELLS,
+                        help="Skip cases with more matrix cells (x batch size)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown / memory growth")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE, help="JSON history file")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--pin", action="store_true", help="Record this run as the baseline of later runs")
+    args = parser.parse_args()
+    
+    cases = run_cases(args.platforms, args.metrics, args.batch_sizes, args.repeat, args.max_cells, args.min_time)
+    print('\n'.join(format_table(cases)))
+    
+    env = environment()
+    history = load_history(args.history)
+    baseline = find_baseline(history, env)
+    regressions = find_regressions(cases, baseline, args.threshold) if baseline else []
+    
+    if not args.no_record and not regressions:
+        history.append({
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'environment': env,
+            'repeat': args.repeat,
+            'min_time': args.min_time,
+            'pinned': args.pin,
+            'cases': cases
+        })
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        args.history.write_text(json.dumps(history, indent=2), encoding='utf-8')
+        print(f"\n-> {args.history}")
+    
+    if baseline is None:
+        print("\nNo earlier run from this environment; nothing to compare.")
+    elif regressions:
+        print(f"\n{len(regressions)} regressions against {baseline['description']} "
+              f"(threshold {args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    else:
+        print(f"\nNo regressions against {baseline['description']} (threshold {args.threshold:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Import-time profile of the DataOps Platform Comparison Tool.
+Measures the cold import cost of the module sets loaded by each part of the
+app (using python -X importtime in fresh interpreters) and writes a
+Markdown report.
+
+Usage:
+    python profile_imports.py [--runs 5] [--output import_profile.md]
+"""
+
+import argparse
+import ast
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+APP_DIR = Path(__file__).parent
+SRC_DIR = APP_DIR / 'src'
+
+
+def app_top_level_imports() -> List[str]:
+    """Streamlit and the src modules that app.py imports at module level, in import order."""
+    tree = ast.parse((APP_DIR / 'app.py').read_text(encoding='utf-8'))
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            root = name.split('.')[0]
+            if (root == 'streamlit' or (SRC_DIR / f"{root}.py").exists()) and root not in modules:
+                modules.append(root)
+    return modules
+
+
+LANDING_MODULES = app_top_level_imports()
+LAZY_MODULES = ['visualization', 'export']
+
+# Module sets imported by each stage of the app
+SCENARIOS = {
+    'Core (loading + TOPSIS)': ['data_loader', 'topsis'],
+    'Landing page (app.py top level)': LANDING_MODULES,
+    'Result views (charts)': ['visualization'],
+    'Result views (exports)': ['export'],
+    'Eager app.py before lazy loading': LANDING_MODULES + LAZY_MODULES,
+}
+
+APP_MODULES = {module for modules in SCENARIOS.values() for module in modules} - {'streamlit'}
+STARTUP_MODULES = {'site', 'encodings', 'io', 'zipimport', 'abc', 'codecs', 'stat', 'os', 'posixpath', 'genericpath'}
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)')
+
+
+def profile_modules(modules: List[str]) -> Tuple[float, Dict[str, int]]:
+    """
+    Import the modules in a fresh interpreter.
+    
+    Returns:
+        Tuple of (wall time in seconds, cumulative microseconds per third-party package)
+    """
+    code = (
+        "import sys, time; sys.path.insert(0, 'src'); t = time.perf_counter(); "
+        f"import {', '.join(modules)}; "
+        "print(time.perf_counter() - t)"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=APP_DIR, capture_output=True, text=True, check=True
+    )
+    
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        root = match.group(3).split('.')[0]
+        if root in APP_MODULES or root in STARTUP_MODULES or root.startswith('_'):
+            continue
+        # The outermost import of a package carries the cumulative cost of the package
+        packages[root] = max(packages.get(root, 0), int(match.group(2)))
+    
+    return float(result.stdout.strip().splitlines()[-1]), packages
+
+
+def build_report(runs: int) -> str:
+    """Profile all scenarios and format the Markdown report."""
+    lines = [
+        "# Import-time profile",
+        "",
+        f"Generated {datetime.now():%Y-%m-%d} with `python profile_imports.py --runs {runs}` "
+        f"(Python {platform.python_version()}, {platform.system()}).",
+        "Median wall time over fresh interpreters; the heaviest packages "
+        "are taken from the last run of `python -X importtime`.",
+        "",
+        "| Scenario | Modules | Median import time |",
+        "|----------|---------|--------------------|",
+    ]
+    
+    details = []
+    medians = {}
+    for scenario, modules in SCENARIOS.items():
+        timings = []
+        packages = {}
+        for _ in range(runs):
+            elapsed, packages = profile_modules(modules)
+            timings.append(elapsed)
+        
+        medians[scenario] = statistics.median(timings)
+        lines.append(f"| {scenario} | `{', '.join(modules)}` | {medians[scenario] * 1000:.0f} ms |")
+        
+        details.append(f"### {scenario}")
+        details.append("")
+        details.append("| Package | Cumulative import time |")
+        details.append("|---------|------------------------|")
+        for name, micros in sorted(packages.items(), key=lambda item: -item[1])[:8]:
+            details.append(f"| `{name}` | {micros / 1000:.0f} ms |")
+        details.append("")
+    
+    landing = medians['Landing page (app.py top level)']
+    eager = medians['Eager app.py before lazy loading']
+    lines += [
+        "",
+        f"Cold start saved by importing `{', '.join(LAZY_MODULES)}` lazily: "
+        f"{(eager - landing) * 1000:.0f} ms ({eager * 1000:.0f} ms -> {landing * 1000:.0f} ms, "
+        f"{(eager - landing) / eager:.0%})."
+    ]
+    
+    return '\n'.join(lines + [""] + ["## Heaviest imports", ""] + details)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time of the app modules")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=APP_DIR / "import_profile.md")
+    args = parser.parse_args()
+    
+    report = build_report(args.runs)
+    args.output.write_text(report, encoding='utf-8')
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Pluggable caching for the data loading functions.
+The core modules only mark functions as cacheable; the front end decides
+which backend stores the results (e.g. st.cache_data in the Streamlit app, and
+st.cache_resource for shared read-only objects such as the score catalog).
+"""
+
+import functools
+from typing import Callable, List, Optional, Tuple
+
+
+def _default_backend(func: Callable) -> Callable:
+    """In-process memoization; cached objects are shared and must be treated as read-only."""
+    return functools.lru_cache(maxsize=None)(func)
+
+
+# Backends per kind: 'data' results may be copied by the backend, 'resource' objects are shared as-is
+_backends = {'data': _default_backend, 'resource': _default_backend}
+_registry: List[Tuple[str, Callable]] = []
+
+
+def _register(func: Callable, kind: str) -> Callable:
+    """Wrap func with the current backend of its kind and remember it for backend changes."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return wrapper._impl(*args, **kwargs)
+
+    wrapper._impl = _backends[kind](func)
+    _registry.append((kind, wrapper))
+    return wrapper
+
+
+def cached(func: Callable) -> Callable:
+    """
+    Decorator marking a function as cacheable by the configured backend.
+
+    Args:
+        func: Function with hashable arguments
+
+    Returns:
+        Wrapper that delegates to the backend-wrapped function
+    """
+    return _register(func, 'data')
+
+
+def cached_resource(func: Callable) -> Callable:
+    """
+    Decorator marking a function whose result is a shared, read-only resource.
+
+    Unlike cached, the resource backend returns the stored object itself
+    (e.g. st.cache_resource) instead of a pickled copy, so large precomputed
+    objects are not serialized and copied on every call.
+
+    Args:
+        func: Function with hashable arguments
+
+    Returns:
+        Wrapper that delegates to the backend-wrapped function
+    """
+    return _register(func, 'resource')
+
+
+def set_cache_backend(backend: Callable[[Callable], Callable],
+                      resource_backend: Optional[Callable[[Callable], Callable]] = None) -> None:
+    """
+    Replace the cache backends for all cacheable functions.
+
+    Args:
+        backend: Decorator taking a function and returning its cached version,
+                 e.g. streamlit.cache_data or functools.lru_cache(maxsize=None)
+        resource_backend: Decorator for cached_resource functions, e.g.
+                          streamlit.cache_resource (default: keep the current one)
+    """
+    _backends['data'] = backend
+    if resource_backend is not None:
+        _backends['resource'] = resource_backend
+    for kind, wrapper in _registry:
+        wrapper._impl = _backends[kind](wrapper.__wrapped__)
+
+
+def clear_caches() -> None:
+    """Reset every cacheable function by re-wrapping it with the current backends."""
+    set_cache_backend(_backends['data'], _backends['resource'])
@@ -0,0 +1,92 @@
+"""
+Index of a platform scores table.
+Built once per scores file, the catalog maps dimensions, metrics and
+platforms to their positions in the score matrix so that UI and engine code
+can look them up directly instead of filtering the DataFrame. The
+dimension score matrix is aggregated once from the same group index.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from topsis import group_means
+from tracing import traced
+
+
+METADATA_COLUMNS = ('Dimension', 'Metric', 'Metric_Type')
+
+
+class ScoreCatalog:
+    """
+    Positions and metadata of a scores table.
+    
+    Attributes:
+        metrics: Metric names in row order
+        platforms: Platform names in column order
+        dimensions: Dimension names in order of first appearance
+        metric_row: Metric name -> row index
+        platform_column: Platform name -> column index
+        metric_dimension: Metric name -> dimension name
+        dimension_rows: Dimension name -> array of row indices
+        dimension_codes: Dimension position of every row
+        benefit: Boolean vector marking benefit metrics
+        values: (metrics x platforms) float64 score matrix (read-only)
+        topsis_input: values as a DataFrame with metrics as rows and platforms as columns
+        dimension_means: Mean score of every dimension (sorted) per platform
+    """
+    
+    def __init__(self, scores_df: pd.DataFrame, metric_types: Dict[str, str]):
+        """
+        Args:
+            scores_df: DataFrame with Dimension, Metric, and platform columns
+            metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+        """
+        self.metrics: List[str] = scores_df['Metric'].tolist()
+        self.platforms: List[str] = [c for c in scores_df.columns if c not in METADATA_COLUMNS]
+        codes, uniques = pd.factorize(scores_df['Dimension'])
+        self.dimensions: List[str] = list(uniques)
+        
+        self.metric_row = {metric: i for i, metric in enumerate(self.metrics)}
+        self.platform_column = {platform: j for j, platform in enumerate(self.platforms)}
+        self.metric_dimension = dict(zip(self.metrics, scores_df['Dimension'].tolist()))
+        self.dimension_codes = codes.astype(np.intp)
+        self.dimension_rows = {d: np.flatnonzero(codes == i) for i, d in enumerate(self.dimensions)}
+        self._dimension_metrics = {d: [self.metrics[i] for i in rows] for d, rows in self.dimension_rows.items()}
+        
+        self.benefit = np.array([metric_types.get(m, 'benefit') == 'benefit' for m in self.metrics], dtype=bool)
+        self.values = np.ascontiguousarray(scores_df[self.platforms].to_numpy(dtype=np.float64))
+        self.values.flags.writeable = False
+        self.topsis_input = pd.DataFrame(self.values, index=pd.Index(self.metrics, name='Metric'),
+                                         columns=self.platforms)
+        
+        # Dimension scores are reported in sorted order, as groupby() would
+        order = np.argsort(uniques)
+        self._sorted_codes = np.argsort(order)[codes]
+        self._dimension_index = pd.Index(np.asarray(uniques)[order], name='Dimension')
+        self.dimension_means = self._aggregate(None)
+    
+    def metrics_of(self, dimension: str) -> List[str]:
+        """Metric names of a dimension in row order (empty for unknown dimensions)."""
+        return self._dimension_metrics.get(dimension, [])
+    
+    def dimension_scores(self, metric_weights: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Aggregate metric scores per dimension.
+        
+        Args:
+            metric_weights: Within-dimension weight of every metric, aligned to
+                            self.metrics (default: plain mean)
+        
+        Returns:
+            DataFrame with dimensions as rows (sorted) and platforms as columns
+        """
+        if metric_weights is None:
+            return self.dimension_means
+        return self._aggregate(metric_weights)
+    
+    @traced('dimension_scores')
+    def _aggregate(self, metric_weights: Optional[np.ndarray]) -> pd.DataFrame:
+        """Dimension score DataFrame from the precomputed group index."""
+        means = group_means(self.values, self._sorted_codes, len(self.dimensions), metric_weights)
+        return pd.DataFrame(means, index=self._dimension_index, columns=self.platforms)
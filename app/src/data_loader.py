@@ -5,28 +5,52 @@ Handles loading and caching of platform scores, weights, and metric definitions.
 
 import pandas as pd
 import json
-import streamlit as st
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple
+
+from caching import cached, cached_resource
+from catalog import ScoreCatalog
+from score_store import read_scores, read_weights
+from weight_hierarchy import WeightHierarchy
 
 
 # Get the base directory (DataApp folder)
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
+# Colors of the evaluated platforms; other platforms cycle through the fallback palette
+PLATFORM_COLORS = {
+    'Keboola': '#228DFF',
+    'Microsoft_Fabric': '#7AD5B1',
+    'Databricks': '#FF3D2A'
+}
+FALLBACK_COLORS = [
+    '#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A',
+    '#19D3F3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52'
+]
+
 
-@st.cache_data
-def load_platform_scores() -> Tuple[pd.DataFrame, Dict[str, str]]:
+@cached
+def load_platform_scores(file_name: str = "platform_scores.csv",
+                         platforms: Optional[Tuple[str, ...]] = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
     """
-    Load platform evaluation scores from CSV file.
+    Load platform evaluation scores.
+    
+    The converted Arrow store (see score_store.py) is memory-mapped when it is
+    available and up to date; otherwise the CSV file is parsed.
+    
+    Args:
+        file_name: Scores file in the data folder (or an absolute path), e.g. a
+                   versioned file written by research/benchmark/score_benchmarks.py
+        platforms: Platform columns to load (default: all platforms)
     
     Returns:
         Tuple of (DataFrame, metric_types_dict)
         - DataFrame: Contains Dimension, Metric, and platform scores
         - Dict: Maps metric names to 'benefit' or 'cost'
     """
-    file_path = DATA_DIR / "platform_scores.csv"
-    df = pd.read_csv(file_path)
+    file_path = DATA_DIR / file_name
+    df = read_scores(file_path, platforms)
     
     # Create metric types dictionary
     metric_types = dict(zip(df['Metric'], df['Metric_Type']))
@@ -34,7 +58,22 @@ def load_platform_scores() -> Tuple[pd.DataFrame, Dict[str, str]]:
     return df, metric_types
 
 
-@st.cache_data
+@cached_resource
+def load_catalog(file_name: str = "platform_scores.csv") -> ScoreCatalog:
+    """
+    Build the index of a scores file (dimension, metric and platform positions).
+    
+    Args:
+        file_name: Scores file in the data folder (see load_platform_scores)
+    
+    Returns:
+        ScoreCatalog for the loaded scores (shared, must not be modified)
+    """
+    scores_df, metric_types = load_platform_scores(file_name)
+    return ScoreCatalog(scores_df, metric_types)
+
+
+@cached
 def load_default_weights() -> Tuple[Dict[str, float], Dict[str, Dict[str, float]], Dict[str, float]]:
     """
     Load pre-calculated average weights from the thesis research.
@@ -46,36 +85,19 @@ def load_default_weights() -> Tuple[Dict[str, float], Dict[str, Dict[str, float]
         - hierarchical_weights: Dict mapping metric names to final hierarchical weights
     """
     file_path = DATA_DIR / "weights.csv"
-    df = pd.read_csv(file_path)
-    
-    # Extract dimension weights
-    dimension_df = df[df['Level'] == 'dimension']
-    dimension_weights = dict(zip(dimension_df['Item'], dimension_df['Normalized_Weight']))
-    
-    # Extract metric weights (organized by dimension)
-    metric_df = df[df['Level'] == 'metric']
-    metric_weights = {}
-    
-    for _, row in metric_df.iterrows():
-        dimension = row['Category']
-        metric = row['Item']
-        weight = row['Normalized_Weight']
-        
-        if dimension not in metric_weights:
-            metric_weights[dimension] = {}
-        metric_weights[dimension][metric] = weight
-    
-    # Calculate hierarchical weights (dimension weight × metric weight)
-    hierarchical_weights = {}
-    for dimension, dim_weight in dimension_weights.items():
-        if dimension in metric_weights:
-            for metric, metric_weight in metric_weights[dimension].items():
-                hierarchical_weights[metric] = dim_weight * metric_weight
+    df = read_weights(file_path)
+    
+    hierarchy = WeightHierarchy.from_frame(df, column='Normalized_Weight')
+    dimension_weights = hierarchy.dimension_dict()
+    metric_weights = hierarchy.metric_dicts()
+    
+    # Hierarchical weights (dimension weight × metric weight)
+    hierarchical_weights = hierarchy.hierarchical_dict()
     
     return dimension_weights, metric_weights, hierarchical_weights
 
 
-@st.cache_data
+@cached
 def load_metric_definitions() -> Dict:
     """
     Load metric definitions including names, descriptions, and importance.
@@ -90,31 +112,41 @@ def load_metric_definitions() -> Dict:
     return definitions
 
 
-def get_platform_columns(df: pd.DataFrame) -> list:
+def get_platform_columns(df: pd.DataFrame, catalog: Optional[ScoreCatalog] = None) -> list:
     """
     Extract platform column names from the scores DataFrame.
     
     Args:
         df: Platform scores DataFrame
+        catalog: Score catalog of df; its precomputed platform list is used
+                 instead of scanning the columns
     
     Returns:
         List of platform column names
     """
+    if catalog is not None:
+        return catalog.platforms
+    
     # Exclude metadata columns
     metadata_cols = ['Dimension', 'Metric', 'Metric_Type']
     return [col for col in df.columns if col not in metadata_cols]
 
 
-def prepare_topsis_input(scores_df: pd.DataFrame) -> pd.DataFrame:
+def prepare_topsis_input(scores_df: pd.DataFrame, catalog: Optional[ScoreCatalog] = None) -> pd.DataFrame:
     """
     Convert the scores DataFrame to the format needed for TOPSIS calculation.
     
     Args:
         scores_df: DataFrame with Dimension, Metric, and platform columns
+        catalog: Score catalog of scores_df; its TOPSIS input, built once per
+                 scores file, is returned (shared, must not be modified)
     
     Returns:
         DataFrame with metrics as rows and platforms as columns
     """
+    if catalog is not None:
+        return catalog.topsis_input
+    
     platform_cols = get_platform_columns(scores_df)
     
     # Create a new DataFrame with Metric as index
@@ -165,18 +197,23 @@ def get_dimension_order() -> list:
     ]
 
 
-def get_platform_colors() -> Dict[str, str]:
+def get_platform_colors(platforms: Optional[Sequence[str]] = None) -> Dict[str, str]:
     """
     Return the standard color scheme for platforms.
     
+    Args:
+        platforms: Platforms to color (default: the evaluated platforms). Platforms
+                   without a standard color get fallback colors in the given order.
+    
     Returns:
         Dictionary mapping platform names to hex color codes
     """
-    return {
-        'Keboola': '#228DFF',
-        'Microsoft_Fabric': '#7AD5B1',
-        'Databricks': '#FF3D2A'
-    }
+    if platforms is None:
+        return dict(PLATFORM_COLORS)
+    
+    extra = [p for p in platforms if p not in PLATFORM_COLORS]
+    fallback = {p: FALLBACK_COLORS[i % len(FALLBACK_COLORS)] for i, p in enumerate(extra)}
+    return {p: PLATFORM_COLORS.get(p) or fallback[p] for p in platforms}
 
 
 def validate_data_files() -> Dict[str, bool]:
@@ -1,12 +1,19 @@
 """
 Export functionality for the DataOps Platform Comparison Tool.
-Handles PDF and CSV report generation.
+Handles PDF, CSV and Excel report generation.
+
+CSV exports are produced in row chunks (iter_summary_csv, iter_detailed_csv)
+so large analyses can be streamed to a file or response without building
+the whole table; write_columnar writes the same tables as Parquet or Arrow IPC,
+and write_xlsx writes chunked tables as sheets of a write-only (streamed) workbook.
 """
 
 import pandas as pd
 import io
 from datetime import datetime
-from typing import Dict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -14,7 +21,215 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, KeepTogether
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
+from results_cache import ResultCache, hash_frame, hash_mapping
+from score_store import _pyarrow
+from topsis import full_ranking
+from tracing import traced
+
+
+# Finished PDF reports, keyed by a hash of the report inputs
+PDF_CACHE = ResultCache(maxsize=32)
+
+# Finished Excel workbooks, keyed the same way
+XLSX_CACHE = ResultCache(maxsize=32)
+
+# Usable width of an A4 page with the report margins
+_PAGE_WIDTH = A4[0] - 1.5*inch
+
+# Platform columns per dimension/metric table; more platforms continue in further tables
+PDF_PLATFORMS_PER_TABLE = 4
+
+# Rows serialized at once by the chunked CSV and columnar writers
+EXPORT_CHUNK_ROWS = 1000
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Sheet size limits of the XLSX format
+XLSX_MAX_ROWS = 1_048_576
+XLSX_MAX_COLUMNS = 16_384
+
+# Table styles shared by all reports
+_TOPSIS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0066CC')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('TOPPADDING', (0, 0), (-1, 0), 10),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F5F5F5')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+])
+
+_DIMENSION_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#107C10')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('TOPPADDING', (0, 0), (-1, 0), 10),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+])
+
+_WEIGHT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF6B00')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('TOPPADDING', (0, 0), (-1, 0), 10),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FFF0E5')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+])
+
+_METRIC_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#666666')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('TOPPADDING', (0, 0), (-1, 0), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9F9F9')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+])
+
+
+def _platform_column_widths(n_platforms: int, label_width: float = 2.5*inch) -> List[float]:
+    """Column widths of a table with a label column followed by platform columns."""
+    platform_width = min(1.5*inch, (_PAGE_WIDTH - label_width) / max(n_platforms, 1))
+    return [label_width] + [platform_width] * n_platforms
+
+
+def _platform_pages(platforms: Sequence[str], size: int = PDF_PLATFORMS_PER_TABLE) -> List[List[str]]:
+    """Split ranked platforms into groups of table columns."""
+    platforms = list(platforms)
+    return [platforms[i:i + size] for i in range(0, len(platforms), size)]
+
+
+def _summary_chunks(topsis_results: Dict,
+                    dimension_scores: pd.DataFrame,
+                    chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Summary table (one row per platform, best-first) in chunks of rows.
+    
+    Args:
+        topsis_results: Dictionary containing TOPSIS analysis results
+        dimension_scores: DataFrame with dimension-level scores
+        chunk_rows: Platforms per chunk
+    """
+    # Every platform, also when the analysis ranked only the top k
+    topsis_scores = full_ranking(topsis_results)
+    d_plus = topsis_results['d_plus']
+    d_minus = topsis_results['d_minus']
+    dimension_names = [dimension.replace('_', ' ') for dimension in dimension_scores.index]
+    
+    for start in range(0, len(topsis_scores), chunk_rows):
+        platforms = topsis_scores.index[start:start + chunk_rows]
+        yield pd.concat([
+            pd.DataFrame({
+                'Rank': range(start + 1, start + len(platforms) + 1),
+                'Platform': platforms.str.replace('_', ' ')
+            }),
+            pd.DataFrame(dimension_scores[platforms].to_numpy().T, columns=dimension_names),
+            pd.DataFrame({
+                'D+ (Distance to PIS)': d_plus[platforms].to_numpy(),
+                'D- (Distance to NIS)': d_minus[platforms].to_numpy(),
+                'TOPSIS Score': topsis_scores.iloc[start:start + chunk_rows].to_numpy()
+            })
+        ], axis=1)
+
+
+def _detail_chunks(platform_scores: pd.DataFrame,
+                   weights: Dict[str, float],
+                   chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Detail table (one row per metric with its weight and all platform scores) in chunks of rows.
+    
+    Args:
+        platform_scores: DataFrame with all metric scores
+        weights: Dictionary of metric weights
+        chunk_rows: Metrics per chunk
+    """
+    platforms = [col for col in platform_scores.columns
+                 if col not in ['Dimension', 'Metric', 'Weight', 'Metric_Type']]
+    platform_names = [platform.replace('_', ' ') for platform in platforms]
+    
+    for start in range(0, len(platform_scores), chunk_rows):
+        rows = platform_scores.iloc[start:start + chunk_rows]
+        yield pd.concat([
+            pd.DataFrame({
+                'Dimension': rows['Dimension'].str.replace('_', ' ').to_numpy(),
+                'Metric': rows['Metric'].str.replace('_', ' ').to_numpy(),
+                'Weight': rows['Metric'].map(weights).to_numpy(dtype=float)
+            }),
+            # One rename for all platform columns (set_axis) instead of one rename per column
+            rows[platforms].set_axis(platform_names, axis=1).reset_index(drop=True)
+        ], axis=1)
+
+
+def _csv_chunks(chunks: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    """Serialize table chunks as UTF-8 CSV, with the header in the first chunk."""
+    for i, chunk in enumerate(chunks):
+        yield chunk.to_csv(index=False, header=i == 0, float_format='%.4f').encode('utf-8')
+
+
+def iter_summary_csv(topsis_results: Dict,
+                     dimension_scores: pd.DataFrame,
+                     chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Stream the summary CSV (see export_to_csv) as UTF-8 byte chunks.
+    
+    Args:
+        topsis_results: Dictionary containing TOPSIS analysis results
+        dimension_scores: DataFrame with dimension-level scores
+        chunk_rows: Platforms serialized per chunk
+    
+    Returns:
+        Iterator of CSV byte chunks
+    """
+    return _csv_chunks(_summary_chunks(topsis_results, dimension_scores, chunk_rows))
+
 
+def iter_detailed_csv(platform_scores: pd.DataFrame,
+                      weights: Dict[str, float],
+                      chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Stream the detailed CSV (see export_detailed_csv) as UTF-8 byte chunks.
+    
+    Args:
+        platform_scores: DataFrame with all metric scores
+        weights: Dictionary of metric weights
+        chunk_rows: Metrics serialized per chunk
+    
+    Returns:
+        Iterator of CSV byte chunks
+    """
+    return _csv_chunks(_detail_chunks(platform_scores, weights, chunk_rows))
+
+
+@traced('csv.summary')
 def export_to_csv(topsis_results: Dict,
                  dimension_scores: pd.DataFrame,
                  platform_scores: pd.DataFrame) -> str:
@@ -29,40 +244,10 @@ def export_to_csv(topsis_results: Dict,
     Returns:
         CSV string
     """
-    # Extract relevant data
-    topsis_scores = topsis_results['topsis_scores'].sort_values(ascending=False)
-    d_plus = topsis_results['d_plus']
-    d_minus = topsis_results['d_minus']
-    
-    # Create main results dataframe
-    results_data = []
-    for rank, platform in enumerate(topsis_scores.index, 1):
-        row_data = {
-            'Rank': rank,
-            'Platform': platform.replace('_', ' ')
-        }
-        
-        # Add dimension scores
-        for dimension in dimension_scores.index:
-            dim_name = dimension.replace('_', ' ')
-            row_data[dim_name] = dimension_scores.loc[dimension, platform]
-        
-        # Add TOPSIS metrics
-        row_data['D+ (Distance to PIS)'] = d_plus[platform]
-        row_data['D- (Distance to NIS)'] = d_minus[platform]
-        row_data['TOPSIS Score'] = topsis_scores[platform]
-        
-        results_data.append(row_data)
-    
-    results_df = pd.DataFrame(results_data)
-    
-    # Convert to CSV
-    csv_buffer = io.StringIO()
-    results_df.to_csv(csv_buffer, index=False, float_format='%.4f')
-    
-    return csv_buffer.getvalue()
+    return b''.join(iter_summary_csv(topsis_results, dimension_scores)).decode('utf-8')
 
 
+@traced('csv.detail')
 def export_detailed_csv(topsis_results: Dict,
                        platform_scores: pd.DataFrame,
                        weights: Dict[str, float]) -> str:
@@ -77,65 +262,295 @@ def export_detailed_csv(topsis_results: Dict,
     Returns:
         CSV string
     """
-    # Create detailed export with metrics
-    export_df = platform_scores.copy()
+    return b''.join(iter_detailed_csv(platform_scores, weights)).decode('utf-8')
+
+
+def write_columnar(chunks: Iterator[pd.DataFrame], path: Path, file_format: str = 'parquet') -> Path:
+    """
+    Write table chunks (e.g. _summary_chunks or _detail_chunks) as a Parquet or Arrow IPC file.
     
-    # Add weight column
-    export_df['Weight'] = export_df['Metric'].map(weights)
+    Chunks are converted and written one at a time, so memory use does not
+    grow with the number of rows.
     
-    # Reorder columns
-    cols = ['Dimension', 'Metric', 'Weight'] + [col for col in export_df.columns 
-                                                  if col not in ['Dimension', 'Metric', 'Weight', 'Metric_Type']]
-    export_df = export_df[cols]
+    Args:
+        chunks: Table chunks with identical columns
+        path: Output file
+        file_format: 'parquet' or 'arrow' (uncompressed IPC file, memory-mappable)
     
-    # Format names
-    export_df['Dimension'] = export_df['Dimension'].str.replace('_', ' ')
-    export_df['Metric'] = export_df['Metric'].str.replace('_', ' ')
+    Returns:
+        Path of the written file
     
-    # Rename platform columns
-    for col in export_df.columns:
-        if '_' in col and col not in ['Dimension', 'Metric', 'Weight']:
-            export_df = export_df.rename(columns={col: col.replace('_', ' ')})
+    Raises:
+        ValueError: If the format is unknown
+        ImportError: If pyarrow is not installed
+    """
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format: {file_format} (expected {', '.join(COLUMNAR_FORMATS)})")
+    pa = _pyarrow()
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet and Arrow exports")
+    
+    path = Path(path)
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            batch = pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = batch.schema
+                if file_format == 'parquet':
+                    import pyarrow.parquet
+                    writer = pyarrow.parquet.ParquetWriter(str(path), schema)
+                else:
+                    writer = pa.ipc.new_file(str(path), schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+def export_summary_columnar(topsis_results: Dict,
+                            dimension_scores: pd.DataFrame,
+                            path: Path,
+                            file_format: str = 'parquet') -> Path:
+    """Write the summary table (see export_to_csv) as Parquet or Arrow IPC."""
+    return write_columnar(_summary_chunks(topsis_results, dimension_scores), path, file_format)
+
+
+def export_detailed_columnar(platform_scores: pd.DataFrame,
+                             weights: Dict[str, float],
+                             path: Path,
+                             file_format: str = 'parquet') -> Path:
+    """Write the detail table (see export_detailed_csv) as Parquet or Arrow IPC."""
+    return write_columnar(_detail_chunks(platform_scores, weights), path, file_format)
+
+
+def _matrix_chunks(matrix: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    A (metrics x platforms) matrix as one row per platform, in chunks of rows.
     
-    csv_buffer = io.StringIO()
-    export_df.to_csv(csv_buffer, index=False, float_format='%.4f')
+    Platforms become rows because there are far more of them than metrics
+    and a sheet allows many more rows than columns.
     
-    return csv_buffer.getvalue()
+    Args:
+        matrix: DataFrame with metrics as rows, platforms as columns
+        chunk_rows: Platforms per chunk
+    """
+    metric_names = [metric.replace('_', ' ') for metric in matrix.index]
+    values = matrix.to_numpy()
+    
+    for start in range(0, matrix.shape[1], chunk_rows):
+        platforms = matrix.columns[start:start + chunk_rows]
+        yield pd.concat([
+            pd.DataFrame({'Platform': platforms.str.replace('_', ' ')}),
+            pd.DataFrame(values[:, start:start + chunk_rows].T, columns=metric_names)
+        ], axis=1)
 
 
-def generate_pdf_report(topsis_results: Dict,
-                       dimension_scores: pd.DataFrame,
-                       platform_scores: pd.DataFrame,
-                       weights: Dict[str, float],
-                       dimension_weights: Dict[str, float],
-                       mode: str = "average") -> bytes:
+def _distance_chunks(topsis_results: Dict, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Distances and score of every platform (also outside the top k), in chunks of rows."""
+    d_plus = topsis_results['d_plus']
+    d_minus = topsis_results['d_minus']
+    topsis_scores = topsis_results['topsis_scores']
+    
+    for start in range(0, len(d_plus), chunk_rows):
+        platforms = d_plus.index[start:start + chunk_rows]
+        yield pd.DataFrame({
+            'Platform': platforms.str.replace('_', ' '),
+            'D+ (Distance to PIS)': d_plus.iloc[start:start + chunk_rows].to_numpy(),
+            'D- (Distance to NIS)': d_minus[platforms].to_numpy(),
+            'TOPSIS Score': topsis_scores[platforms].to_numpy()
+        })
+
+
+def _weight_rows(dimension_weights: Dict[str, float],
+                 metric_weights: Dict[str, Dict[str, float]]) -> Iterator[pd.DataFrame]:
+    """The weight hierarchy as one row per metric with its dimension and final weight."""
+    rows = [
+        (dimension.replace('_', ' '), dimension_weight, metric.replace('_', ' '), metric_weight,
+         dimension_weight * metric_weight)
+        for dimension, dimension_weight in dimension_weights.items()
+        for metric, metric_weight in metric_weights.get(dimension, {}).items()
+    ]
+    yield pd.DataFrame(rows, columns=['Dimension', 'Dimension Weight', 'Metric', 'Metric Weight', 'Weight'])
+
+
+def _sensitivity_rows(sensitivity: Dict) -> Iterator[pd.DataFrame]:
+    """Rank probabilities and score statistics of run_sensitivity_analysis, one row per platform."""
+    probabilities = sensitivity['rank_probabilities']
+    quantiles = sensitivity['score_quantiles']
+    yield pd.concat([
+        pd.DataFrame({'Platform': probabilities.index.str.replace('_', ' ')}),
+        probabilities.set_axis([f"P(Rank {rank})" for rank in probabilities.columns], axis=1)
+                     .reset_index(drop=True),
+        quantiles.set_axis([f"Q{q * 100:g}" for q in quantiles.columns], axis=1).reset_index(drop=True),
+        pd.DataFrame({
+            'Mean Score': sensitivity['mean_scores'][probabilities.index].to_numpy(),
+            'Std Score': sensitivity['std_scores'][probabilities.index].to_numpy()
+        })
+    ], axis=1)
+
+
+def workbook_sheets(topsis_results: Dict,
+                    dimension_scores: pd.DataFrame,
+                    dimension_weights: Dict[str, float],
+                    metric_weights: Dict[str, Dict[str, float]],
+                    sensitivity: Optional[Dict] = None,
+                    chunk_rows: int = EXPORT_CHUNK_ROWS) -> Dict[str, Iterator[pd.DataFrame]]:
     """
-    Generate a comprehensive PDF report of the analysis.
+    Sheets of the Excel export as lazily produced table chunks.
     
     Args:
         topsis_results: Dictionary containing TOPSIS analysis results
         dimension_scores: DataFrame with dimension-level scores
-        platform_scores: DataFrame with detailed metric scores
-        weights: Dictionary of hierarchical weights
         dimension_weights: Dictionary of dimension weights
-        mode: Either "average" or "custom"
+        metric_weights: Nested dict - dimension -> metric -> weight
+        sensitivity: Result of run_sensitivity_analysis (sheet omitted if None)
+        chunk_rows: Platforms per chunk
     
     Returns:
-        PDF content as bytes
+        Dictionary mapping sheet names to chunk iterators (see write_xlsx)
+    """
+    sheets = {
+        'Ranking': _summary_chunks(topsis_results, dimension_scores, chunk_rows),
+        'Distances': _distance_chunks(topsis_results, chunk_rows),
+        'Normalized': _matrix_chunks(topsis_results['normalized_scores'], chunk_rows),
+        'Weighted': _matrix_chunks(topsis_results['weighted_scores'], chunk_rows),
+        'Weights': _weight_rows(dimension_weights, metric_weights)
+    }
+    if sensitivity is not None:
+        sheets['Sensitivity'] = _sensitivity_rows(sensitivity)
+    return sheets
+
+
+def write_xlsx(sheets: Dict[str, Iterable[pd.DataFrame]], target):
+    """
+    Write table chunks as the sheets of an Excel workbook.
+    
+    The workbook is created in openpyxl's write-only mode: rows are
+    serialized as they are appended instead of being kept as cell objects,
+    so memory use does not grow with the size of the matrices.
+    
+    Args:
+        sheets: Dictionary mapping sheet names to table chunks with identical columns
+        target: Output path or binary file object
+    
+    Returns:
+        The target
+    
+    Raises:
+        ValueError: If a table exceeds the XLSX sheet size
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    
+    for name, chunks in sheets.items():
+        sheet = workbook.create_sheet(title=name)
+        sheet.freeze_panes = 'A2'
+        rows = 1
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                if chunk.shape[1] > XLSX_MAX_COLUMNS:
+                    raise ValueError(f"Sheet '{name}' has {chunk.shape[1]} columns (XLSX limit {XLSX_MAX_COLUMNS})")
+                header = []
+                for column in chunk.columns:
+                    cell = WriteOnlyCell(sheet, value=str(column))
+                    cell.font = header_font
+                    header.append(cell)
+                sheet.append(header)
+            
+            rows += len(chunk)
+            if rows > XLSX_MAX_ROWS:
+                raise ValueError(f"Sheet '{name}' has more than {XLSX_MAX_ROWS} rows")
+            
+            # Missing values become empty cells; NaN is not a valid XLSX number
+            values = chunk.to_numpy(dtype=object)
+            values[chunk.isna().to_numpy()] = None
+            for row in values.tolist():
+                sheet.append(row)
+    
+    workbook.save(target)
+    return target
+
+
+@traced('xlsx')
+def export_to_xlsx(topsis_results: Dict,
+                   dimension_scores: pd.DataFrame,
+                   dimension_weights: Dict[str, float],
+                   metric_weights: Dict[str, Dict[str, float]],
+                   sensitivity: Optional[Dict] = None) -> bytes:
+    """
+    Export the analysis as a multi-sheet Excel workbook.
+    
+    Sheets: Ranking (as the summary CSV), Distances, Normalized and Weighted
+    matrices (one row per platform), Weights and, if given, Sensitivity.
+    
+    Args:
+        topsis_results: Dictionary containing TOPSIS analysis results
+        dimension_scores: DataFrame with dimension-level scores
+        dimension_weights: Dictionary of dimension weights
+        metric_weights: Nested dict - dimension -> metric -> weight
+        sensitivity: Result of run_sensitivity_analysis
+    
+    Returns:
+        XLSX content as bytes
     """
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4,
-                           rightMargin=0.75*inch, leftMargin=0.75*inch,
-                           topMargin=1*inch, bottomMargin=0.75*inch)
+    write_xlsx(workbook_sheets(topsis_results, dimension_scores, dimension_weights,
+                               metric_weights, sensitivity), buffer)
+    return buffer.getvalue()
+
+
+def get_xlsx_report(topsis_results: Dict,
+                    dimension_scores: pd.DataFrame,
+                    dimension_weights: Dict[str, float],
+                    metric_weights: Dict[str, Dict[str, float]],
+                    sensitivity: Optional[Dict] = None) -> bytes:
+    """
+    Return the Excel workbook for the given inputs, building it only on a cache miss.
     
-    # Container for PDF elements
-    elements = []
+    Args:
+        topsis_results: Dictionary containing TOPSIS analysis results
+        dimension_scores: DataFrame with dimension-level scores
+        dimension_weights: Dictionary of dimension weights
+        metric_weights: Nested dict - dimension -> metric -> weight
+        sensitivity: Result of run_sensitivity_analysis (sheet omitted if None)
+    
+    Returns:
+        XLSX content as bytes
+    """
+    key = (
+        hash_frame(topsis_results['weighted_scores']),
+        hash_frame(topsis_results['normalized_scores']),
+        hash_frame(dimension_scores),
+        hash_mapping(dimension_weights),
+        hash_mapping(metric_weights),
+        None if sensitivity is None else (hash_frame(sensitivity['rank_probabilities']),
+                                          hash_frame(sensitivity['score_quantiles']))
+    )
     
-    # Define styles
-    styles = getSampleStyleSheet()
+    return XLSX_CACHE.get_or_compute(key, lambda: export_to_xlsx(
+        topsis_results, dimension_scores, dimension_weights, metric_weights, sensitivity
+    ))
+
+
+@lru_cache(maxsize=None)
+def _report_styles() -> Dict[str, ParagraphStyle]:
+    """
+    Build the paragraph styles used by the PDF report.
+    
+    Returns:
+        Dictionary mapping style roles to ParagraphStyle objects
+    """
+    sample = getSampleStyleSheet()
     title_style = ParagraphStyle(
         'CustomTitle',
-        parent=styles['Heading1'],
+        parent=sample['Heading1'],
         fontSize=28,
         textColor=colors.HexColor('#0066CC'),
         spaceAfter=30,
@@ -145,7 +560,7 @@ def generate_pdf_report(topsis_results: Dict,
     
     subtitle_style = ParagraphStyle(
         'CustomSubtitle',
-        parent=styles['Normal'],
+        parent=sample['Normal'],
         fontSize=14,
         textColor=colors.HexColor('#333333'),
         spaceAfter=12,
@@ -155,7 +570,7 @@ def generate_pdf_report(topsis_results: Dict,
     
     heading_style = ParagraphStyle(
         'CustomHeading',
-        parent=styles['Heading2'],
+        parent=sample['Heading2'],
         fontSize=18,
         textColor=colors.HexColor('#0066CC'),
         spaceAfter=14,
@@ -165,7 +580,7 @@ def generate_pdf_report(topsis_results: Dict,
     
     subheading_style = ParagraphStyle(
         'CustomSubheading',
-        parent=styles['Heading3'],
+        parent=sample['Heading3'],
         fontSize=14,
         textColor=colors.HexColor('#333333'),
         spaceAfter=10,
@@ -175,7 +590,7 @@ def generate_pdf_report(topsis_results: Dict,
     
     body_style = ParagraphStyle(
         'CustomBody',
-        parent=styles['Normal'],
+        parent=sample['Normal'],
         fontSize=11,
         textColor=colors.HexColor('#333333'),
         spaceAfter=8,
@@ -185,7 +600,7 @@ def generate_pdf_report(topsis_results: Dict,
     
     link_style = ParagraphStyle(
         'LinkStyle',
-        parent=styles['Normal'],
+        parent=sample['Normal'],
         fontSize=10,
         textColor=colors.HexColor('#0066CC'),
         spaceAfter=8,
@@ -193,6 +608,53 @@ def generate_pdf_report(topsis_results: Dict,
         underline=True
     )
     
+    return {
+        'title': title_style,
+        'subtitle': subtitle_style,
+        'heading': heading_style,
+        'subheading': subheading_style,
+        'body': body_style,
+        'link': link_style
+    }
+
+
+@traced('pdf')
+def generate_pdf_report(topsis_results: Dict,
+                       dimension_scores: pd.DataFrame,
+                       platform_scores: pd.DataFrame,
+                       weights: Dict[str, float],
+                       dimension_weights: Dict[str, float],
+                       mode: str = "average") -> bytes:
+    """
+    Generate a comprehensive PDF report of the analysis.
+    
+    Args:
+        topsis_results: Dictionary containing TOPSIS analysis results
+        dimension_scores: DataFrame with dimension-level scores
+        platform_scores: DataFrame with detailed metric scores
+        weights: Dictionary of hierarchical weights
+        dimension_weights: Dictionary of dimension weights
+        mode: Either "average" or "custom"
+    
+    Returns:
+        PDF content as bytes
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4,
+                           rightMargin=0.75*inch, leftMargin=0.75*inch,
+                           topMargin=1*inch, bottomMargin=0.75*inch)
+    
+    # Container for PDF elements
+    elements = []
+    
+    # Shared styles, built once per process
+    styles = _report_styles()
+    title_style = styles['title']
+    subtitle_style = styles['subtitle']
+    heading_style = styles['heading']
+    subheading_style = styles['subheading']
+    body_style = styles['body']
+    
     # Page 1: Cover Page
     elements.append(Spacer(1, 1.8*inch))
     elements.append(Paragraph("DataOps Platform Comparison Report", title_style))
@@ -212,7 +674,9 @@ def generate_pdf_report(topsis_results: Dict,
     elements.append(Paragraph(f"<b>Analysis Mode:</b> {mode_text}", body_style))
     elements.append(Spacer(1, 0.15*inch))
     
-    elements.append(Paragraph("<b>Evaluated Platforms:</b> Keboola, Microsoft Fabric, Databricks", body_style))
+    all_platforms = [p.replace('_', ' ') for p in topsis_results['topsis_scores'].index]
+    platform_text = ', '.join(all_platforms) if len(all_platforms) <= 5 else f"{len(all_platforms)} platforms"
+    elements.append(Paragraph(f"<b>Evaluated Platforms:</b> {platform_text}", body_style))
     elements.append(Spacer(1, 1*inch))
     
     # Footer with thesis link
@@ -243,8 +707,9 @@ def generate_pdf_report(topsis_results: Dict,
     elements.append(Paragraph(summary_intro, body_style))
     elements.append(Spacer(1, 0.25*inch))
     
-    # Final Rankings
-    topsis_scores = topsis_results['topsis_scores'].sort_values(ascending=False)
+    # Final Rankings (every platform, also when the analysis ranked only the top k)
+    topsis_scores = full_ranking(topsis_results)
+    ranked_platforms = list(topsis_scores.index)
     ranking_text = "<b>Final Platform Rankings</b>"
     elements.append(Paragraph(ranking_text, subheading_style))
     elements.append(Spacer(1, 0.1*inch))
@@ -283,24 +748,8 @@ def generate_pdf_report(topsis_results: Dict,
             f"{topsis_scores[platform]:.4f}"
         ])
     
-    table = Table(table_data, colWidths=[0.7*inch, 2*inch, 1.2*inch, 1.2*inch, 1.3*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0066CC')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('TOPPADDING', (0, 0), (-1, 0), 10),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F5F5F5')),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-    ]))
+    table = Table(table_data, colWidths=[0.7*inch, 2*inch, 1.2*inch, 1.2*inch, 1.3*inch], repeatRows=1)
+    table.setStyle(_TOPSIS_TABLE_STYLE)
     
     topsis_table_elements.append(table)
     elements.append(KeepTogether(topsis_table_elements))
@@ -318,36 +767,20 @@ def generate_pdf_report(topsis_results: Dict,
     elements.append(Paragraph(dim_intro, body_style))
     elements.append(Spacer(1, 0.2*inch))
     
-    # Dimension scores table - Keep together
-    dim_table_elements = []
-    dim_table_data = [['Dimension'] + [p.replace('_', ' ') for p in dimension_scores.columns]]
-    for dimension in dimension_scores.index:
-        row = [dimension.replace('_', ' ')]
-        for platform in dimension_scores.columns:
-            row.append(f"{dimension_scores.loc[dimension, platform]:.2f}")
-        dim_table_data.append(row)
-    
-    dim_table = Table(dim_table_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-    dim_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#107C10')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('TOPPADDING', (0, 0), (-1, 0), 10),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-    ]))
-    
-    dim_table_elements.append(dim_table)
-    elements.append(KeepTogether(dim_table_elements))
-    elements.append(Spacer(1, 0.3*inch))
+    # Dimension scores tables - Keep each together
+    for page_platforms in _platform_pages(ranked_platforms):
+        dim_table_data = [['Dimension'] + [p.replace('_', ' ') for p in page_platforms]]
+        for dimension in dimension_scores.index:
+            row = [dimension.replace('_', ' ')]
+            for platform in page_platforms:
+                row.append(f"{dimension_scores.loc[dimension, platform]:.2f}")
+            dim_table_data.append(row)
+        
+        dim_table = Table(dim_table_data, colWidths=_platform_column_widths(len(page_platforms)))
+        dim_table.setStyle(_DIMENSION_TABLE_STYLE)
+        
+        elements.append(KeepTogether([dim_table]))
+        elements.append(Spacer(1, 0.3*inch))
     
     # Dimension weights - Keep together with title
     weight_table_elements = []
@@ -370,20 +803,7 @@ def generate_pdf_report(topsis_results: Dict,
         ])
     
     weight_table = Table(weight_table_data, colWidths=[3*inch, 1.5*inch, 1.5*inch])
-    weight_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF6B00')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('TOPPADDING', (0, 0), (-1, 0), 10),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FFF0E5')]),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-    ]))
+    weight_table.setStyle(_WEIGHT_TABLE_STYLE)
     
     weight_table_elements.append(weight_table)
     elements.append(KeepTogether(weight_table_elements))
@@ -409,36 +829,21 @@ def generate_pdf_report(topsis_results: Dict,
         dimension_table_elements.append(Paragraph(f"<b>{dimension.replace('_', ' ')}</b>", subheading_style))
         dimension_table_elements.append(Spacer(1, 0.1*inch))
         
-        # Create table for this dimension
-        metric_table_data = [['Metric'] + [p.replace('_', ' ') for p in 
-                                            [col for col in dim_metrics.columns 
-                                             if col not in ['Dimension', 'Metric', 'Metric_Type']]]]
-        
-        for _, row in dim_metrics.iterrows():
-            metric_row = [row['Metric'].replace('_', ' ')]
-            for col in dim_metrics.columns:
-                if col not in ['Dimension', 'Metric', 'Metric_Type']:
+        # Create tables for this dimension, one per group of platform columns
+        for page_platforms in _platform_pages(ranked_platforms):
+            metric_table_data = [['Metric'] + [p.replace('_', ' ') for p in page_platforms]]
+            
+            for _, row in dim_metrics.iterrows():
+                metric_row = [row['Metric'].replace('_', ' ')]
+                for col in page_platforms:
                     metric_row.append(str(row[col]))
-            metric_table_data.append(metric_row)
-        
-        metric_table = Table(metric_table_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-        metric_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#666666')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, 0), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9F9F9')]),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ]))
-        
-        dimension_table_elements.append(metric_table)
+                metric_table_data.append(metric_row)
+            
+            metric_table = Table(metric_table_data, colWidths=_platform_column_widths(len(page_platforms)))
+            metric_table.setStyle(_METRIC_TABLE_STYLE)
+            
+            dimension_table_elements.append(metric_table)
+            dimension_table_elements.append(Spacer(1, 0.1*inch))
         
         # Add the table with its title as a single unit
         elements.append(KeepTogether(dimension_table_elements))
@@ -542,6 +947,48 @@ def generate_pdf_report(topsis_results: Dict,
     return buffer.getvalue()
 
 
+def get_pdf_report(topsis_results: Dict,
+                   dimension_scores: pd.DataFrame,
+                   platform_scores: pd.DataFrame,
+                   weights: Dict[str, float],
+                   dimension_weights: Dict[str, float],
+                   mode: str = "average") -> bytes:
+    """
+    Return the PDF report for the given inputs, building it only on a cache miss.
+    
+    The key covers the analysis inputs only; the "Generated" date printed in
+    the report is the date the cached report was built.
+    
+    Args:
+        topsis_results: Dictionary containing TOPSIS analysis results
+        dimension_scores: DataFrame with dimension-level scores
+        platform_scores: DataFrame with detailed metric scores
+        weights: Dictionary of hierarchical weights
+        dimension_weights: Dictionary of dimension weights
+        mode: Either "average" or "custom"
+    
+    Returns:
+        PDF content as bytes
+    """
+    results_frame = pd.DataFrame({
+        'topsis_scores': topsis_results['topsis_scores'],
+        'd_plus': topsis_results['d_plus'],
+        'd_minus': topsis_results['d_minus']
+    })
+    key = (
+        hash_frame(results_frame),
+        hash_frame(dimension_scores),
+        hash_frame(platform_scores),
+        hash_mapping(weights),
+        hash_mapping(dimension_weights),
+        mode
+    )
+    
+    return PDF_CACHE.get_or_compute(key, lambda: generate_pdf_report(
+        topsis_results, dimension_scores, platform_scores, weights, dimension_weights, mode
+    ))
+
+
 def create_download_filename(prefix: str, extension: str) -> str:
     """
     Generate a timestamped filename for downloads.
@@ -555,4 +1002,3 @@ def create_download_filename(prefix: str, extension: str) -> str:
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"{prefix}_{timestamp}.{extension}"
-
@@ -0,0 +1,183 @@
+"""
+Incremental TOPSIS recomputation for interactive weight and score edits.
+Keeps the intermediate matrices of the analysis so that a single changed
+weight or score cell only updates the affected metric row.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple, Union
+
+from topsis import _as_matrix, _benefit_mask, _normalize_array, _closeness_array, _rank_array, _compact_ranks
+
+
+class IncrementalTopsis:
+    """
+    TOPSIS state that supports O(platforms) updates.
+    
+    Squared distances are stored as per-platform accumulators of per-metric
+    contributions w^2 * (normalized - extreme)^2. Changing one weight swaps one
+    metric's contribution; changing one score re-normalizes that metric row
+    only. The accumulators are rebuilt from scratch every refresh_interval
+    updates to bound floating-point drift.
+    """
+    
+    def __init__(self,
+                 platform_scores: pd.DataFrame,
+                 metric_types: Dict[str, str],
+                 weights: Optional[Dict[str, float]] = None,
+                 refresh_interval: int = 10_000):
+        """
+        Args:
+            platform_scores: DataFrame with metrics as rows, platforms as columns
+            metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+            weights: Initial hierarchical weights (missing metrics get weight 0)
+            refresh_interval: Number of updates between full recomputations
+        """
+        self.metrics = platform_scores.index
+        self.platforms = platform_scores.columns
+        self._metric_position = {metric: i for i, metric in enumerate(self.metrics)}
+        self._platform_position = {platform: j for j, platform in enumerate(self.platforms)}
+        
+        self.values = _as_matrix(platform_scores).copy()
+        self.benefit = _benefit_mask(self.metrics, metric_types)
+        self.weights = np.array([(weights or {}).get(m, 0) for m in self.metrics], dtype=np.float64)
+        self.refresh_interval = refresh_interval
+        
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """Recompute every intermediate matrix and accumulator from the raw scores."""
+        self.normalized = _normalize_array(self.values, self.benefit)
+        self._dev_high = np.square(self.normalized - self.normalized.max(axis=1, keepdims=True))
+        self._dev_low = np.square(self.normalized - self.normalized.min(axis=1, keepdims=True))
+        self.weighted = self.normalized * self.weights[:, None]
+        self.pis = self.weighted.max(axis=1)
+        self.nis = self.weighted.min(axis=1)
+        
+        plus, minus = self._contributions(slice(None))
+        self._d_plus_sq = plus.sum(axis=0)
+        self._d_minus_sq = minus.sum(axis=0)
+        self._updates = 0
+    
+    def _contributions(self, rows) -> Tuple[np.ndarray, np.ndarray]:
+        """Squared-distance contributions of the given metric rows to D+ and D-."""
+        weights = self.weights[rows]
+        squared = np.square(weights)[..., None]
+        positive = (weights >= 0)[..., None]
+        high = squared * self._dev_high[rows]
+        low = squared * self._dev_low[rows]
+        return np.where(positive, high, low), np.where(positive, low, high)
+    
+    def _replace_row(self, row: int, apply_change) -> None:
+        """Swap one metric row's contribution around an in-place state change."""
+        old_plus, old_minus = self._contributions(row)
+        apply_change()
+        new_plus, new_minus = self._contributions(row)
+        
+        self._d_plus_sq += new_plus - old_plus
+        self._d_minus_sq += new_minus - old_minus
+        
+        self.weighted[row] = self.normalized[row] * self.weights[row]
+        self.pis[row] = self.weighted[row].max()
+        self.nis[row] = self.weighted[row].min()
+        
+        self._updates += 1
+        if self._updates >= self.refresh_interval:
+            self.refresh()
+    
+    def set_weight(self, metric: str, weight: float) -> None:
+        """
+        Change the hierarchical weight of one metric in O(platforms).
+        
+        Args:
+            metric: Metric name
+            weight: New final hierarchical weight
+        """
+        row = self._metric_position[metric]
+        if self.weights[row] == weight:
+            return
+        
+        def apply_change():
+            self.weights[row] = weight
+        
+        self._replace_row(row, apply_change)
+    
+    def set_weights(self, weights: Union[Dict[str, float], np.ndarray]) -> None:
+        """
+        Apply a full or partial weight dictionary, updating only changed metrics.
+        
+        Args:
+            weights: Dictionary mapping metric names to hierarchical weights, or
+                     a weight vector aligned to the metric rows
+        """
+        if isinstance(weights, np.ndarray):
+            for row in np.flatnonzero(weights != self.weights):
+                self.set_weight(self.metrics[row], float(weights[row]))
+            return
+        
+        for metric, weight in weights.items():
+            if metric in self._metric_position:
+                self.set_weight(metric, weight)
+    
+    def set_score(self, metric: str, platform: str, value: float) -> None:
+        """
+        Change one platform's raw score for one metric in O(platforms).
+        
+        Args:
+            metric: Metric name
+            platform: Platform name
+            value: New raw score
+        """
+        row = self._metric_position[metric]
+        column = self._platform_position[platform]
+        if self.values[row, column] == value:
+            return
+        
+        def apply_change():
+            self.values[row, column] = value
+            self.normalized[row] = _normalize_array(self.values[row:row + 1], self.benefit[row:row + 1])[0]
+            self._dev_high[row] = np.square(self.normalized[row] - self.normalized[row].max())
+            self._dev_low[row] = np.square(self.normalized[row] - self.normalized[row].min())
+        
+        self._replace_row(row, apply_change)
+    
+    @property
+    def d_plus(self) -> pd.Series:
+        """Distances to PIS."""
+        return pd.Series(np.sqrt(np.maximum(self._d_plus_sq, 0)), index=self.platforms)
+    
+    @property
+    def d_minus(self) -> pd.Series:
+        """Distances to NIS."""
+        return pd.Series(np.sqrt(np.maximum(self._d_minus_sq, 0)), index=self.platforms)
+    
+    @property
+    def topsis_scores(self) -> pd.Series:
+        """Current TOPSIS scores."""
+        scores = _closeness_array(np.sqrt(np.maximum(self._d_plus_sq, 0)),
+                                  np.sqrt(np.maximum(self._d_minus_sq, 0)))
+        return pd.Series(scores, index=self.platforms)
+    
+    def results(self) -> Dict:
+        """
+        Return the current state in the same format as run_topsis_analysis.
+        
+        Returns:
+            Dictionary with normalized_scores, weighted_scores, pis, nis,
+            d_plus, d_minus, topsis_scores, ranking and ranks
+        """
+        topsis_scores = self.topsis_scores
+        order, _ = _rank_array(topsis_scores.to_numpy())
+        
+        return {
+            'normalized_scores': pd.DataFrame(self.normalized.copy(), index=self.metrics, columns=self.platforms),
+            'weighted_scores': pd.DataFrame(self.weighted.copy(), index=self.metrics, columns=self.platforms),
+            'pis': pd.Series(self.pis.copy(), index=self.metrics),
+            'nis': pd.Series(self.nis.copy(), index=self.metrics),
+            'd_plus': self.d_plus,
+            'd_minus': self.d_minus,
+            'topsis_scores': topsis_scores,
+            'ranking': topsis_scores.iloc[order],
+            'ranks': _compact_ranks(order, len(self.platforms))
+        }
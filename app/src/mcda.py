@@ -0,0 +1,207 @@
+"""
+Alternative MCDA methods for ranking robustness checks.
+Every method ranks the platforms from the same benefit-oriented min-max
+normalized matrix and weight vector used by TOPSIS, so normalization and
+weighting run once and all registered methods are evaluated on the shared
+arrays.
+
+Methods are plain functions registered with @register_method; each takes the
+(metrics x platforms) normalized matrix and the metric weight vector and
+returns one score per platform, higher is better.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Sequence, Union
+
+from topsis import (_as_matrix, _benefit_mask, _weight_vector, _normalize_array,
+                    _ideal_arrays, _distance_arrays, _closeness_array, _rank_array)
+
+
+MCDA_METHODS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {}
+
+# Weight of the group utility (S) against the individual regret (R) in VIKOR
+VIKOR_V = 0.5
+
+
+def register_method(name: str) -> Callable:
+    """Decorator registering a scoring function under a method name."""
+    def decorator(function: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> Callable:
+        MCDA_METHODS[name] = function
+        return function
+    return decorator
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise division that yields 0 where the denominator is 0."""
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+def _average_rank_array(scores: np.ndarray) -> np.ndarray:
+    """
+    1-based ranks by descending score per row, tied scores sharing their mean rank.
+    
+    Unlike the ordinal ranks of _rank_array, ties are not broken by column
+    position, so the Pearson correlation of these ranks is Spearman's rho.
+    """
+    ranks = np.empty(scores.shape, dtype=np.float64)
+    for i, row in enumerate(scores):
+        ordered = np.sort(-row)
+        first = np.searchsorted(ordered, -row, side='left')
+        last = np.searchsorted(ordered, -row, side='right')
+        ranks[i] = (first + last + 1) / 2
+    return ranks
+
+
+def _spearman_matrix(scores: np.ndarray) -> np.ndarray:
+    """
+    Spearman correlation between the rows of a (methods x platforms) score matrix.
+    
+    A method that ties every platform has no rank variance; its correlation
+    with the other methods is NaN and with itself 1.
+    """
+    n_methods = scores.shape[0]
+    if scores.shape[1] < 2:
+        return np.ones((n_methods, n_methods))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        agreement = np.atleast_2d(np.corrcoef(_average_rank_array(scores)))
+    np.fill_diagonal(agreement, 1.0)
+    return agreement
+
+
+@register_method('TOPSIS')
+def topsis_scores(normalized: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Relative closeness to the ideal solution (same as run_topsis_analysis)."""
+    weighted = normalized * weights[:, None]
+    pis, nis = _ideal_arrays(weighted)
+    return _closeness_array(*_distance_arrays(weighted, pis, nis))
+
+
+@register_method('WSM')
+def wsm_scores(normalized: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted sum of the normalized scores."""
+    return weights @ normalized
+
+
+@register_method('VIKOR')
+def vikor_scores(normalized: np.ndarray, weights: np.ndarray, v: float = VIKOR_V) -> np.ndarray:
+    """
+    VIKOR compromise ranking, returned as 1 - Q so that higher is better.
+    
+    S is the weighted distance from the best score per metric, R the largest
+    weighted distance of a platform, and Q combines both rescaled to 0-1.
+    """
+    best = normalized.max(axis=1, keepdims=True)
+    worst = normalized.min(axis=1, keepdims=True)
+    regret = weights[:, None] * _safe_divide(best - normalized, best - worst)
+    
+    s = regret.sum(axis=0)
+    r = regret.max(axis=0)
+    q = (v * _safe_divide(s - s.min(), s.max() - s.min())
+         + (1 - v) * _safe_divide(r - r.min(), r.max() - r.min()))
+    return 1 - q
+
+
+@register_method('PROMETHEE II')
+def promethee_scores(normalized: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    PROMETHEE II net outranking flow with the usual (strict) preference function.
+    
+    The flow of a platform on a metric is the number of platforms it beats
+    minus the number that beat it, which is read from the sorted metric row
+    instead of comparing every pair of platforms.
+    """
+    n = normalized.shape[1]
+    if n < 2:
+        return np.zeros(n)
+    
+    flows = np.empty_like(normalized)
+    for i, row in enumerate(normalized):
+        ordered = np.sort(row)
+        beaten = np.searchsorted(ordered, row, side='left')
+        beating = n - np.searchsorted(ordered, row, side='right')
+        flows[i] = beaten - beating
+    return weights @ flows / (n - 1)
+
+
+@register_method('AHP')
+def ahp_scores(normalized: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    AHP distributive synthesis.
+    
+    The normalized scores are taken as consistent pairwise comparisons, so the
+    local priority of a platform is its share of the metric row; metrics on
+    which all platforms score 0 give every platform an equal share.
+    """
+    totals = normalized.sum(axis=1, keepdims=True)
+    shares = np.where(totals != 0, _safe_divide(normalized, totals), 1 / normalized.shape[1])
+    return weights @ shares
+
+
+def run_mcda(platform_scores: pd.DataFrame,
+             weights: Union[Dict[str, float], np.ndarray],
+             metric_types: Dict[str, str],
+             methods: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Rank the platforms with several MCDA methods over one normalized matrix.
+    
+    Args:
+        platform_scores: DataFrame with metrics as rows, platforms as columns
+        weights: Dictionary of hierarchical weights for each metric, or a
+                 weight vector aligned to the platform_scores rows
+        metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+        methods: Registered method names (default: all)
+    
+    Returns:
+        Dictionary containing:
+            - scores: Score of each platform per method (methods x platforms, higher is better)
+            - ranks: 1-based rank of each platform per method (methods x platforms)
+            - ranking: Platform names ordered best-first per method (methods x positions)
+            - agreement: Spearman correlation of the method rankings, ties sharing their
+              mean rank (methods x methods)
+    
+    Raises:
+        ValueError: If a method is not registered
+    """
+    methods = list(methods) if methods is not None else list(MCDA_METHODS)
+    unknown = [name for name in methods if name not in MCDA_METHODS]
+    if unknown:
+        raise ValueError(f"Unknown MCDA methods: {', '.join(unknown)} (available: {', '.join(MCDA_METHODS)})")
+    
+    metrics = platform_scores.index
+    platforms = platform_scores.columns
+    
+    normalized = _normalize_array(_as_matrix(platform_scores), _benefit_mask(metrics, metric_types))
+    weight_vector = _weight_vector(metrics, weights)
+    
+    scores = np.vstack([MCDA_METHODS[name](normalized, weight_vector) for name in methods])
+    order, ranks = _rank_array(scores)
+    
+    method_index = pd.Index(methods, name='Method')
+    agreement = _spearman_matrix(scores)
+    
+    return {
+        'scores': pd.DataFrame(scores, index=method_index, columns=platforms),
+        'ranks': pd.DataFrame(ranks, index=method_index, columns=platforms),
+        'ranking': pd.DataFrame(np.asarray(platforms, dtype=object)[order], index=method_index,
+                                columns=pd.RangeIndex(1, len(platforms) + 1, name='Rank'), dtype=object),
+        'agreement': pd.DataFrame(agreement, index=method_index, columns=methods)
+    }
+
+
+if __name__ == "__main__":
+    from data_loader import load_platform_scores, load_default_weights, prepare_topsis_input
+    
+    scores_df, metric_types = load_platform_scores()
+    _, _, hierarchical_weights = load_default_weights()
+    
+    result = run_mcda(prepare_topsis_input(scores_df), hierarchical_weights, metric_types)
+    
+    print("Scores:")
+    print(result['scores'].round(4).to_string())
+    print("\nRanking:")
+    print(result['ranking'].to_string())
+    print("\nRank agreement (Spearman):")
+    print(result['agreement'].round(3).to_string())
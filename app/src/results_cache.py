@@ -0,0 +1,219 @@
+"""
+Memoization of analysis results for the DataOps Platform Comparison Tool.
+Results are stored in a bounded LRU cache keyed by a content hash of the
+score matrix, metric types and weights, and shared across sessions.
+Dimension scores are aggregated from the precomputed group index of the
+caller's score catalog (data_loader.load_catalog), which is cached as a
+shared resource and does not take up result slots.
+"""
+
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from catalog import ScoreCatalog
+from data_loader import prepare_topsis_input
+from topsis import run_topsis_analysis
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Stable content hash of a DataFrame (values, index and column labels).
+    
+    Args:
+        df: DataFrame to hash
+    
+    Returns:
+        Hex digest that is identical across processes for equal content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    digest.update(repr(list(df.dtypes.astype(str))).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def hash_mapping(mapping: Dict) -> str:
+    """
+    Stable content hash of a (possibly nested) dictionary.
+    
+    Args:
+        mapping: Dictionary with string keys and scalar or dictionary values
+    
+    Returns:
+        Hex digest independent of key insertion order
+    """
+    def canonical(value):
+        if isinstance(value, dict):
+            return tuple(sorted((str(k), canonical(v)) for k, v in value.items()))
+        if isinstance(value, float):
+            return float(value).hex()
+        return repr(value)
+    
+    return hashlib.blake2b(repr(canonical(mapping)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def hash_weights(weights: Union[Dict[str, float], np.ndarray]) -> str:
+    """
+    Stable content hash of a weight dictionary or an aligned weight vector.
+    
+    Args:
+        weights: Dictionary of weights or float array
+    
+    Returns:
+        Hex digest (vectors and dictionaries never collide)
+    """
+    if isinstance(weights, np.ndarray):
+        digest = hashlib.blake2b(b'vector', digest_size=16)
+        digest.update(np.ascontiguousarray(weights, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+    return hash_mapping(weights)
+
+
+class ResultCache:
+    """
+    Thread-safe bounded LRU cache with hit/miss counters.
+    
+    Concurrent requests for the same missing key wait for a single computation
+    instead of computing the result once per caller.
+    """
+    
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        
+        Args:
+            key: Hashable cache key
+            compute: Zero-argument function producing the value
+        
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            with self._lock:
+                # Another caller may have finished the computation while we waited
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                self.misses += 1
+            
+            try:
+                value = compute()
+                
+                with self._lock:
+                    self._entries[key] = value
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            finally:
+                # Also on failure, so keys whose computation raised do not keep their lock
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        
+        return value
+    
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, size and maxsize
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+# Shared by all sessions served by this process
+ANALYSIS_CACHE = ResultCache(maxsize=256)
+
+
+def analysis_cache_key(scores_df: pd.DataFrame,
+                       weights: Union[Dict[str, float], np.ndarray],
+                       metric_types: Dict[str, str],
+                       metric_weights: Optional[np.ndarray] = None,
+                       top_k: Optional[int] = None) -> Tuple:
+    """
+    Build the cache key for one analysis.
+    
+    Args:
+        scores_df: DataFrame with Dimension, Metric, and platform columns
+        weights: Dictionary of hierarchical weights for each metric, or a
+                 weight vector aligned to the scores_df rows
+        metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+        metric_weights: Within-dimension metric weights used for the dimension scores
+        top_k: Number of ranked platforms (None for all)
+    
+    Returns:
+        Tuple of content hashes and top_k
+    """
+    key = (hash_frame(scores_df), hash_mapping(metric_types), hash_weights(weights), top_k)
+    return key if metric_weights is None else key + (hash_weights(metric_weights),)
+
+
+def run_cached_analysis(scores_df: pd.DataFrame,
+                        weights: Union[Dict[str, float], np.ndarray],
+                        metric_types: Dict[str, str],
+                        cache: ResultCache = None,
+                        metric_weights: Optional[np.ndarray] = None,
+                        top_k: Optional[int] = None,
+                        catalog: Optional[ScoreCatalog] = None) -> Tuple[Dict, pd.DataFrame]:
+    """
+    Run TOPSIS and dimension aggregation, reusing results for identical inputs.
+    
+    The returned objects are shared between callers and must not be modified.
+    
+    Args:
+        scores_df: DataFrame with Dimension, Metric, and platform columns
+        weights: Dictionary of hierarchical weights for each metric, or a
+                 weight vector aligned to the scores_df rows
+        metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+        cache: Cache to use (defaults to the process-wide ANALYSIS_CACHE)
+        metric_weights: Within-dimension metric weights aligned to the scores_df
+                        rows; dimension scores are then weighted averages instead
+                        of the catalog's plain means
+        top_k: Rank only the k best platforms (see run_topsis_analysis)
+        catalog: Score catalog of scores_df (built on a cache miss if omitted)
+    
+    Returns:
+        Tuple of (topsis_results, dimension_scores)
+    """
+    cache = cache if cache is not None else ANALYSIS_CACHE
+    
+    def compute():
+        topsis_results = run_topsis_analysis(prepare_topsis_input(scores_df, catalog), weights, metric_types, top_k)
+        score_catalog = catalog if catalog is not None else ScoreCatalog(scores_df, metric_types)
+        dimension_scores = score_catalog.dimension_scores(metric_weights)
+        return topsis_results, dimension_scores
+    
+    return cache.get_or_compute(analysis_cache_key(scores_df, weights, metric_types, metric_weights, top_k), compute)
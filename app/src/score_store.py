@@ -0,0 +1,203 @@
+"""
+Columnar store for platform scores and weights.
+The CSV files in the data folder are converted to uncompressed Arrow IPC
+files with typed schemas, which are loaded through a memory map: columns are
+used in place without parsing, and selecting a subset of platforms never
+touches the other platform columns.
+
+pyarrow is optional and only imported once a converted file exists; without
+it (or without converted files) the CSV files are read as before.
+"""
+
+import functools
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+
+METADATA_COLUMNS = ['Dimension', 'Metric', 'Metric_Type']
+METRIC_TYPES = ('benefit', 'cost')
+WEIGHT_LEVELS = ('dimension', 'metric')
+
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """The pyarrow module, or None if it is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow is installed."""
+    return _pyarrow() is not None
+
+
+def arrow_path(csv_path: Path) -> Path:
+    """Path of the Arrow file converted from a CSV file."""
+    return Path(csv_path).with_suffix('.arrow')
+
+
+def _check_values(df: pd.DataFrame, column: str, allowed: Sequence[str]) -> None:
+    """Raise ValueError if a column contains values outside the allowed set."""
+    unknown = sorted(set(df[column].astype(str)) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown {column} values: {', '.join(unknown)} (expected {', '.join(allowed)})")
+
+
+def _dictionary_field(name: str) -> 'pyarrow.Field':
+    """Dictionary-encoded string field for low-cardinality columns."""
+    pa = _pyarrow()
+    return pa.field(name, pa.dictionary(pa.int8(), pa.string()), nullable=False)
+
+
+def scores_schema(df: pd.DataFrame) -> 'pyarrow.Schema':
+    """
+    Typed schema of a scores table.
+    
+    Dimension and Metric_Type are dictionary-encoded; platform columns keep
+    the numeric type they were parsed with (int64 or float64).
+    """
+    pa = _pyarrow()
+    fields = []
+    for column in df.columns:
+        if column in ('Dimension', 'Metric_Type'):
+            fields.append(_dictionary_field(column))
+        elif column == 'Metric':
+            fields.append(pa.field(column, pa.string(), nullable=False))
+        else:
+            fields.append(pa.field(column, pa.from_numpy_dtype(df[column].dtype)))
+    return pa.schema(fields)
+
+
+def weights_schema() -> 'pyarrow.Schema':
+    """Typed schema of the weights table."""
+    pa = _pyarrow()
+    return pa.schema([
+        _dictionary_field('Level'),
+        _dictionary_field('Category'),
+        pa.field('Item', pa.string(), nullable=False),
+        pa.field('Weight', pa.float64()),
+        pa.field('Normalized_Weight', pa.float64())
+    ])
+
+
+def write_table(df: pd.DataFrame, schema: 'pyarrow.Schema', path: Path) -> Path:
+    """
+    Write a DataFrame as an uncompressed Arrow IPC file (required for zero-copy mapping).
+    
+    Returns:
+        Path of the written file
+    """
+    pa = _pyarrow()
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    tmp_path = path.with_suffix('.arrow.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    tmp_path.replace(path)
+    return path
+
+
+def convert_scores_csv(csv_path: Path) -> Path:
+    """
+    Convert a platform scores CSV file to the Arrow store.
+    
+    Raises:
+        ValueError: If Metric_Type contains values other than benefit/cost
+    """
+    df = pd.read_csv(csv_path)
+    _check_values(df, 'Metric_Type', METRIC_TYPES)
+    for column in df.columns.difference(METADATA_COLUMNS):
+        df[column] = pd.to_numeric(df[column])
+    return write_table(df, scores_schema(df), arrow_path(csv_path))
+
+
+def convert_weights_csv(csv_path: Path) -> Path:
+    """
+    Convert the weights CSV file to the Arrow store.
+    
+    Raises:
+        ValueError: If Level contains values other than dimension/metric
+    """
+    df = pd.read_csv(csv_path)
+    _check_values(df, 'Level', WEIGHT_LEVELS)
+    df[['Weight', 'Normalized_Weight']] = df[['Weight', 'Normalized_Weight']].astype('float64')
+    return write_table(df, weights_schema(), arrow_path(csv_path))
+
+
+def _is_current(csv_path: Path) -> bool:
+    """Whether an Arrow file exists that is at least as new as its CSV source."""
+    store = arrow_path(csv_path)
+    if not store.exists() or not arrow_available():
+        return False
+    return not Path(csv_path).exists() or store.stat().st_mtime >= Path(csv_path).stat().st_mtime
+
+
+def read_arrow(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load an Arrow IPC file through a memory map.
+    
+    Args:
+        path: Arrow file written by write_table
+        columns: Columns to load (default: all)
+    
+    Returns:
+        DataFrame with dictionary columns decoded to strings, matching pd.read_csv
+    """
+    pa = _pyarrow()
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    
+    # split_blocks keeps numeric columns as views of the mapped buffers
+    df = table.to_pandas(split_blocks=True)
+    for field in table.schema:
+        if pa.types.is_dictionary(field.type):
+            df[field.name] = df[field.name].astype(str)
+    return df
+
+
+def read_scores(csv_path: Path, platforms: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read a scores table from the Arrow store, falling back to the CSV file.
+    
+    Args:
+        csv_path: Scores CSV file (its converted .arrow sibling is used if current)
+        platforms: Platform columns to load (default: all)
+    
+    Returns:
+        DataFrame with Dimension, Metric, the selected platforms and Metric_Type
+    """
+    columns = None
+    if platforms is not None:
+        columns = ['Dimension', 'Metric', *platforms, 'Metric_Type']
+    
+    if _is_current(csv_path):
+        return read_arrow(arrow_path(csv_path), columns)
+    
+    df = pd.read_csv(csv_path, usecols=columns)
+    return df[columns] if columns is not None else df
+
+
+def read_weights(csv_path: Path) -> pd.DataFrame:
+    """Read the weights table from the Arrow store, falling back to the CSV file."""
+    if _is_current(csv_path):
+        return read_arrow(arrow_path(csv_path))
+    return pd.read_csv(csv_path)
+
+
+if __name__ == "__main__":
+    from data_loader import DATA_DIR
+    
+    if not arrow_available():
+        raise SystemExit("pyarrow is required to convert the data files")
+    
+    for csv_path in sorted(DATA_DIR.glob('platform_scores*.csv')):
+        print(f"{csv_path.name} -> {convert_scores_csv(csv_path).name}")
+    print(f"weights.csv -> {convert_weights_csv(DATA_DIR / 'weights.csv').name}")
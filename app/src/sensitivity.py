@@ -0,0 +1,261 @@
+"""
+Monte Carlo weight-sensitivity analysis for the TOPSIS ranking.
+Samples weight vectors around a reference weight hierarchy and accumulates
+rank-stability statistics in fixed-size chunks across all CPU cores.
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from topsis import _normalize_array, _benefit_mask, _as_matrix, _batch_distance_arrays, _closeness_array, _rank_array
+from weight_hierarchy import WeightHierarchy
+
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def build_hierarchy_arrays(metrics: List[str],
+                           dimension_weights: Dict[str, float],
+                           metric_weights: Dict[str, Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Align the dimension/metric weight hierarchy to the score matrix row order.
+    
+    Args:
+        metrics: Metric names in score matrix row order
+        dimension_weights: Dictionary of dimension weights
+        metric_weights: Dictionary of dictionaries - dimension -> metric -> weight
+    
+    Returns:
+        Tuple of (dimension_vector, metric_dimension_index, metric_vector)
+        - dimension_vector: Weight of each dimension (in dimension_weights order)
+        - metric_dimension_index: Dimension position of each metric, -1 if unweighted
+        - metric_vector: Within-dimension weight of each metric
+    """
+    hierarchy = WeightHierarchy.from_dicts(dimension_weights, metric_weights, metrics)
+    dimension_vector = hierarchy.dimension_weights
+    dimension_index = hierarchy.metric_dimension
+    metric_vector = hierarchy.metric_weights
+    
+    return dimension_vector, dimension_index, metric_vector
+
+
+def sample_hierarchical_weights(rng: np.random.Generator,
+                                dimension_vector: np.ndarray,
+                                dimension_index: np.ndarray,
+                                metric_vector: np.ndarray,
+                                n_samples: int,
+                                concentration: float) -> np.ndarray:
+    """
+    Draw hierarchical weight vectors from nested Dirichlet perturbations.
+    
+    Dimension weights are drawn from Dirichlet(concentration * dimension_vector)
+    and the metric weights of every dimension from Dirichlet(concentration *
+    metric weights of that dimension), so every sample keeps the hierarchy and
+    its expected value equals the reference weights. Higher concentration
+    means smaller perturbations.
+    
+    Returns:
+        Array shaped (n_samples x metrics) of final hierarchical weights
+    """
+    dimension_samples = rng.dirichlet(np.maximum(concentration * dimension_vector, 1e-9), size=n_samples)
+    samples = np.zeros((n_samples, len(metric_vector)))
+    
+    for position in range(len(dimension_vector)):
+        members = np.flatnonzero(dimension_index == position)
+        total = metric_vector[members].sum()
+        if len(members) == 0 or total <= 0:
+            # Metrics of a dimension without metric weights stay at 0, as in the reference
+            continue
+        alpha = np.maximum(concentration * metric_vector[members] / total, 1e-9)
+        samples[:, members] = rng.dirichlet(alpha, size=n_samples) * dimension_samples[:, [position]]
+    
+    return samples
+
+
+def _simulate_chunk(normalized: np.ndarray,
+                    dimension_vector: np.ndarray,
+                    dimension_index: np.ndarray,
+                    metric_vector: np.ndarray,
+                    n_samples: int,
+                    concentration: float,
+                    seed: np.random.SeedSequence,
+                    chunk_size: int,
+                    bins: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate n_samples weight vectors in chunks of chunk_size and return partial statistics.
+    
+    Only the accumulators (rank counts, score histograms, sums) outlive a chunk,
+    so memory is bounded by chunk_size regardless of n_samples.
+    """
+    rng = np.random.default_rng(seed)
+    n_platforms = normalized.shape[1]
+    rank_counts = np.zeros((n_platforms, n_platforms), dtype=np.int64)
+    histogram = np.zeros((n_platforms, bins), dtype=np.int64)
+    score_sum = np.zeros(n_platforms)
+    score_sq_sum = np.zeros(n_platforms)
+    columns = np.arange(n_platforms)[None, :]
+    
+    remaining = n_samples
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        remaining -= size
+        
+        weights = sample_hierarchical_weights(rng, dimension_vector, dimension_index,
+                                              metric_vector, size, concentration)
+        d_plus, d_minus = _batch_distance_arrays(normalized, weights)
+        scores = _closeness_array(d_plus, d_minus)
+        _, ranks = _rank_array(scores)
+        
+        # Flattened (platform, rank) and (platform, bin) cells counted with bincount
+        rank_cells = columns * n_platforms + (ranks - 1)
+        rank_counts += np.bincount(rank_cells.ravel(), minlength=n_platforms * n_platforms).reshape(rank_counts.shape)
+        
+        bin_index = np.clip(np.nan_to_num(scores * bins).astype(np.intp), 0, bins - 1)
+        histogram += np.bincount((columns * bins + bin_index).ravel(), minlength=n_platforms * bins).reshape(histogram.shape)
+        
+        score_sum += scores.sum(axis=0)
+        score_sq_sum += np.square(scores).sum(axis=0)
+    
+    return rank_counts, histogram, score_sum, score_sq_sum
+
+
+def _histogram_quantiles(histogram: np.ndarray, quantiles) -> np.ndarray:
+    """Interpolate quantiles on [0, 1] from per-platform fixed-width histograms."""
+    bins = histogram.shape[1]
+    cumulative = np.cumsum(histogram, axis=1)
+    totals = cumulative[:, -1:]
+    result = np.empty((histogram.shape[0], len(quantiles)))
+    
+    for j, q in enumerate(quantiles):
+        target = q * totals[:, 0]
+        upper = np.array([np.searchsorted(row, t, side='left') for row, t in zip(cumulative, target)])
+        upper = np.minimum(upper, bins - 1)
+        below = np.where(upper > 0, cumulative[np.arange(len(upper)), upper - 1], 0)
+        in_bin = histogram[np.arange(len(upper)), upper]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(in_bin > 0, (target - below) / in_bin, 0.5)
+        result[:, j] = (upper + np.clip(fraction, 0, 1)) / bins
+    
+    return result
+
+
+def run_sensitivity_analysis(platform_scores: pd.DataFrame,
+                             dimension_weights: Dict[str, float],
+                             metric_weights: Dict[str, Dict[str, float]],
+                             metric_types: Dict[str, str],
+                             n_samples: int = 100_000,
+                             concentration: float = 100.0,
+                             chunk_size: int = 20_000,
+                             workers: Optional[int] = None,
+                             seed: Optional[int] = None,
+                             bins: int = 1000,
+                             quantiles=DEFAULT_QUANTILES) -> Dict:
+    """
+    Estimate how stable the TOPSIS ranking is under perturbed weights.
+    
+    Args:
+        platform_scores: DataFrame with metrics as rows, platforms as columns
+        dimension_weights: Reference dimension weights (e.g. from weights.csv)
+        metric_weights: Reference metric weights - dimension -> metric -> weight
+        metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+        n_samples: Number of weight vectors to sample
+        concentration: Dirichlet concentration (higher = tighter around the reference)
+        chunk_size: Samples evaluated at once per worker (bounds memory)
+        workers: Worker processes, defaults to all CPU cores; 1 runs in-process
+        seed: Seed for reproducible sampling
+        bins: Histogram resolution used for the score quantiles
+        quantiles: Score quantiles to report
+    
+    Returns:
+        Dictionary containing:
+            - rank_probabilities: Probability of each platform (rows) taking each rank (columns)
+            - score_quantiles: TOPSIS score quantiles per platform
+            - mean_scores: Mean TOPSIS score per platform
+            - std_scores: Standard deviation of the TOPSIS score per platform
+            - samples: Number of evaluated weight vectors
+            - elapsed: Wall time in seconds
+            - samples_per_sec: Throughput
+    
+    Raises:
+        ValueError: If n_samples is smaller than 1
+    """
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be at least 1, got {n_samples}")
+    
+    start = time.perf_counter()
+    
+    metrics = platform_scores.index
+    platforms = platform_scores.columns
+    normalized = _normalize_array(_as_matrix(platform_scores), _benefit_mask(metrics, metric_types))
+    hierarchy = build_hierarchy_arrays(list(metrics), dimension_weights, metric_weights)
+    
+    workers = workers or os.cpu_count() or 1
+    n_tasks = max(1, min(workers, -(-n_samples // chunk_size)))
+    task_sizes = [n_samples // n_tasks + (1 if i < n_samples % n_tasks else 0) for i in range(n_tasks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_tasks)
+    
+    task_args = [
+        (normalized, *hierarchy, size, concentration, task_seed, chunk_size, bins)
+        for size, task_seed in zip(task_sizes, seeds)
+    ]
+    
+    if n_tasks == 1:
+        partials = [_simulate_chunk(*task_args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_tasks) as executor:
+            partials = list(executor.map(_simulate_chunk, *zip(*task_args)))
+    
+    rank_counts = sum(p[0] for p in partials)
+    histogram = sum(p[1] for p in partials)
+    score_sum = sum(p[2] for p in partials)
+    score_sq_sum = sum(p[3] for p in partials)
+    
+    mean = score_sum / n_samples
+    std = np.sqrt(np.maximum(score_sq_sum / n_samples - np.square(mean), 0))
+    elapsed = time.perf_counter() - start
+    
+    ranks = pd.RangeIndex(1, len(platforms) + 1, name='Rank')
+    
+    return {
+        'rank_probabilities': pd.DataFrame(rank_counts / n_samples, index=platforms, columns=ranks),
+        'score_quantiles': pd.DataFrame(_histogram_quantiles(histogram, quantiles),
+                                        index=platforms, columns=list(quantiles)),
+        'mean_scores': pd.Series(mean, index=platforms),
+        'std_scores': pd.Series(std, index=platforms),
+        'samples': n_samples,
+        'elapsed': elapsed,
+        'samples_per_sec': n_samples / elapsed if elapsed > 0 else float('inf')
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from data_loader import load_platform_scores, load_default_weights, prepare_topsis_input
+    
+    parser = argparse.ArgumentParser(description="Monte Carlo weight sensitivity of the TOPSIS ranking")
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--concentration", type=float, default=100.0)
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    scores_df, metric_types = load_platform_scores()
+    dim_weights, metric_weights, _ = load_default_weights()
+    
+    result = run_sensitivity_analysis(
+        prepare_topsis_input(scores_df), dim_weights, metric_weights, metric_types,
+        n_samples=args.samples, concentration=args.concentration,
+        chunk_size=args.chunk_size, workers=args.workers, seed=args.seed
+    )
+    
+    print("Rank probabilities:")
+    print(result['rank_probabilities'].round(4).to_string())
+    print("\nScore quantiles:")
+    print(result['score_quantiles'].round(4).to_string())
+    print(f"\n{result['samples']:,} samples in {result['elapsed']:.2f} s "
+          f"({result['samples_per_sec']:,.0f} samples/sec)")
@@ -5,7 +5,208 @@ This module calculates multi-criteria decision analysis scores for DataOps platf
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+from tracing import span, traced
+from weight_hierarchy import WeightHierarchy
+
+
+def _as_matrix(df: pd.DataFrame) -> np.ndarray:
+    """Return the DataFrame values as a C-contiguous float64 array."""
+    return np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+
+
+def _benefit_mask(metrics, metric_types: Dict[str, str]) -> np.ndarray:
+    """Boolean vector marking benefit metrics (unknown metrics count as benefit)."""
+    return np.array([metric_types.get(metric, 'benefit') == 'benefit' for metric in metrics],
+                    dtype=bool)
+
+
+def _weight_vector(metrics, weights: Union[Dict[str, float], np.ndarray]) -> np.ndarray:
+    """
+    Weight vector aligned to the metric order (missing metrics get weight 0).
+    
+    Arrays are taken as already aligned (e.g. WeightHierarchy.hierarchical_vector()).
+    """
+    if isinstance(weights, np.ndarray):
+        if weights.shape != (len(metrics),):
+            raise ValueError(f"Weight vector has shape {weights.shape}, expected ({len(metrics)},)")
+        return weights.astype(np.float64, copy=False)
+    return np.array([weights.get(metric, 0) for metric in metrics], dtype=np.float64)
+
+
+def _normalize_array(values: np.ndarray, benefit: np.ndarray) -> np.ndarray:
+    """
+    Min-max normalize each row of a (metrics x platforms) matrix.
+    
+    Rows where all platforms score the same are set to 0.5, cost rows are inverted.
+    """
+    min_val = values.min(axis=1, keepdims=True)
+    max_val = values.max(axis=1, keepdims=True)
+    spread = max_val - min_val
+    constant = spread == 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalized = np.where(benefit[:, None], values - min_val, max_val - values) / spread
+    
+    return np.where(constant, 0.5, normalized)
+
+
+def _ideal_arrays(weighted: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise maximum (PIS) and minimum (NIS) of the weighted matrix."""
+    return weighted.max(axis=1), weighted.min(axis=1)
+
+
+def _distance_arrays(weighted: np.ndarray,
+                     pis: np.ndarray,
+                     nis: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Euclidean distance of every platform column to PIS and NIS."""
+    d_plus = np.sqrt(np.square(weighted - pis[:, None]).sum(axis=0))
+    d_minus = np.sqrt(np.square(weighted - nis[:, None]).sum(axis=0))
+    return d_plus, d_minus
+
+
+def _closeness_array(d_plus: np.ndarray, d_minus: np.ndarray) -> np.ndarray:
+    """Relative closeness D- / (D+ + D-)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return d_minus / (d_plus + d_minus)
+
+
+def _batch_distance_arrays(normalized: np.ndarray,
+                           weight_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distances to PIS and NIS for many weight vectors over one normalized matrix.
+    
+    For a metric row weighted by w, the ideal values are w * max(row) and
+    w * min(row) (swapped when w < 0), so the squared distance contribution is
+    w^2 * (row - extreme)^2. Both distance vectors therefore reduce to matrix
+    products of the squared weights with two weight-independent deviation
+    matrices, without materializing a weighted matrix per profile.
+    
+    Args:
+        normalized: (metrics x platforms) normalized matrix
+        weight_matrix: (profiles x metrics) weight matrix
+    
+    Returns:
+        Tuple of (d_plus, d_minus) arrays shaped (profiles x platforms)
+    """
+    dev_high = np.square(normalized - normalized.max(axis=1, keepdims=True))
+    dev_low = np.square(normalized - normalized.min(axis=1, keepdims=True))
+    squared = np.square(weight_matrix)
+    
+    if (weight_matrix >= 0).all():
+        d_plus_sq = squared @ dev_high
+        d_minus_sq = squared @ dev_low
+    else:
+        positive = np.where(weight_matrix >= 0, squared, 0.0)
+        negative = squared - positive
+        d_plus_sq = positive @ dev_high + negative @ dev_low
+        d_minus_sq = positive @ dev_low + negative @ dev_high
+    
+    return np.sqrt(d_plus_sq), np.sqrt(d_minus_sq)
+
+
+def _rank_array(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank platforms by descending score along the last axis.
+    
+    Returns:
+        Tuple of (order, ranks): column indices sorted best-first and the
+        1-based rank of every column
+    """
+    order = np.argsort(-scores, axis=-1, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[-1] + 1), axis=-1)
+    return order, ranks
+
+
+def _top_k_array(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Column indices of the k best scores, best-first.
+    
+    Uses partial selection, so only the selected columns are sorted. Ties are
+    broken by column position and NaN scores sort last, giving the same
+    prefix as _rank_array.
+    
+    Raises:
+        ValueError: If k is smaller than 1
+    """
+    if k < 1:
+        raise ValueError(f"top_k must be at least 1, got {k}")
+    if k >= scores.shape[0]:
+        return _rank_array(scores)[0]
+    
+    # NaN (e.g. D+ + D- = 0 when all platforms score the same) compares false; rank it below every score
+    keys = np.where(np.isnan(scores), -np.inf, scores)
+    kth = keys[np.argpartition(-keys, k - 1)[k - 1]]
+    above = np.flatnonzero(keys > kth)
+    tied = np.flatnonzero(keys == kth)[:k - above.size]
+    selected = np.concatenate([above, tied])
+    return selected[np.lexsort((selected, -keys[selected]))]
+
+
+def full_ranking(topsis_results: Dict) -> pd.Series:
+    """
+    All platforms ranked by TOPSIS score, also for a top-k analysis.
+    
+    Args:
+        topsis_results: Result of run_topsis_analysis
+    
+    Returns:
+        TOPSIS scores of every platform, best-first (same order as without top_k)
+    """
+    ranking = topsis_results['ranking']
+    topsis_scores = topsis_results['topsis_scores']
+    if len(ranking) == len(topsis_scores):
+        return ranking
+    return topsis_scores.iloc[_rank_array(topsis_scores.to_numpy())[0]]
+
+
+def _compact_ranks(order: np.ndarray, n: int) -> np.ndarray:
+    """
+    1-based rank of every column in the smallest unsigned integer type that holds n.
+    
+    Columns missing from order (outside a top-k selection) get rank 0.
+    """
+    ranks = np.zeros(n, dtype=np.min_scalar_type(n))
+    ranks[order] = np.arange(1, order.size + 1)
+    return ranks
+
+
+def group_means(values: np.ndarray,
+                group_codes: np.ndarray,
+                n_groups: int,
+                metric_weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Average the rows of a (metrics x platforms) matrix per group.
+    
+    NaN scores are skipped, as in DataFrame.groupby().mean(). With metric
+    weights the average is weighted; groups whose weights sum to zero fall
+    back to the plain mean.
+    
+    Args:
+        values: Score matrix
+        group_codes: Group position of every row
+        n_groups: Number of groups
+        metric_weights: Weight of every row (default: equal weights)
+    
+    Returns:
+        (groups x platforms) matrix, NaN where a group has no scores
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    indicator = np.zeros((n_groups, values.shape[0]))
+    indicator[group_codes, np.arange(values.shape[0])] = 1.0
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (indicator @ filled) / (indicator @ valid)
+        if metric_weights is None:
+            return means
+        
+        weighted_indicator = indicator * metric_weights
+        totals = weighted_indicator @ valid
+        weighted = (weighted_indicator @ filled) / totals
+    return np.where(totals != 0, weighted, means)
 
 
 def normalize_metrics(df: pd.DataFrame, metric_types: Dict[str, str]) -> pd.DataFrame:
@@ -19,25 +220,8 @@ def normalize_metrics(df: pd.DataFrame, metric_types: Dict[str, str]) -> pd.Data
     Returns:
         Normalized DataFrame with values between 0 and 1
     """
-    normalized_df = df.copy()
-    
-    for metric in df.index:
-        values = df.loc[metric].values
-        min_val = values.min()
-        max_val = values.max()
-        
-        if max_val == min_val:
-            # If all values are the same, set to 0.5
-            normalized_df.loc[metric] = 0.5
-        else:
-            if metric_types.get(metric, 'benefit') == 'benefit':
-                # For benefit metrics: higher is better
-                normalized_df.loc[metric] = (values - min_val) / (max_val - min_val)
-            else:
-                # For cost metrics: lower is better (invert normalization)
-                normalized_df.loc[metric] = (max_val - values) / (max_val - min_val)
-    
-    return normalized_df
+    normalized = _normalize_array(_as_matrix(df), _benefit_mask(df.index, metric_types))
+    return pd.DataFrame(normalized, index=df.index, columns=df.columns)
 
 
 def calculate_weighted_matrix(normalized_df: pd.DataFrame, weights: Dict[str, float]) -> pd.DataFrame:
@@ -51,13 +235,9 @@ def calculate_weighted_matrix(normalized_df: pd.DataFrame, weights: Dict[str, fl
     Returns:
         Weighted normalized matrix
     """
-    weighted_df = normalized_df.copy()
-    
-    for metric in weighted_df.index:
-        weight = weights.get(metric, 0)
-        weighted_df.loc[metric] = weighted_df.loc[metric] * weight
-    
-    return weighted_df
+    weight_vector = _weight_vector(normalized_df.index, weights)
+    weighted = _as_matrix(normalized_df) * weight_vector[:, None]
+    return pd.DataFrame(weighted, index=normalized_df.index, columns=normalized_df.columns)
 
 
 def find_ideal_solutions(weighted_df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
@@ -71,12 +251,10 @@ def find_ideal_solutions(weighted_df: pd.DataFrame) -> Tuple[pd.Series, pd.Serie
         Tuple of (PIS, NIS) as pandas Series
     """
     # PIS: Maximum value for each metric across all platforms
-    pis = weighted_df.max(axis=1)
-    
     # NIS: Minimum value for each metric across all platforms
-    nis = weighted_df.min(axis=1)
+    pis, nis = _ideal_arrays(_as_matrix(weighted_df))
     
-    return pis, nis
+    return pd.Series(pis, index=weighted_df.index), pd.Series(nis, index=weighted_df.index)
 
 
 def calculate_distances(weighted_df: pd.DataFrame, pis: pd.Series, nis: pd.Series) -> Tuple[pd.Series, pd.Series]:
@@ -91,19 +269,13 @@ def calculate_distances(weighted_df: pd.DataFrame, pis: pd.Series, nis: pd.Serie
     Returns:
         Tuple of (distances_to_pis, distances_to_nis)
     """
-    distances_to_pis = {}
-    distances_to_nis = {}
-    
-    for platform in weighted_df.columns:
-        # Calculate Euclidean distance to PIS
-        d_plus = np.sqrt(np.sum((weighted_df[platform] - pis) ** 2))
-        distances_to_pis[platform] = d_plus
-        
-        # Calculate Euclidean distance to NIS
-        d_minus = np.sqrt(np.sum((weighted_df[platform] - nis) ** 2))
-        distances_to_nis[platform] = d_minus
+    d_plus, d_minus = _distance_arrays(
+        _as_matrix(weighted_df),
+        pis.reindex(weighted_df.index).to_numpy(dtype=np.float64),
+        nis.reindex(weighted_df.index).to_numpy(dtype=np.float64)
+    )
     
-    return pd.Series(distances_to_pis), pd.Series(distances_to_nis)
+    return pd.Series(d_plus, index=weighted_df.columns), pd.Series(d_minus, index=weighted_df.columns)
 
 
 def calculate_topsis_scores(d_plus: pd.Series, d_minus: pd.Series) -> pd.Series:
@@ -121,16 +293,23 @@ def calculate_topsis_scores(d_plus: pd.Series, d_minus: pd.Series) -> pd.Series:
     return topsis_scores
 
 
+@traced('topsis')
 def run_topsis_analysis(platform_scores: pd.DataFrame, 
-                        weights: Dict[str, float],
-                        metric_types: Dict[str, str]) -> Dict:
+                        weights: Union[Dict[str, float], np.ndarray],
+                        metric_types: Dict[str, str],
+                        top_k: Optional[int] = None) -> Dict:
     """
     Execute complete TOPSIS analysis pipeline.
     
+    The pipeline runs on a single contiguous float64 array; pandas objects are
+    only created for the returned results.
+    
     Args:
         platform_scores: DataFrame with dimensions as rows, platforms as columns
-        weights: Dictionary of hierarchical weights for each metric
+        weights: Dictionary of hierarchical weights for each metric, or a
+                 weight vector aligned to the platform_scores rows
         metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+        top_k: Rank only the k best platforms using partial selection (default: all)
     
     Returns:
         Dictionary containing:
@@ -141,58 +320,141 @@ def run_topsis_analysis(platform_scores: pd.DataFrame,
             - d_plus: Distances to PIS
             - d_minus: Distances to NIS
             - topsis_scores: Final TOPSIS scores
-            - ranking: Platforms ranked by TOPSIS score
+            - ranking: Platforms ranked by TOPSIS score (the top_k best only)
+            - ranks: 1-based rank of each platform in column order as a compact
+                     unsigned integer array, 0 for platforms outside the top_k
+    
+    Raises:
+        ValueError: If top_k is smaller than 1
     """
+    metrics = platform_scores.index
+    platforms = platform_scores.columns
+    values = _as_matrix(platform_scores)
+    
     # Step 1: Normalize metrics
-    normalized = normalize_metrics(platform_scores, metric_types)
+    with span('normalize'):
+        normalized = _normalize_array(values, _benefit_mask(metrics, metric_types))
     
     # Step 2: Apply weights
-    weighted = calculate_weighted_matrix(normalized, weights)
+    with span('weight'):
+        weighted = normalized * _weight_vector(metrics, weights)[:, None]
     
     # Step 3: Find ideal solutions
-    pis, nis = find_ideal_solutions(weighted)
+    with span('ideal'):
+        pis, nis = _ideal_arrays(weighted)
     
     # Step 4: Calculate distances
-    d_plus, d_minus = calculate_distances(weighted, pis, nis)
+    with span('distance'):
+        d_plus, d_minus = _distance_arrays(weighted, pis, nis)
     
     # Step 5: Calculate TOPSIS scores
-    topsis_scores = calculate_topsis_scores(d_plus, d_minus)
+    with span('score'):
+        scores = _closeness_array(d_plus, d_minus)
     
     # Step 6: Rank platforms
-    ranking = topsis_scores.sort_values(ascending=False)
+    with span('rank'):
+        order = _top_k_array(scores, top_k) if top_k is not None else _rank_array(scores)[0]
+    
+    topsis_scores = pd.Series(scores, index=platforms)
     
     return {
-        'normalized_scores': normalized,
-        'weighted_scores': weighted,
-        'pis': pis,
-        'nis': nis,
-        'd_plus': d_plus,
-        'd_minus': d_minus,
+        'normalized_scores': pd.DataFrame(normalized, index=metrics, columns=platforms),
+        'weighted_scores': pd.DataFrame(weighted, index=metrics, columns=platforms),
+        'pis': pd.Series(pis, index=metrics),
+        'nis': pd.Series(nis, index=metrics),
+        'd_plus': pd.Series(d_plus, index=platforms),
+        'd_minus': pd.Series(d_minus, index=platforms),
         'topsis_scores': topsis_scores,
-        'ranking': ranking
+        'ranking': topsis_scores.iloc[order],
+        'ranks': _compact_ranks(order, len(platforms))
+    }
+
+
+def run_topsis_batch(platform_scores: pd.DataFrame,
+                     weight_matrix: Union[pd.DataFrame, np.ndarray],
+                     metric_types: Dict[str, str]) -> Dict:
+    """
+    Execute TOPSIS for many weight profiles in one broadcasted pass.
+    
+    Normalization does not depend on the weights, so it is computed once and
+    shared by all profiles.
+    
+    Args:
+        platform_scores: DataFrame with metrics as rows, platforms as columns
+        weight_matrix: Hierarchical weights shaped (profiles x metrics). A DataFrame
+                       is aligned to the metric order by column name (missing
+                       metrics get weight 0); an ndarray must already be aligned.
+        metric_types: Dictionary mapping metrics to 'benefit' or 'cost'
+    
+    Returns:
+        Dictionary containing:
+            - normalized_scores: Normalized platform scores (shared by all profiles)
+            - d_plus: Distances to PIS (profiles x platforms)
+            - d_minus: Distances to NIS (profiles x platforms)
+            - topsis_scores: Final TOPSIS scores (profiles x platforms)
+            - ranks: 1-based rank of each platform per profile (profiles x platforms)
+            - ranking: Platform names ordered best-first per profile (profiles x positions)
+    """
+    metrics = platform_scores.index
+    platforms = platform_scores.columns
+    
+    if isinstance(weight_matrix, pd.DataFrame):
+        profiles = weight_matrix.index
+        weights = _as_matrix(weight_matrix.reindex(columns=metrics, fill_value=0))
+    else:
+        weights = np.ascontiguousarray(np.atleast_2d(weight_matrix), dtype=np.float64)
+        profiles = pd.RangeIndex(weights.shape[0])
+    
+    if weights.shape[1] != len(metrics):
+        raise ValueError(
+            f"Weight matrix has {weights.shape[1]} metric columns, expected {len(metrics)}"
+        )
+    
+    normalized = _normalize_array(_as_matrix(platform_scores), _benefit_mask(metrics, metric_types))
+    d_plus, d_minus = _batch_distance_arrays(normalized, weights)
+    scores = _closeness_array(d_plus, d_minus)
+    order, ranks = _rank_array(scores)
+    
+    positions = pd.RangeIndex(1, len(platforms) + 1, name='Rank')
+    
+    return {
+        'normalized_scores': pd.DataFrame(normalized, index=metrics, columns=platforms),
+        'd_plus': pd.DataFrame(d_plus, index=profiles, columns=platforms),
+        'd_minus': pd.DataFrame(d_minus, index=profiles, columns=platforms),
+        'topsis_scores': pd.DataFrame(scores, index=profiles, columns=platforms),
+        'ranks': pd.DataFrame(ranks, index=profiles, columns=platforms),
+        # One object block; letting pandas infer a string dtype builds one array per position
+        'ranking': pd.DataFrame(np.asarray(platforms, dtype=object)[order], index=profiles,
+                                columns=positions, dtype=object)
     }
 
 
+@traced('dimension_scores')
 def calculate_dimension_scores(platform_scores_df: pd.DataFrame,
-                               dimension_col: str = 'Dimension') -> pd.DataFrame:
+                               dimension_col: str = 'Dimension',
+                               metric_weights: Optional[Union[Dict[str, float], np.ndarray]] = None) -> pd.DataFrame:
     """
     Calculate aggregated scores for each dimension by averaging metric scores.
     
     Args:
         platform_scores_df: DataFrame with Dimension, Metric, and platform columns
         dimension_col: Name of the dimension column
+        metric_weights: Within-dimension metric weights (dictionary or vector aligned
+                        to the rows) for a weighted average; default is a plain mean
     
     Returns:
-        DataFrame with dimensions as rows and platforms as columns
+        DataFrame with dimensions as rows (sorted) and platforms as columns
     """
     # Get platform columns (exclude Dimension, Metric, Metric_Type)
     platform_cols = [col for col in platform_scores_df.columns 
                     if col not in [dimension_col, 'Metric', 'Metric_Type']]
     
-    # Group by dimension and calculate mean for each platform
-    dimension_scores = platform_scores_df.groupby(dimension_col)[platform_cols].mean()
+    codes, dimensions = pd.factorize(platform_scores_df[dimension_col], sort=True)
+    if metric_weights is not None:
+        metric_weights = _weight_vector(platform_scores_df['Metric'].tolist(), metric_weights)
     
-    return dimension_scores
+    means = group_means(_as_matrix(platform_scores_df[platform_cols]), codes, len(dimensions), metric_weights)
+    return pd.DataFrame(means, index=pd.Index(dimensions, name=dimension_col), columns=platform_cols)
 
 
 def calculate_hierarchical_weights(dimension_weights: Dict[str, float],
@@ -208,15 +470,8 @@ def calculate_hierarchical_weights(dimension_weights: Dict[str, float],
     Returns:
         Dictionary mapping each metric to its final hierarchical weight
     """
-    hierarchical_weights = {}
-    
-    for dimension, dim_weight in dimension_weights.items():
-        if dimension in metric_weights:
-            for metric, metric_weight in metric_weights[dimension].items():
-                # Final weight = dimension weight × metric weight
-                hierarchical_weights[metric] = dim_weight * metric_weight
-    
-    return hierarchical_weights
+    # Final weight = dimension weight × metric weight
+    return WeightHierarchy.from_dicts(dimension_weights, metric_weights).hierarchical_dict()
 
 
 def normalize_weights(weights: Dict[str, float]) -> Dict[str, float]:
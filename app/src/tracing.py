@@ -0,0 +1,245 @@
+"""
+Opt-in tracing of the analysis pipeline and page renders.
+Stages are wrapped in span() blocks or @traced functions; spans opened
+inside trace() belong to one request (e.g. one page render) and are logged
+with its id. When tracing is disabled span() returns a shared no-op context,
+so instrumented code only pays for one flag check.
+
+Configuration (environment variables, read at import):
+
+- TOPSIS_TRACE=1: enable tracing
+- TOPSIS_TRACE_FILE: write span records as JSON lines to this file (default: stderr)
+- TOPSIS_TRACE_MEMORY=1: also record the peak allocation of every span (tracemalloc, slower)
+- TOPSIS_TRACE_PORT: serve aggregated span timings in the Prometheus text
+  format on http://127.0.0.1:<port>/metrics
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+logger = logging.getLogger("topsis.trace")
+
+_enabled = False
+_memory = False
+_server: Optional["ThreadingHTTPServer"] = None
+
+_NOOP = contextlib.nullcontext()
+
+# Request id and open spans (name, memory peaks) of the current thread/context
+_trace_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('trace_id', default=None)
+_stack: contextvars.ContextVar[tuple] = contextvars.ContextVar('span_stack', default=())
+
+# Aggregated span statistics for the metrics endpoint
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """Whether tracing is enabled."""
+    return _enabled
+
+
+def configure(enable: bool = True,
+              log_file: Optional[str] = None,
+              memory: bool = False,
+              port: Optional[int] = None) -> None:
+    """
+    Enable or disable tracing.
+    
+    Args:
+        enable: Record spans
+        log_file: JSON lines file for span records (default: stderr)
+        memory: Record the peak allocation of every span
+        port: Serve the metrics endpoint on this local port
+    """
+    global _enabled, _memory
+    
+    _enabled = enable
+    _memory = enable and memory
+    if _memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    
+    if enable and not logger.handlers:
+        handler = logging.FileHandler(log_file, encoding='utf-8') if log_file else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    
+    if enable and port:
+        serve_metrics(port)
+
+
+def _record(name: str, duration: float, peak_bytes: Optional[int]) -> None:
+    """Log one finished span and add it to the aggregates."""
+    stack = _stack.get()
+    record = {
+        'trace_id': _trace_id.get(),
+        'span': name,
+        'parent': stack[-1][0] if stack else None,
+        'duration_ms': round(duration * 1000, 3),
+        'ts': round(time.time(), 3)
+    }
+    if peak_bytes is not None:
+        record['peak_bytes'] = peak_bytes
+    logger.info(json.dumps(record))
+    
+    with _stats_lock:
+        stats = _stats.setdefault(name, {'count': 0, 'sum': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['sum'] += duration
+        stats['max'] = max(stats['max'], duration)
+
+
+def _update_peaks(stack: tuple, peak: int) -> None:
+    """Carry a traced-memory peak into the open spans before the peak is reset."""
+    for _, memory in stack:
+        if memory is not None:
+            memory[1] = max(memory[1], peak)
+
+
+@contextlib.contextmanager
+def _span(name: str) -> Iterator[None]:
+    """Time a block (and its peak allocation when memory tracing is on)."""
+    memory = None
+    if _memory:
+        current, peak = tracemalloc.get_traced_memory()
+        _update_peaks(_stack.get(), peak)
+        tracemalloc.reset_peak()
+        # [allocated at start, highest allocation seen]
+        memory = [current, current]
+    
+    token = _stack.set(_stack.get() + ((name, memory),))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        peak_bytes = None
+        if memory is not None:
+            # The peak is process-wide, so concurrent requests inflate each other's values
+            _update_peaks(_stack.get(), tracemalloc.get_traced_memory()[1])
+            peak_bytes = memory[1] - memory[0]
+        _stack.reset(token)
+        _record(name, duration, peak_bytes)
+
+
+def span(name: str):
+    """
+    Context manager timing one pipeline stage.
+    
+    Args:
+        name: Stage name, e.g. 'normalize' or 'chart.radar'
+    
+    Returns:
+        Timing context, or a shared no-op context when tracing is disabled
+    """
+    return _span(name) if _enabled else _NOOP
+
+
+@contextlib.contextmanager
+def trace(name: str) -> Iterator[Optional[str]]:
+    """
+    Group the spans of one request under a new trace id.
+    
+    Yields:
+        The trace id (None when tracing is disabled)
+    """
+    if not _enabled:
+        yield None
+        return
+    
+    token = _trace_id.set(uuid.uuid4().hex[:16])
+    try:
+        with _span(name):
+            yield _trace_id.get()
+    finally:
+        _trace_id.reset(token)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator running a function inside span(name)."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def span_stats() -> Dict[str, Dict[str, float]]:
+    """Count, total and maximum seconds per span name since start."""
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def format_metrics() -> str:
+    """Aggregated span timings in the Prometheus text format."""
+    lines: List[str] = [
+        "# HELP topsis_span_seconds Duration of traced stages",
+        "# TYPE topsis_span_seconds summary"
+    ]
+    max_lines = ["# HELP topsis_span_seconds_max Longest duration of traced stages",
+                 "# TYPE topsis_span_seconds_max gauge"]
+    for name, stats in sorted(span_stats().items()):
+        lines.append(f'topsis_span_seconds_count{{span="{name}"}} {stats["count"]}')
+        lines.append(f'topsis_span_seconds_sum{{span="{name}"}} {stats["sum"]:.6f}')
+        max_lines.append(f'topsis_span_seconds_max{{span="{name}"}} {stats["max"]:.6f}')
+    return '\n'.join(lines + max_lines) + '\n'
+
+
+def serve_metrics(port: int) -> "ThreadingHTTPServer":
+    """
+    Start the metrics endpoint on 127.0.0.1 in a daemon thread (once per process).
+    
+    http.server is imported here so that importing this module with tracing
+    disabled does not load it.
+    """
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        """Serves format_metrics() on /metrics."""
+        
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = format_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    if _server is None:
+        _server = ThreadingHTTPServer(('127.0.0.1', port), _MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name='topsis-metrics', daemon=True).start()
+    return _server
+
+
+if os.environ.get('TOPSIS_TRACE', '').lower() in ('1', 'true', 'yes'):
+    configure(
+        log_file=os.environ.get('TOPSIS_TRACE_FILE') or None,
+        memory=os.environ.get('TOPSIS_TRACE_MEMORY', '').lower() in ('1', 'true', 'yes'),
+        port=int(os.environ['TOPSIS_TRACE_PORT']) if os.environ.get('TOPSIS_TRACE_PORT') else None
+    )
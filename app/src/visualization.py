@@ -4,12 +4,13 @@ Creates interactive charts using Plotly.
 """
 
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
-import streamlit as st
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 
+from tracing import traced
 
+
+@traced('chart.radar')
 def create_radar_chart(dimension_scores: pd.DataFrame, 
                       platform_colors: Dict[str, str],
                       title: str = "Srovnání platforem podle dimenzí") -> go.Figure:
@@ -78,6 +79,7 @@ def create_radar_chart(dimension_scores: pd.DataFrame,
     return fig
 
 
+@traced('chart.bar')
 def create_topsis_bar_chart(topsis_scores: pd.Series,
                             platform_colors: Dict[str, str],
                             title: str = "Finální TOPSIS skóre") -> go.Figure:
@@ -131,7 +133,7 @@ def create_topsis_bar_chart(topsis_scores: pd.Series,
             title='',
             tickfont=dict(size=14)
         ),
-        height=400,
+        height=max(400, 130 + 30 * len(platforms)),
         showlegend=False,
         margin=dict(l=150, r=50, t=80, b=50)
     )
@@ -151,6 +153,9 @@ def create_weights_heatmap(weights_df: pd.DataFrame,
     Returns:
         Plotly Figure object
     """
+    # plotly.express pulls in a large dependency tree, only load it when needed
+    import plotly.express as px
+    
     fig = px.imshow(
         weights_df,
         labels=dict(x="Metric", y="Dimension", color="Weight"),
@@ -212,6 +217,47 @@ def create_dimension_weights_pie(dimension_weights: Dict[str, float],
     return fig
 
 
+def create_dimension_weights_bar(dimension_weights: Dict[str, float]) -> go.Figure:
+    """
+    Create a horizontal bar chart of dimension weights in percent.
+    
+    Args:
+        dimension_weights: Dictionary mapping dimension names to weights
+    
+    Returns:
+        Plotly Figure object
+    """
+    dim_data = pd.DataFrame({
+        'Dimenze': [d.replace('_', ' ') for d in dimension_weights.keys()],
+        'Váha (%)': [v * 100 for v in dimension_weights.values()]
+    })
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=dim_data['Váha (%)'],
+            y=dim_data['Dimenze'],
+            orientation='h',
+            marker=dict(
+                color=['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b'],
+                line=dict(color='rgba(0,0,0,0.2)', width=1)
+            ),
+            text=dim_data['Váha (%)'].apply(lambda x: f'{x:.1f}%'),
+            textposition='auto',
+        )
+    ])
+    
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=20, b=20),
+        xaxis_title="Váha (%)",
+        yaxis_title="",
+        showlegend=False,
+        xaxis=dict(range=[0, max(dim_data['Váha (%)']) * 1.1])
+    )
+    
+    return fig
+
+
 def create_detailed_scores_table(scores_df: pd.DataFrame,
                                  dimension_col: str = 'Dimension') -> pd.DataFrame:
     """
@@ -309,7 +355,9 @@ def create_comparison_scatter(topsis_results: Dict,
 
 def create_ranking_table(topsis_scores: pd.Series,
                         d_plus: pd.Series,
-                        d_minus: pd.Series) -> pd.DataFrame:
+                        d_minus: pd.Series,
+                        platforms: Optional[Sequence[str]] = None,
+                        first_rank: int = 1) -> pd.DataFrame:
     """
     Create a formatted ranking table with TOPSIS details.
     
@@ -317,15 +365,20 @@ def create_ranking_table(topsis_scores: pd.Series,
         topsis_scores: Final TOPSIS scores
         d_plus: Distances to positive ideal solution
         d_minus: Distances to negative ideal solution
+        platforms: Already ranked platforms to show, e.g. one page of the
+                   ranking (default: all platforms sorted by score)
+        first_rank: Rank of the first platform in platforms
     
     Returns:
         Formatted DataFrame with rankings
     """
     # Sort by TOPSIS score (descending)
-    sorted_platforms = topsis_scores.sort_values(ascending=False).index
+    if platforms is None:
+        platforms = topsis_scores.sort_values(ascending=False).index
+    sorted_platforms = list(platforms)
     
     ranking_data = {
-        'Rank': range(1, len(sorted_platforms) + 1),
+        'Rank': range(first_rank, first_rank + len(sorted_platforms)),
         'Platform': [p.replace('_', ' ') for p in sorted_platforms],
         'D+ (Distance to PIS)': [f'{d_plus[p]:.4f}' for p in sorted_platforms],
         'D- (Distance to NIS)': [f'{d_minus[p]:.4f}' for p in sorted_platforms],
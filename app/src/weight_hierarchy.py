@@ -0,0 +1,171 @@
+"""
+Array-backed dimension/metric weight hierarchy.
+Metric weights are stored as a dense vector aligned to the score matrix rows
+together with the dimension position of every metric, so normalization,
+the dimension x metric multiplication and validation are single vectorized
+operations instead of nested dictionary loops.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+
+class WeightHierarchy:
+    """
+    Two-level weight hierarchy aligned to a metric order.
+    
+    Attributes:
+        dimensions: Dimension names
+        metrics: Metric names (score matrix row order)
+        dimension_weights: Weight of each dimension
+        metric_dimension: Dimension position of each metric, -1 if the metric is unweighted
+        metric_weights: Within-dimension weight of each metric
+    """
+    
+    def __init__(self,
+                 dimensions: Sequence[str],
+                 metrics: Sequence[str],
+                 dimension_weights: np.ndarray,
+                 metric_dimension: np.ndarray,
+                 metric_weights: np.ndarray):
+        self.dimensions = list(dimensions)
+        self.metrics = list(metrics)
+        self.dimension_weights = np.asarray(dimension_weights, dtype=np.float64)
+        self.metric_dimension = np.asarray(metric_dimension, dtype=np.intp)
+        self.metric_weights = np.where(self.metric_dimension >= 0,
+                                       np.asarray(metric_weights, dtype=np.float64), 0.0)
+    
+    @classmethod
+    def from_dicts(cls,
+                   dimension_weights: Dict[str, float],
+                   metric_weights: Dict[str, Dict[str, float]],
+                   metrics: Optional[Sequence[str]] = None) -> 'WeightHierarchy':
+        """
+        Build the hierarchy from nested weight dictionaries.
+        
+        Args:
+            dimension_weights: Dictionary of dimension weights
+            metric_weights: Dictionary of dictionaries - dimension -> metric -> weight
+            metrics: Metric order to align to (default: order of metric_weights)
+        """
+        dimensions = list(dimension_weights)
+        position = {dimension: i for i, dimension in enumerate(dimensions)}
+        
+        items = [(metric, position[dimension], weight)
+                 for dimension, weights in metric_weights.items() if dimension in position
+                 for metric, weight in weights.items()]
+        names = [metric for metric, _, _ in items]
+        hierarchy = cls(dimensions, names,
+                        [dimension_weights[d] for d in dimensions],
+                        [dim for _, dim, _ in items],
+                        [weight for _, _, weight in items])
+        return hierarchy.align(metrics) if metrics is not None else hierarchy
+    
+    @classmethod
+    def from_frame(cls,
+                   weights_df: pd.DataFrame,
+                   column: str = 'Normalized_Weight',
+                   metrics: Optional[Sequence[str]] = None) -> 'WeightHierarchy':
+        """
+        Build the hierarchy from a table in the weights.csv layout.
+        
+        Args:
+            weights_df: DataFrame with Level, Category, Item and weight columns
+            column: Weight column to use
+            metrics: Metric order to align to (default: order of the metric rows)
+        """
+        dimension_rows = weights_df[weights_df['Level'] == 'dimension']
+        metric_rows = weights_df[weights_df['Level'] == 'metric']
+        dimensions = pd.Index(dimension_rows['Item'])
+        
+        hierarchy = cls(dimensions, metric_rows['Item'],
+                        dimension_rows[column].to_numpy(dtype=np.float64),
+                        dimensions.get_indexer(metric_rows['Category']),
+                        metric_rows[column].to_numpy(dtype=np.float64))
+        return hierarchy.align(metrics) if metrics is not None else hierarchy
+    
+    @classmethod
+    def from_scores(cls,
+                    scores_df: pd.DataFrame,
+                    dimension_weights: Dict[str, float],
+                    metric_weights: Dict[str, float]) -> 'WeightHierarchy':
+        """
+        Build the hierarchy over the rows of a scores table from flat weight dictionaries.
+        
+        Args:
+            scores_df: DataFrame with Dimension and Metric columns
+            dimension_weights: Dictionary of dimension weights
+            metric_weights: Dictionary of metric weights (missing metrics get 0)
+        """
+        dimensions = pd.Index(list(dimension_weights))
+        metrics = scores_df['Metric'].tolist()
+        return cls(dimensions, metrics,
+                   [dimension_weights[d] for d in dimensions],
+                   dimensions.get_indexer(scores_df['Dimension']),
+                   [metric_weights.get(m, 0.0) for m in metrics])
+    
+    def align(self, metrics: Sequence[str]) -> 'WeightHierarchy':
+        """Reorder to the given metric order; metrics not in the hierarchy are unweighted."""
+        indexer = pd.Index(self.metrics).get_indexer(metrics)
+        found = indexer >= 0
+        return WeightHierarchy(self.dimensions, metrics, self.dimension_weights,
+                               np.where(found, self.metric_dimension[indexer], -1),
+                               np.where(found, self.metric_weights[indexer], 0.0))
+    
+    def _dimension_totals(self) -> np.ndarray:
+        """Sum of the metric weights within each dimension."""
+        weighted = self.metric_dimension >= 0
+        return np.bincount(self.metric_dimension[weighted], weights=self.metric_weights[weighted],
+                           minlength=len(self.dimensions))
+    
+    def normalized(self) -> 'WeightHierarchy':
+        """
+        Normalize dimension weights to sum to 1.0, and metric weights to sum to 1.0 within each dimension.
+        
+        Groups that sum to zero are left unchanged, as in normalize_weights.
+        """
+        total = self.dimension_weights.sum()
+        dimension_weights = self.dimension_weights / total if total != 0 else self.dimension_weights
+        
+        totals = self._dimension_totals()
+        divisor = np.where(totals != 0, totals, 1.0)[np.maximum(self.metric_dimension, 0)]
+        
+        return WeightHierarchy(self.dimensions, self.metrics, dimension_weights,
+                               self.metric_dimension, self.metric_weights / divisor)
+    
+    def hierarchical_vector(self) -> np.ndarray:
+        """Final weight of every metric (dimension weight x metric weight), aligned to self.metrics."""
+        weighted = self.metric_dimension >= 0
+        dimension_weight = self.dimension_weights[np.maximum(self.metric_dimension, 0)]
+        return np.where(weighted, dimension_weight, 0.0) * self.metric_weights
+    
+    def validate(self, tolerance: float = 0.01) -> bool:
+        """
+        Check that the dimension weights and the metric weights of every
+        weighted dimension each sum to approximately 1.0.
+        """
+        if abs(self.dimension_weights.sum() - 1.0) >= tolerance:
+            return False
+        used = np.bincount(self.metric_dimension[self.metric_dimension >= 0], minlength=len(self.dimensions)) > 0
+        return bool(np.all(np.abs(self._dimension_totals()[used] - 1.0) < tolerance))
+    
+    def dimension_dict(self) -> Dict[str, float]:
+        """Dimension weights as a dictionary."""
+        return dict(zip(self.dimensions, self.dimension_weights.tolist()))
+    
+    def metric_dicts(self) -> Dict[str, Dict[str, float]]:
+        """Metric weights as dimension -> metric -> weight (dimensions without metrics are omitted)."""
+        nested = {}
+        rows = zip(self.metrics, self.metric_dimension.tolist(), self.metric_weights.tolist())
+        for metric, dimension, weight in rows:
+            if dimension >= 0:
+                nested.setdefault(self.dimensions[dimension], {})[metric] = weight
+        return {d: nested[d] for d in self.dimensions if d in nested}
+    
+    def hierarchical_dict(self) -> Dict[str, float]:
+        """Final weights of the weighted metrics as a dictionary, in dimension order."""
+        order = np.argsort(self.metric_dimension, kind='stable')
+        final = self.hierarchical_vector()
+        return {self.metrics[i]: float(final[i]) for i in order if self.metric_dimension[i] >= 0}
+
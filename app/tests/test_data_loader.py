@@ -0,0 +1,13 @@
+import pandas as pd
+
+from catalog import ScoreCatalog
+from data_loader import get_platform_columns, prepare_topsis_input
+
+
+def test_catalog_topsis_input_matches_the_scanned_frame():
+    scores_df = pd.DataFrame({'Dimension': ['d1', 'd2'], 'Metric': ['m1', 'm2'], 'Metric_Type': ['benefit', 'cost'],
+                              'A': [1.0, 5.0], 'B': [4.0, 2.0]})
+    catalog = ScoreCatalog(scores_df, {'m1': 'benefit', 'm2': 'cost'})
+    
+    assert get_platform_columns(scores_df, catalog) == get_platform_columns(scores_df) == ['A', 'B']
+    pd.testing.assert_frame_equal(prepare_topsis_input(scores_df, catalog), prepare_topsis_input(scores_df))
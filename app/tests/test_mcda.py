@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from mcda import _average_rank_array, _spearman_matrix
+
+
+def test_average_ranks_share_the_mean_rank_of_ties():
+    scores = np.array([[0.9, 0.5, 0.5, 0.1]])
+    assert _average_rank_array(scores).tolist() == [[1.0, 2.5, 2.5, 4.0]]
+
+
+def test_agreement_does_not_break_ties_by_column_position():
+    # Ordinal ranks would order the tied platforms by column and report 1.0
+    scores = np.array([[3.0, 2.0, 1.0],
+                       [1.0, 1.0, 0.0]])
+    assert _spearman_matrix(scores)[0, 1] == pytest.approx(np.sqrt(3) / 2)
+
+
+def test_agreement_with_a_method_tying_every_platform_is_undefined():
+    scores = np.array([[3.0, 2.0, 1.0],
+                       [0.5, 0.5, 0.5]])
+    agreement = _spearman_matrix(scores)
+    assert np.isnan(agreement[0, 1])
+    assert np.diag(agreement).tolist() == [1.0, 1.0]
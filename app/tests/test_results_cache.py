@@ -0,0 +1,79 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from catalog import ScoreCatalog
+from results_cache import ResultCache, run_cached_analysis
+
+
+def test_get_or_compute_caches_value():
+    cache = ResultCache(maxsize=2)
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return 42
+    
+    assert cache.get_or_compute('key', compute) == 42
+    assert cache.get_or_compute('key', compute) == 42
+    assert len(calls) == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+
+def test_failing_compute_releases_key_lock():
+    cache = ResultCache()
+    
+    def fail():
+        raise RuntimeError("boom")
+    
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('key', fail)
+    
+    assert cache._key_locks == {}
+    assert cache.stats()['size'] == 0
+    # The key can be computed again after the failure
+    assert cache.get_or_compute('key', lambda: 'ok') == 'ok'
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return 'value'
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+               for _ in range(4)]
+    threads[0].start()
+    started.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    
+    assert results == ['value'] * 4
+    assert len(calls) == 1
+    assert cache._key_locks == {}
+
+
+def test_analysis_uses_the_given_catalog_without_caching_it():
+    scores_df = pd.DataFrame({'Dimension': ['d1', 'd1', 'd2'], 'Metric': ['m1', 'm2', 'm3'],
+                              'A': [1.0, 5.0, 3.0], 'B': [5.0, 1.0, 2.0]})
+    metric_types = {'m1': 'benefit', 'm2': 'benefit', 'm3': 'cost'}
+    weights = {'m1': 0.25, 'm2': 0.25, 'm3': 0.5}
+    cache = ResultCache()
+    
+    _, dimension_scores = run_cached_analysis(scores_df, weights, metric_types, cache=cache,
+                                              metric_weights=[0.75, 0.25, 1.0],
+                                              catalog=ScoreCatalog(scores_df, metric_types))
+    
+    assert cache.stats()['size'] == 1
+    assert dimension_scores.loc['d1'].tolist() == [2.0, 4.0]
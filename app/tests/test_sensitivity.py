@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sensitivity import run_sensitivity_analysis, sample_hierarchical_weights
+
+
+def make_inputs():
+    metrics = ['m1', 'm2', 'm3', 'm4']
+    scores = pd.DataFrame([[1, 3, 5], [2, 4, 1], [5, 1, 3], [4, 4, 2]], index=metrics,
+                          columns=['p1', 'p2', 'p3'], dtype=float)
+    metric_types = {metric: 'benefit' for metric in metrics}
+    dimension_weights = {'d1': 0.6, 'd2': 0.4}
+    metric_weights = {'d1': {'m1': 0.5, 'm2': 0.5}, 'd2': {'m3': 0.7, 'm4': 0.3}}
+    return scores, dimension_weights, metric_weights, metric_types
+
+
+def test_rejects_zero_samples():
+    scores, dimension_weights, metric_weights, metric_types = make_inputs()
+    with pytest.raises(ValueError):
+        run_sensitivity_analysis(scores, dimension_weights, metric_weights, metric_types, n_samples=0, workers=1)
+
+
+def test_dimension_with_zero_metric_weights_keeps_them_at_zero():
+    rng = np.random.default_rng(0)
+    samples = sample_hierarchical_weights(rng, np.array([0.6, 0.4]), np.array([0, 0, 1, 1]),
+                                          np.array([0.5, 0.5, 0.0, 0.0]), 100, 100.0)
+    assert np.isfinite(samples).all()
+    assert (samples[:, 2:] == 0).all()
+
+
+def test_rank_probabilities_sum_to_one():
+    scores, dimension_weights, metric_weights, metric_types = make_inputs()
+    result = run_sensitivity_analysis(scores, dimension_weights, metric_weights, metric_types,
+                                      n_samples=500, workers=1, seed=1)
+    np.testing.assert_allclose(result['rank_probabilities'].sum(axis=1), 1.0)
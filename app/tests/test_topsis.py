@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from incremental import IncrementalTopsis
+from topsis import _rank_array, _top_k_array, run_topsis_analysis
+
+
+def make_scores(n_metrics=6, n_platforms=50, seed=0):
+    rng = np.random.default_rng(seed)
+    metrics = [f"metric_{i}" for i in range(n_metrics)]
+    scores = pd.DataFrame(rng.integers(1, 6, size=(n_metrics, n_platforms)).astype(float),
+                          index=metrics, columns=[f"platform_{j}" for j in range(n_platforms)])
+    metric_types = {metric: 'cost' if i % 3 == 0 else 'benefit' for i, metric in enumerate(metrics)}
+    weights = {metric: 1 / n_metrics for metric in metrics}
+    return scores, weights, metric_types
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_top_k_rejects_k_below_one(k):
+    with pytest.raises(ValueError):
+        _top_k_array(np.array([0.3, 0.5, 0.1]), k)
+
+
+def test_top_k_larger_than_platform_count_ranks_all():
+    scores = np.array([0.3, 0.5, 0.1])
+    assert _top_k_array(scores, 10).tolist() == [1, 0, 2]
+
+
+@pytest.mark.parametrize('k', [1, 2, 3, 5, 7])
+def test_top_k_breaks_ties_like_full_ranking(k):
+    scores = np.array([0.5, 0.2, 0.5, 0.9, 0.2, 0.5, 0.2])
+    assert _top_k_array(scores, k).tolist() == _rank_array(scores)[0][:k].tolist()
+
+
+@pytest.mark.parametrize('k', [1, 2, 4, 6])
+def test_top_k_sorts_nan_last(k):
+    scores = np.array([np.nan, 0.4, np.nan, 0.7, 0.4, np.nan])
+    assert _top_k_array(scores, k).tolist() == _rank_array(scores)[0][:k].tolist()
+
+
+def test_top_k_with_all_nan_scores_keeps_k_platforms():
+    scores = np.full(5, np.nan)
+    assert _top_k_array(scores, 3).tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize('k', [1, 10, 50, 80])
+def test_top_k_analysis_matches_head_of_full_ranking(k):
+    scores, weights, metric_types = make_scores()
+    full = run_topsis_analysis(scores, weights, metric_types)
+    top = run_topsis_analysis(scores, weights, metric_types, top_k=k)
+    pd.testing.assert_series_equal(top['ranking'], full['ranking'].head(k))
+    assert (top['ranks'] > 0).sum() == min(k, scores.shape[1])
+
+
+def test_identical_platforms_are_all_ranked_with_top_k():
+    scores = pd.DataFrame(np.ones((4, 6)), index=[f"m{i}" for i in range(4)],
+                          columns=[f"p{j}" for j in range(6)])
+    weights = {metric: 0.25 for metric in scores.index}
+    metric_types = {metric: 'benefit' for metric in scores.index}
+    full = run_topsis_analysis(scores, weights, metric_types)
+    top = run_topsis_analysis(scores, weights, metric_types, top_k=3)
+    assert top['ranking'].index.tolist() == full['ranking'].index[:3].tolist() == ['p0', 'p1', 'p2']
+
+
+def test_analysis_rejects_zero_top_k():
+    scores, weights, metric_types = make_scores()
+    with pytest.raises(ValueError):
+        run_topsis_analysis(scores, weights, metric_types, top_k=0)
+
+
+def test_incremental_results_match_run_topsis_analysis_keys():
+    scores, weights, metric_types = make_scores(n_platforms=8)
+    expected = run_topsis_analysis(scores, weights, metric_types)
+    
+    results = IncrementalTopsis(scores, metric_types, weights).results()
+    
+    assert results.keys() == expected.keys()
+    assert results['ranks'].tolist() == expected['ranks'].tolist()
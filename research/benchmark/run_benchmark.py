@@ -0,0 +1,323 @@
+"""
+Local TPC-H benchmark harness.
+Generates TPC-H data at a given scale factor with DuckDB's tpch extension and
+runs every query file from queries/ against it. The Snowflake-flavoured SQL
+is translated to DuckDB's dialect by translate.py. Each query runs in a fresh
+worker process: the first execution is recorded as the cold run, the
+following executions as warm runs, and the worker's peak resident memory is
+read from the operating system when it exits.
+
+Usage:
+    python run_benchmark.py --scale-factor 1 --repeat 3 --platform duckdb-local
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+
+from translate import translate_file
+
+
+BENCHMARK_DIR = Path(__file__).parent
+QUERIES_DIR = BENCHMARK_DIR / "queries"
+DATA_DIR = BENCHMARK_DIR / "data"
+RESULTS_DIR = BENCHMARK_DIR / "results"
+
+
+def database_path(scale_factor: float) -> Path:
+    """Path of the DuckDB file holding TPC-H data for a scale factor."""
+    return DATA_DIR / f"tpch_sf{scale_factor:g}.duckdb"
+
+
+def generate_data(scale_factor: float, force: bool = False) -> Path:
+    """
+    Generate TPC-H tables at the given scale factor (skipped if the file exists).
+    
+    Args:
+        scale_factor: TPC-H scale factor (1 = ~1 GB of raw data)
+        force: Regenerate even if the database file exists
+    
+    Returns:
+        Path to the DuckDB database file
+    """
+    path = database_path(scale_factor)
+    if path.exists() and not force:
+        return path
+    
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.unlink(missing_ok=True)
+    
+    con = duckdb.connect(str(tmp_path))
+    try:
+        con.execute("INSTALL tpch")
+        con.execute("LOAD tpch")
+        con.execute(f"CALL dbgen(sf={scale_factor})")
+    finally:
+        con.close()
+    
+    os.replace(tmp_path, path)
+    return path
+
+
+def list_query_files(pattern: str = "query_*.sql") -> List[Path]:
+    """Query files matching the pattern, in name order."""
+    return sorted(QUERIES_DIR.glob(pattern))
+
+
+def connect_local(database: Path, threads: Optional[int] = None) -> duckdb.DuckDBPyConnection:
+    """
+    Open an in-memory session with the TPC-H database attached read-only.
+    
+    Tables created by the queries land in the in-memory catalog, so the
+    generated data is never modified by a benchmark run.
+    
+    Args:
+        database: DuckDB file with the TPC-H tables
+        threads: DuckDB worker threads (defaults to all cores)
+    """
+    con = duckdb.connect()
+    con.execute(f"ATTACH '{database.as_posix()}' AS tpch (READ_ONLY)")
+    con.execute("SET search_path = 'memory.main,tpch.main'")
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    return con
+
+
+def enable_scan_metrics(con: duckdb.DuckDBPyConnection) -> bool:
+    """
+    Make DuckDB's profiler record rows scanned and bytes read per statement.
+    
+    Returns:
+        False if the DuckDB version does not support these metrics
+    """
+    try:
+        con.execute("PRAGMA enable_profiling = 'no_output'")
+        con.execute("""SET custom_profiling_settings = '{"CUMULATIVE_ROWS_SCANNED": "true", "TOTAL_BYTES_READ": "true"}'""")
+        return True
+    except duckdb.Error:
+        return False
+
+
+def _add_scan_metrics(con: duckdb.DuckDBPyConnection, metrics: Dict) -> None:
+    """Add the profiled metrics of the last statement to the running totals."""
+    profile = json.loads(con.get_profiling_information(format='json'))
+    metrics['rows_scanned'] = metrics.get('rows_scanned', 0) + profile.get('cumulative_rows_scanned', 0)
+    metrics['bytes_read'] = metrics.get('bytes_read', 0) + profile.get('total_bytes_read', 0)
+
+
+def execute_query(con: duckdb.DuckDBPyConnection, statements: List[Dict], metrics: Optional[Dict] = None) -> int:
+    """
+    Execute a translated query file and return the number of rows it produced.
+    
+    If the last statement is a CREATE TABLE ... AS, the rows of the created table are counted.
+    
+    Args:
+        con: Connection from connect_local
+        statements: Translated statements (see translate.translate_file)
+        metrics: If given, receives rows_scanned and bytes_read (needs enable_scan_metrics)
+    """
+    result = None
+    for statement in statements:
+        result = con.execute(statement['sql'])
+        if metrics is not None:
+            _add_scan_metrics(con, metrics)
+    
+    if statements and statements[-1]['creates']:
+        table = statements[-1]['creates'].replace('"', '""')
+        return con.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+    return len(result.fetchall()) if result is not None else 0
+
+
+def collect_scan_metrics(database: Path, statements: List[Dict], threads: Optional[int] = None) -> Optional[Dict]:
+    """
+    Run a query file once in a separate profiled session and return its scan metrics.
+    
+    The session has its own empty buffer cache, so bytes read from storage are
+    counted as in a cold run.
+    
+    Returns:
+        Dictionary with rows_scanned and bytes_read, or None if the DuckDB
+        version does not support these metrics
+    """
+    con = connect_local(database, threads)
+    try:
+        if not enable_scan_metrics(con):
+            return None
+        metrics = {}
+        execute_query(con, statements, metrics)
+        return metrics
+    finally:
+        con.close()
+
+
+def run_worker(database: Path, query_file: Path, repeat: int, threads: Optional[int] = None) -> Dict:
+    """
+    Run one query file cold once and warm `repeat` times in this process.
+    
+    The timed runs use a session without profiling. Rows scanned and bytes
+    read come from an extra untimed run in a fresh session afterwards (see
+    collect_scan_metrics): warm runs are served from DuckDB's buffer cache and
+    read no bytes from storage.
+    """
+    statements = translate_file(query_file, dialect='duckdb')['statements']
+    con = connect_local(database, threads)
+    try:
+        start = time.perf_counter()
+        rows = execute_query(con, statements)
+        cold = time.perf_counter() - start
+        
+        warm = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            execute_query(con, statements)
+            warm.append(time.perf_counter() - start)
+    finally:
+        con.close()
+    
+    metrics = collect_scan_metrics(database, statements, threads) or {}
+    return {
+        'rows': rows,
+        'rows_scanned': metrics.get('rows_scanned'),
+        'bytes_read': metrics.get('bytes_read'),
+        'cold_s': cold,
+        'warm_s': warm
+    }
+
+
+def _peak_rss_mb(rusage) -> float:
+    """Convert ru_maxrss to megabytes (kilobytes on Linux, bytes on macOS)."""
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return rusage.ru_maxrss / divisor
+
+
+def measure_query(database: Path, query_file: Path, repeat: int, threads: Optional[int] = None) -> Dict:
+    """
+    Benchmark one query file in a fresh worker process.
+    
+    Returns:
+        Dictionary with query, status, cold/warm timings, rows, rows_scanned,
+        bytes_read and peak_rss_mb
+    """
+    command = [sys.executable, str(Path(__file__).resolve()), '--worker',
+               '--database', str(database), '--query', str(query_file), '--repeat', str(repeat)]
+    if threads:
+        command += ['--threads', str(threads)]
+    peak_rss_mb: Optional[float] = None
+    
+    # stderr goes to a file so the worker can never block on a full pipe
+    with tempfile.TemporaryFile(mode='w+') as stderr_file:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+        stdout = process.stdout.read()
+        process.stdout.close()
+        
+        if hasattr(os, 'wait4'):
+            # wait4 reports the resource usage of this worker only
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            peak_rss_mb = _peak_rss_mb(rusage)
+        else:
+            process.wait()
+        
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+    
+    record = {'query': query_file.stem, 'peak_rss_mb': peak_rss_mb}
+    if process.returncode != 0:
+        record.update(status='error', error=(stderr.strip().splitlines() or ['unknown error'])[-1])
+        return record
+    
+    measured = json.loads(stdout)
+    record.update(
+        status='ok',
+        rows=measured['rows'],
+        rows_scanned=measured['rows_scanned'],
+        bytes_read=measured['bytes_read'],
+        cold_s=measured['cold_s'],
+        warm_s=measured['warm_s'],
+        warm_median_s=statistics.median(measured['warm_s']) if measured['warm_s'] else None
+    )
+    return record
+
+
+def run_benchmark(scale_factor: float,
+                  repeat: int = 3,
+                  pattern: str = "query_*.sql",
+                  platform_name: str = "duckdb-local",
+                  threads: Optional[int] = None) -> Dict:
+    """
+    Generate data if needed and benchmark all matching query files.
+    
+    Returns:
+        Machine-readable result dictionary (see README.md for the schema)
+    """
+    database = generate_data(scale_factor)
+    queries = [measure_query(database, query_file, repeat, threads) for query_file in list_query_files(pattern)]
+    succeeded = [q for q in queries if q['status'] == 'ok']
+    
+    return {
+        'platform': platform_name,
+        'engine': f"duckdb {duckdb.__version__}",
+        'scale_factor': scale_factor,
+        'repeat': repeat,
+        'threads': threads,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': {
+            'system': platform.system(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version()
+        },
+        'queries': queries,
+        'total_cold_s': sum(q['cold_s'] for q in succeeded),
+        'total_warm_median_s': sum(q['warm_median_s'] or 0 for q in succeeded),
+        'failed': [q['query'] for q in queries if q['status'] != 'ok']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the TPC-H query files against local DuckDB")
+    parser.add_argument("--scale-factor", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3, help="Warm runs per query")
+    parser.add_argument("--queries", default="query_*.sql", help="Glob of query files in queries/")
+    parser.add_argument("--platform", default="duckdb-local", help="Platform label stored in the results")
+    parser.add_argument("--output", type=Path, default=None, help="Result JSON file")
+    parser.add_argument("--threads", type=int, default=None, help="DuckDB threads per query (default: all cores)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--database", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--query", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(run_worker(args.database, args.query, args.repeat, args.threads)))
+        return
+    
+    results = run_benchmark(args.scale_factor, args.repeat, args.queries, args.platform, args.threads)
+    
+    output = args.output or RESULTS_DIR / f"{args.platform}_sf{args.scale_factor:g}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    
+    for query in results['queries']:
+        if query['status'] == 'ok':
+            print(f"{query['query']:<14} cold {query['cold_s']:8.3f} s   warm {query['warm_median_s'] or 0:8.3f} s"
+                  f"   rows {query['rows']:>8}   peak {query['peak_rss_mb'] or 0:7.0f} MB")
+        else:
+            print(f"{query['query']:<14} FAILED: {query['error']}")
+    
+    print(f"\nTotal cold {results['total_cold_s']:.2f} s, warm {results['total_warm_median_s']:.2f} s -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Dependency-aware execution of original.sql.
+The script is split on its /* ===== BLOCK: ... ===== */ markers, the tables
+each block creates and reads are taken from the parsed SQL, and blocks whose
+inputs are ready run concurrently on a bounded pool of DuckDB cursors.
+
+The report compares the summed block time (serial schedule) with the wall
+time and the critical path through the dependency graph, i.e. the part of
+the runtime that no scheduler could remove.
+
+Usage:
+    python run_blocks.py --scale-factor 1 --workers 4
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+
+from run_benchmark import QUERIES_DIR, RESULTS_DIR, connect_local, generate_data
+from translate import CACHE_DIR, translate_text
+
+
+BLOCK_MARKER = re.compile(r'/\*\s*=+\s*BLOCK:\s*(.*?)\s*=+\s*\*/')
+CODE_MARKER = re.compile(r'/\*\s*=+\s*CODE:\s*(.*?)\s*=+\s*\*/')
+
+
+def parse_blocks(sql: str, dialect: str = "duckdb", cache_dir: Optional[Path] = CACHE_DIR) -> List[Dict]:
+    """
+    Split a script into its BLOCK sections and translate each of them.
+    
+    Block translations are cached by the hash of the block text (see
+    translate.translate_text), so only edited blocks are translated again.
+    
+    Args:
+        sql: Script with /* ===== BLOCK: name ===== */ markers
+        dialect: Target dialect of the translated statements
+        cache_dir: Directory of cached translations (None disables the disk cache)
+    
+    Returns:
+        List of dictionaries with block, code, statements, creates and reads
+    """
+    markers = list(BLOCK_MARKER.finditer(sql))
+    if not markers:
+        raise ValueError("No BLOCK markers found")
+    
+    blocks = []
+    for i, marker in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(sql)
+        body = sql[marker.end():end]
+        code = CODE_MARKER.search(body)
+        statements = translate_text(body, f"block_{marker.group(1)}", dialect, cache_dir)['statements']
+        
+        created = {s['creates'] for s in statements if s['creates']}
+        blocks.append({
+            'block': marker.group(1),
+            'code': code.group(1) if code else None,
+            'statements': statements,
+            'creates': sorted(created),
+            'reads': sorted({table for s in statements for table in s['reads']} - created)
+        })
+    return blocks
+
+
+def build_dependencies(blocks: List[Dict]) -> Dict[str, List[str]]:
+    """
+    Infer which blocks each block depends on from the tables they create and read.
+    
+    Identifiers are compared case-insensitively, as in Snowflake and DuckDB.
+    
+    Returns:
+        Dictionary mapping block names to the names of the blocks they read from
+    
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    producers = {}
+    for block in blocks:
+        for table in block['creates']:
+            producers[table.lower()] = block['block']
+    
+    dependencies = {
+        block['block']: sorted({producers[table.lower()] for table in block['reads']
+                                if table.lower() in producers} - {block['block']})
+        for block in blocks
+    }
+    
+    # Kahn's algorithm: every block must become ready at some point
+    remaining = {name: len(deps) for name, deps in dependencies.items()}
+    ready = [name for name, count in remaining.items() if count == 0]
+    visited = 0
+    while ready:
+        current = ready.pop()
+        visited += 1
+        for name, deps in dependencies.items():
+            if current in deps:
+                remaining[name] -= 1
+                if remaining[name] == 0:
+                    ready.append(name)
+    if visited != len(dependencies):
+        raise ValueError("Block dependencies contain a cycle")
+    
+    return dependencies
+
+
+def critical_path(dependencies: Dict[str, List[str]], durations: Dict[str, float]) -> List[str]:
+    """
+    Longest chain of dependent blocks by measured duration.
+    
+    Args:
+        dependencies: Block dependencies (see build_dependencies)
+        durations: Measured seconds per block
+    
+    Returns:
+        Block names along the critical path, in execution order
+    """
+    finish = {}
+    previous = {}
+    
+    def longest(name):
+        if name not in finish:
+            best = max(dependencies[name], key=longest, default=None)
+            previous[name] = best
+            finish[name] = durations[name] + (finish[best] if best else 0.0)
+        return finish[name]
+    
+    end = max(dependencies, key=longest)
+    path = []
+    while end is not None:
+        path.append(end)
+        end = previous[end]
+    return path[::-1]
+
+
+def execute_blocks(con: duckdb.DuckDBPyConnection,
+                   blocks: List[Dict],
+                   dependencies: Dict[str, List[str]],
+                   workers: int) -> Dict[str, Dict]:
+    """
+    Run blocks as soon as their dependencies have finished.
+    
+    Every worker thread uses its own cursor on the shared database, so tables
+    created by one block are visible to the blocks that depend on it.
+    
+    Returns:
+        Dictionary mapping block names to status, start_s, end_s, duration_s and error
+    """
+    by_name = {block['block']: block for block in blocks}
+    search_path = con.execute("SELECT current_setting('search_path')").fetchone()[0]
+    local = threading.local()
+    cursors = []
+    t0 = time.perf_counter()
+    
+    def run(name):
+        if not hasattr(local, 'cursor'):
+            local.cursor = con.cursor()
+            cursors.append(local.cursor)
+            local.cursor.execute(f"SET search_path = '{search_path}'")
+        start = time.perf_counter()
+        for statement in by_name[name]['statements']:
+            local.cursor.execute(statement['sql'])
+        return start - t0, time.perf_counter() - t0
+    
+    timings = {}
+    waiting = {name: set(deps) for name, deps in dependencies.items()}
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        
+        def submit_ready():
+            for name in [n for n, deps in waiting.items() if not deps]:
+                del waiting[name]
+                running[executor.submit(run, name)] = name
+        
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    start, end = future.result()
+                    timings[name] = {'status': 'ok', 'start_s': start, 'end_s': end, 'duration_s': end - start}
+                except Exception as exc:
+                    timings[name] = {'status': 'error', 'error': str(exc).splitlines()[0]}
+                    continue
+                for deps in waiting.values():
+                    deps.discard(name)
+            submit_ready()
+    
+    for cursor in cursors:
+        cursor.close()
+    
+    # Blocks downstream of a failure never become ready
+    for name in waiting:
+        timings[name] = {'status': 'skipped', 'error': 'dependency failed'}
+    return timings
+
+
+def run_blocks(scale_factor: float,
+               workers: Optional[int] = None,
+               script: Path = QUERIES_DIR / "original.sql",
+               platform_name: str = "duckdb-local") -> Dict:
+    """
+    Generate data if needed and execute the script's block DAG.
+    
+    Returns:
+        Result dictionary with per-block timings, serial_s, wall_s,
+        critical_path and critical_path_s
+    """
+    workers = workers or os.cpu_count()
+    blocks = parse_blocks(script.read_text(encoding='utf-8'))
+    dependencies = build_dependencies(blocks)
+    
+    con = connect_local(generate_data(scale_factor))
+    start = time.perf_counter()
+    timings = execute_blocks(con, blocks, dependencies, workers)
+    wall = time.perf_counter() - start
+    con.close()
+    
+    durations = {name: t.get('duration_s', 0.0) for name, t in timings.items()}
+    path = critical_path(dependencies, durations)
+    serial = sum(durations.values())
+    
+    return {
+        'platform': platform_name,
+        'engine': f"duckdb {duckdb.__version__}",
+        'script': script.name,
+        'scale_factor': scale_factor,
+        'workers': workers,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'blocks': [
+            {'block': block['block'], 'code': block['code'], 'creates': block['creates'],
+             'depends_on': dependencies[block['block']], **timings[block['block']]}
+            for block in blocks
+        ],
+        'serial_s': serial,
+        'wall_s': wall,
+        'speedup': serial / wall if wall > 0 else 0.0,
+        'critical_path': path,
+        'critical_path_s': sum(durations[name] for name in path),
+        'failed': [name for name, t in timings.items() if t['status'] != 'ok']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run original.sql as a dependency graph of blocks")
+    parser.add_argument("--scale-factor", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent blocks (default: all cores)")
+    parser.add_argument("--script", type=Path, default=QUERIES_DIR / "original.sql")
+    parser.add_argument("--platform", default="duckdb-local", help="Platform label stored in the results")
+    parser.add_argument("--output", type=Path, default=None, help="Result JSON file")
+    args = parser.parse_args()
+    
+    results = run_blocks(args.scale_factor, args.workers, args.script, args.platform)
+    
+    output = args.output or RESULTS_DIR / f"{args.platform}_blocks_sf{args.scale_factor:g}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    
+    for block in results['blocks']:
+        if block['status'] == 'ok':
+            depends = ', '.join(block['depends_on']) or '-'
+            print(f"{block['block']:<10} {block['code'] or '':<36} {block['start_s']:7.3f} -> {block['end_s']:7.3f} s"
+                  f"   {block['duration_s']:7.3f} s   after {depends}")
+        else:
+            print(f"{block['block']:<10} {block['code'] or '':<36} {block['status'].upper()}: {block['error']}")
+    
+    print(f"\nSerial {results['serial_s']:.2f} s, wall {results['wall_s']:.2f} s with {results['workers']} workers "
+          f"(speedup {results['speedup']:.2f}x)")
+    print(f"Critical path {results['critical_path_s']:.2f} s: {' -> '.join(results['critical_path'])}")
+    print(f"-> {output}")
+
+
+if __name__ == "__main__":
+    main()
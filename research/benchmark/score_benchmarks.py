@@ -0,0 +1,291 @@
+"""
+Benchmark-to-score pipeline.
+Converts benchmark result files (see README.md) into the Pipeline_Speed,
+Scalability and Stability scores of platform_scores.csv, writes them as a new versioned
+scores file and prints the resulting TOPSIS ranking.
+
+Scoring rules (thresholds are inclusive upper bounds):
+
+- Pipeline_Speed: for every query and scale factor the runtime is divided by
+  the fastest platform's runtime; the geometric mean of these ratios maps to
+  <= 1.1 -> 5, <= 1.5 -> 4, <= 2 -> 3, <= 3 -> 2, otherwise 1.
+- Scalability: runtime = a * SF^b is fitted per query in log-log space; the
+  median exponent b maps to <= 0.9 -> 5, <= 1.1 -> 4, <= 1.3 -> 3,
+  <= 1.6 -> 2, otherwise 1. It needs results for at least two scale factors.
+- Stability: latency spread (p95 / p50 of latencies under concurrent load,
+  normalized by isolated latency) from throughput.py maps to <= 1.25 -> 5,
+  <= 1.5 -> 4, <= 2 -> 3, <= 3 -> 2, otherwise 1. Queries failing under load
+  cap the score at 2.
+
+Platforms are matched to score columns by the "platform" label of the result
+files; platforms without results keep their current scores. No file is
+written when no score changes, e.g. when no result platform has a score
+column. Pipeline_Speed is relative to the fastest platform, so it needs
+results of at least two platforms to say anything (a single platform always
+scores 5).
+
+Usage:
+    python score_benchmarks.py results/*.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+BENCHMARK_DIR = Path(__file__).parent
+APP_DIR = BENCHMARK_DIR.parent.parent / "app"
+SCORES_DIR = APP_DIR / "data"
+
+# (inclusive upper bound, score), checked in order
+SPEED_THRESHOLDS: List[Tuple[float, int]] = [(1.1, 5), (1.5, 4), (2.0, 3), (3.0, 2)]
+SCALING_THRESHOLDS: List[Tuple[float, int]] = [(0.9, 5), (1.1, 4), (1.3, 3), (1.6, 2)]
+STABILITY_THRESHOLDS: List[Tuple[float, int]] = [(1.25, 5), (1.5, 4), (2.0, 3), (3.0, 2)]
+STABILITY_FAILURE_CAP = 2
+
+VERSIONED_FILE = re.compile(r'platform_scores_v(\d+)\.csv$')
+
+
+def load_results(paths: Sequence[Path]) -> pd.DataFrame:
+    """
+    Collect successful query runtimes from benchmark result files.
+    
+    The warm median is used where available, the cold run otherwise. Repeated
+    measurements of the same platform, query and scale factor are reduced to
+    their median.
+    
+    Args:
+        paths: Result JSON files written by run_benchmark.py
+    
+    Returns:
+        DataFrame with platform, query, scale_factor and runtime_s columns
+    """
+    records = []
+    for path in paths:
+        result = json.loads(Path(path).read_text(encoding='utf-8'))
+        if result.get('test') == 'throughput':
+            continue
+        for query in result['queries']:
+            if query['status'] != 'ok':
+                continue
+            runtime = query.get('warm_median_s') or query.get('cold_s')
+            if runtime and runtime > 0:
+                records.append((result['platform'], query['query'], float(result['scale_factor']), runtime))
+    
+    df = pd.DataFrame(records, columns=['platform', 'query', 'scale_factor', 'runtime_s'])
+    return df.groupby(['platform', 'query', 'scale_factor'], as_index=False)['runtime_s'].median()
+
+
+def load_throughput(paths: Sequence[Path]) -> Dict[str, Dict[str, float]]:
+    """
+    Collect latency spread and failure rate from throughput test result files.
+    
+    Several runs of one platform are combined into the median spread and the
+    highest failure rate.
+    
+    Args:
+        paths: Result JSON files (files not written by throughput.py are skipped)
+    
+    Returns:
+        Dictionary platform -> {'latency_spread', 'failure_rate'}
+    """
+    runs = {}
+    for path in paths:
+        result = json.loads(Path(path).read_text(encoding='utf-8'))
+        if result.get('test') == 'throughput' and result.get('latency_spread') is not None:
+            runs.setdefault(result['platform'], []).append(result)
+    
+    return {
+        platform: {
+            'latency_spread': float(np.median([r['latency_spread'] for r in results])),
+            'failure_rate': max(r['failure_rate'] for r in results)
+        }
+        for platform, results in runs.items()
+    }
+
+
+def threshold_score(value: float, thresholds: List[Tuple[float, int]]) -> int:
+    """Map a value to a 1-5 score using (upper bound, score) thresholds."""
+    for upper, score in thresholds:
+        if value <= upper:
+            return score
+    return 1
+
+
+def speed_ratios(runtimes: pd.DataFrame) -> pd.Series:
+    """
+    Geometric mean runtime ratio of each platform to the fastest platform.
+    
+    Only query/scale factor combinations measured on every platform are compared.
+    
+    Returns:
+        Series indexed by platform
+    """
+    wide = runtimes.pivot_table(index=['query', 'scale_factor'], columns='platform', values='runtime_s').dropna()
+    if wide.empty:
+        return pd.Series(dtype=float)
+    ratios = wide.div(wide.min(axis=1), axis=0)
+    return np.exp(np.log(ratios).mean())
+
+
+def scaling_exponents(runtimes: pd.DataFrame) -> pd.Series:
+    """
+    Median log-log scaling exponent of runtime versus scale factor per platform.
+    
+    Returns:
+        Series indexed by platform (platforms with a single scale factor are omitted)
+    """
+    exponents = {}
+    for platform, group in runtimes.groupby('platform'):
+        slopes = []
+        for _, query in group.groupby('query'):
+            if query['scale_factor'].nunique() < 2:
+                continue
+            slope, _ = np.polyfit(np.log(query['scale_factor']), np.log(query['runtime_s']), 1)
+            slopes.append(slope)
+        if slopes:
+            exponents[platform] = float(np.median(slopes))
+    return pd.Series(exponents, dtype=float)
+
+
+def compute_benchmark_scores(runtimes: pd.DataFrame,
+                             throughput: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Dict]:
+    """
+    Derive Pipeline_Speed, Scalability and Stability scores from measurements.
+    
+    Args:
+        runtimes: DataFrame from load_results
+        throughput: Throughput metrics from load_throughput
+    
+    Returns:
+        Dictionary metric -> platform -> {'value': measured value, 'score': 1-5}
+    """
+    scores = {'Pipeline_Speed': {}, 'Scalability': {}, 'Stability': {}}
+    for platform, ratio in speed_ratios(runtimes).items():
+        scores['Pipeline_Speed'][platform] = {'value': float(ratio), 'score': threshold_score(ratio, SPEED_THRESHOLDS)}
+    for platform, exponent in scaling_exponents(runtimes).items():
+        scores['Scalability'][platform] = {'value': exponent, 'score': threshold_score(exponent, SCALING_THRESHOLDS)}
+    for platform, metrics in (throughput or {}).items():
+        score = threshold_score(metrics['latency_spread'], STABILITY_THRESHOLDS)
+        if metrics['failure_rate'] > 0:
+            score = min(score, STABILITY_FAILURE_CAP)
+        scores['Stability'][platform] = {'value': metrics['latency_spread'], 'score': score}
+    return scores
+
+
+def apply_scores(scores_df: pd.DataFrame, benchmark_scores: Dict[str, Dict]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Replace benchmark-derived metrics in a copy of the scores table.
+    
+    Returns:
+        Tuple of (updated DataFrame, platforms without a matching score column)
+    """
+    updated = scores_df.copy()
+    ignored = set()
+    for metric, platforms in benchmark_scores.items():
+        rows = updated['Metric'] == metric
+        for platform, result in platforms.items():
+            if platform not in updated.columns:
+                ignored.add(platform)
+                continue
+            updated.loc[rows, platform] = result['score']
+    return updated, sorted(ignored)
+
+
+def next_version_path(scores_dir: Path = SCORES_DIR) -> Path:
+    """Path of the next platform_scores_v<N>.csv in the data folder."""
+    matches = (VERSIONED_FILE.search(path.name) for path in scores_dir.glob('platform_scores_v*.csv'))
+    versions = [int(match.group(1)) for match in matches if match]
+    return scores_dir / f"platform_scores_v{max(versions, default=0) + 1}.csv"
+
+
+def write_scores(updated: pd.DataFrame,
+                 benchmark_scores: Dict[str, Dict],
+                 base_file: str,
+                 result_files: Sequence[Path],
+                 output: Optional[Path] = None) -> Path:
+    """
+    Write the versioned scores file and a JSON sidecar recording how it was derived.
+    
+    Returns:
+        Path of the written scores file
+    """
+    output = output or next_version_path()
+    updated.to_csv(output, index=False)
+    
+    provenance = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'base_file': base_file,
+        'result_files': [str(path) for path in result_files],
+        'thresholds': {
+            'Pipeline_Speed': SPEED_THRESHOLDS,
+            'Scalability': SCALING_THRESHOLDS,
+            'Stability': STABILITY_THRESHOLDS
+        },
+        'metrics': benchmark_scores
+    }
+    output.with_suffix('.json').write_text(json.dumps(provenance, indent=2), encoding='utf-8')
+    return output
+
+
+def rank_platforms(scores_file: str) -> pd.Series:
+    """TOPSIS scores of a scores file with the default (thesis) weights, best first."""
+    sys.path.insert(0, str(APP_DIR / 'src'))
+    from data_loader import load_platform_scores, load_default_weights, prepare_topsis_input
+    from topsis import run_topsis_analysis
+    
+    scores_df, metric_types = load_platform_scores(scores_file)
+    _, _, hierarchical_weights = load_default_weights()
+    return run_topsis_analysis(prepare_topsis_input(scores_df), hierarchical_weights, metric_types)['ranking']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turn benchmark results into Pipeline_Speed, Scalability and Stability scores")
+    parser.add_argument("results", type=Path, nargs='+', help="Result JSON files from run_benchmark.py and throughput.py")
+    parser.add_argument("--base", default="platform_scores.csv", help="Scores file in app/data to start from")
+    parser.add_argument("--output", type=Path, default=None, help="Output file (default: next platform_scores_v<N>.csv)")
+    args = parser.parse_args()
+    
+    runtimes = load_results(args.results)
+    throughput = load_throughput(args.results)
+    if runtimes.empty and not throughput:
+        sys.exit("No successful query runs in the result files")
+    
+    benchmark_scores = compute_benchmark_scores(runtimes, throughput)
+    base_df = pd.read_csv(SCORES_DIR / args.base)
+    updated, ignored = apply_scores(base_df, benchmark_scores)
+    
+    for metric, platforms in benchmark_scores.items():
+        for platform, result in sorted(platforms.items()):
+            print(f"{metric:<15} {platform:<20} value {result['value']:6.2f}   score {result['score']}")
+    if not benchmark_scores['Scalability']:
+        print("Scalability not updated: results for at least two scale factors are needed")
+    if not benchmark_scores['Stability']:
+        print("Stability not updated: no throughput.py results")
+    if ignored:
+        print(f"Ignored platforms without a score column: {', '.join(ignored)}")
+    
+    measured = sorted({platform for platforms in benchmark_scores.values() for platform in platforms})
+    if len(measured) < 2:
+        print(f"Warning: results of fewer than two platforms ({', '.join(measured)}); Pipeline_Speed is "
+              f"relative to the fastest platform, so a single platform always scores 5")
+    
+    if updated.equals(base_df):
+        sys.exit(f"No scores changed; {args.base} is kept and no new version is written")
+    
+    output = write_scores(updated, benchmark_scores, args.base, args.results, args.output)
+    print(f"\nScores written to {output}\n")
+    print("Ranking (default weights):")
+    for rank, (platform, score) in enumerate(rank_platforms(str(output.resolve())).items(), 1):
+        print(f"  {rank}. {platform:<20} {score:.4f}")
+
+
+if __name__ == "__main__":
+    main()
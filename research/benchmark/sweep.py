@@ -0,0 +1,265 @@
+"""
+Scale-factor sweep for the TPC-H harness.
+Runs the query files at several scale factors, DuckDB thread counts and
+concurrency levels, reports throughput (rows scanned/sec, bytes read/sec,
+queries/hour) and how runtime grows relative to data volume, and appends the
+results to a Parquet results store.
+
+Concurrency 1 measures every query alone in a fresh worker process
+(run_benchmark.measure_query). Higher concurrency runs that many query
+streams at once (throughput.run_streams) and reports the median loaded
+latency of each query across the streams and its slowdown against the
+isolated run.
+
+A scaling ratio (runtime growth / data growth, relative to the smallest
+scale factor of the sweep) above 1 means the query scales super-linearly.
+
+Usage:
+    python sweep.py --scale-factors 0.1 1 3 10 --threads 1 4 --concurrency 1 4
+"""
+
+import argparse
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from run_benchmark import RESULTS_DIR, generate_data, list_query_files, measure_query
+from throughput import run_streams
+from translate import translate_file
+
+
+STORE_DIR = RESULTS_DIR / "sweep"
+
+DEFAULT_SCALE_FACTORS = [0.1, 1.0, 3.0, 10.0]
+DEFAULT_THREADS = [1, 4]
+DEFAULT_CONCURRENCY = [1, 4]
+
+# Scaling ratio above which a query is reported as super-linear
+SUPERLINEAR_RATIO = 1.1
+
+# Columns that identify one scaling series across the scale factors
+SCALING_KEYS = ['query', 'threads', 'concurrency']
+
+
+def loaded_records(isolated: List[Dict], stream_results: List[Dict]) -> List[Dict]:
+    """
+    Per-query records of a concurrent run.
+    
+    Args:
+        isolated: measure_query records of the same queries run alone
+        stream_results: Results of throughput.run_streams
+    
+    Returns:
+        One record per query with the median loaded latency as warm_median_s,
+        its slowdown against the isolated warm median and the scan volume of
+        the isolated run (the plan reads the same data under load)
+    """
+    elapsed = max(r['end'] for r in stream_results) - min(r['start'] for r in stream_results)
+    completed = sum(len(r['latencies']) for r in stream_results)
+    queries_per_hour = completed * 3600 / elapsed if elapsed > 0 else float('nan')
+    
+    records = []
+    for base in isolated:
+        name = base['query']
+        loaded = [r['latencies'][name] for r in stream_results if name in r['latencies']]
+        errors = [r['errors'][name] for r in stream_results if name in r['errors']]
+        record = {'query': name, 'peak_rss_mb': None, 'queries_per_hour': queries_per_hour}
+        if errors or not loaded:
+            record.update(status='error', error=errors[0] if errors else base.get('error', 'not run'))
+        else:
+            median = float(np.median(loaded))
+            record.update(
+                status='ok',
+                rows=base.get('rows'),
+                rows_scanned=base.get('rows_scanned'),
+                bytes_read=base.get('bytes_read'),
+                warm_median_s=median,
+                slowdown=median / base['warm_median_s'] if base.get('warm_median_s') else None
+            )
+        records.append(record)
+    return records
+
+
+def run_sweep(scale_factors: Sequence[float],
+              threads: Sequence[int],
+              concurrency: Sequence[int] = (1,),
+              repeat: int = 3,
+              pattern: str = "query_*.sql",
+              platform_name: str = "duckdb-local") -> pd.DataFrame:
+    """
+    Benchmark every query file for each scale factor, thread count and concurrency.
+    
+    Args:
+        scale_factors: TPC-H scale factors (data is generated when missing)
+        threads: DuckDB worker threads per connection
+        concurrency: Numbers of concurrent query streams (1 = each query alone)
+        repeat: Warm runs per query (isolated runs only)
+        pattern: Glob of query files in queries/
+        platform_name: Platform label stored in the results
+    
+    Returns:
+        DataFrame with one row per scale factor, thread count, concurrency and query
+    """
+    sweep_id = uuid.uuid4().hex[:12]
+    generated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    query_files = list_query_files(pattern)
+    translations = {path.stem: translate_file(path, dialect='duckdb')['statements'] for path in query_files}
+    records = []
+    
+    for scale_factor in sorted(scale_factors):
+        database = generate_data(scale_factor)
+        for thread_count in threads:
+            # The isolated run is also the baseline of the concurrent runs
+            isolated = []
+            for query_file in query_files:
+                record = measure_query(database, query_file, repeat, thread_count)
+                record.pop('warm_s', None)
+                isolated.append(record)
+            
+            runtime = sum(r['warm_median_s'] or r['cold_s'] for r in isolated if r['status'] == 'ok')
+            completed = sum(r['status'] == 'ok' for r in isolated)
+            for record in isolated:
+                record.update(queries_per_hour=completed * 3600 / runtime if runtime else float('nan'),
+                              slowdown=1.0 if record['status'] == 'ok' else None)
+            
+            for streams in concurrency:
+                if streams == 1:
+                    measured = isolated
+                else:
+                    measured = loaded_records(isolated, run_streams(database, translations, streams,
+                                                                    threads=thread_count))
+                records.extend({
+                    'sweep_id': sweep_id,
+                    'generated_at': generated_at,
+                    'platform': platform_name,
+                    'engine': f"duckdb {duckdb.__version__}",
+                    'scale_factor': scale_factor,
+                    'threads': thread_count,
+                    'concurrency': streams,
+                    **record
+                } for record in measured)
+    
+    return add_scaling_metrics(pd.DataFrame(records))
+
+
+def add_scaling_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add throughput and scaling columns to sweep results.
+    
+    - runtime_s: warm median runtime (cold runtime without warm runs)
+    - rows_per_sec: rows scanned / runtime_s
+    - bytes_per_sec: bytes read from storage / cold runtime (isolated runs only)
+    - runtime_growth, data_growth: relative to the smallest scale factor of
+      the same query, thread count and concurrency
+    - scaling_ratio: runtime_growth / data_growth
+    
+    Returns:
+        Copy of the DataFrame with the added columns
+    """
+    df = df.copy()
+    for column in ['rows_scanned', 'bytes_read', 'cold_s', 'warm_median_s']:
+        if column not in df:
+            df[column] = float('nan')
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+    
+    df['runtime_s'] = df['warm_median_s'].fillna(df['cold_s'])
+    df['rows_per_sec'] = df['rows_scanned'] / df['runtime_s']
+    df['bytes_per_sec'] = df['bytes_read'] / df['cold_s']
+    
+    ok = df['status'] == 'ok'
+    base = df[ok].sort_values('scale_factor').groupby(SCALING_KEYS).first()
+    keys = pd.MultiIndex.from_frame(df[SCALING_KEYS])
+    base_sf = base['scale_factor'].reindex(keys).to_numpy()
+    base_runtime = base['runtime_s'].reindex(keys).to_numpy()
+    
+    df['data_growth'] = df['scale_factor'] / base_sf
+    df['runtime_growth'] = df['runtime_s'] / base_runtime
+    df['scaling_ratio'] = df['runtime_growth'] / df['data_growth']
+    df.loc[~ok, ['data_growth', 'runtime_growth', 'scaling_ratio']] = float('nan')
+    return df
+
+
+def write_store(df: pd.DataFrame, store_dir: Path = STORE_DIR) -> Path:
+    """
+    Append sweep results to the Parquet results store.
+    
+    Every sweep is written as its own file; read the whole store with
+    SELECT * FROM read_parquet('results/sweep/*.parquet', union_by_name = true).
+    
+    Returns:
+        Path of the written Parquet file
+    """
+    store_dir.mkdir(parents=True, exist_ok=True)
+    path = store_dir / f"sweep_{df['sweep_id'].iloc[0]}.parquet"
+    con = duckdb.connect()
+    try:
+        con.register('sweep_results', df)
+        con.execute(f"COPY sweep_results TO '{path.as_posix()}' (FORMAT PARQUET)")
+    finally:
+        con.close()
+    return path
+
+
+def superlinear_queries(df: pd.DataFrame, threshold: float = SUPERLINEAR_RATIO) -> pd.DataFrame:
+    """Queries whose scaling ratio at the largest scale factor exceeds the threshold."""
+    largest = df[(df['status'] == 'ok') & (df['scale_factor'] == df['scale_factor'].max())]
+    return largest[largest['scaling_ratio'] > threshold].sort_values('scaling_ratio', ascending=False)
+
+
+def format_report(df: pd.DataFrame) -> List[str]:
+    """Console report of a sweep."""
+    lines = [f"{'query':<12} {'SF':>6} {'threads':>7} {'streams':>7} {'runtime s':>9} {'Mrows/s':>9} "
+             f"{'MB/s':>9} {'slowdown':>8} {'ratio':>7}"]
+    for _, row in df.sort_values(SCALING_KEYS + ['scale_factor']).iterrows():
+        prefix = f"{row['query']:<12} {row['scale_factor']:>6g} {row['threads']:>7} {row['concurrency']:>7}"
+        if row['status'] != 'ok':
+            lines.append(f"{prefix} FAILED: {row['error']}")
+            continue
+        lines.append(
+            f"{prefix} {row['runtime_s']:>9.3f} {row['rows_per_sec'] / 1e6:>9.1f} "
+            f"{row['bytes_per_sec'] / 1e6:>9.1f} {row['slowdown']:>8.2f} {row['scaling_ratio']:>7.2f}"
+        )
+    
+    throughput = (df.groupby(['scale_factor', 'threads', 'concurrency'])['queries_per_hour'].first()
+                  .reset_index())
+    lines.append("")
+    lines.append(f"{'SF':>6} {'threads':>7} {'streams':>7} {'queries/hour':>13}")
+    for _, row in throughput.iterrows():
+        lines.append(f"{row['scale_factor']:>6g} {int(row['threads']):>7} {int(row['concurrency']):>7} "
+                     f"{row['queries_per_hour']:>13,.0f}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep TPC-H scale factors, thread counts and concurrency")
+    parser.add_argument("--scale-factors", type=float, nargs='+', default=DEFAULT_SCALE_FACTORS)
+    parser.add_argument("--threads", type=int, nargs='+', default=DEFAULT_THREADS,
+                        help="DuckDB threads per connection")
+    parser.add_argument("--concurrency", type=int, nargs='+', default=DEFAULT_CONCURRENCY,
+                        help="Concurrent query streams (1 = each query alone)")
+    parser.add_argument("--repeat", type=int, default=3, help="Warm runs per query")
+    parser.add_argument("--queries", default="query_*.sql", help="Glob of query files in queries/")
+    parser.add_argument("--platform", default="duckdb-local", help="Platform label stored in the results")
+    args = parser.parse_args()
+    
+    df = run_sweep(args.scale_factors, args.threads, args.concurrency, args.repeat, args.queries, args.platform)
+    path = write_store(df)
+    
+    print('\n'.join(format_report(df)))
+    
+    superlinear = superlinear_queries(df)
+    if not superlinear.empty:
+        print(f"\nSuper-linear at SF{df['scale_factor'].max():g} (ratio > {SUPERLINEAR_RATIO}):")
+        for _, row in superlinear.iterrows():
+            print(f"  {row['query']:<12} threads {row['threads']:<3} streams {row['concurrency']:<3} ratio {row['scaling_ratio']:.2f}")
+    
+    print(f"\n-> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+TPC-H style throughput test.
+Runs N concurrent query streams, each executing all query files in its own
+permuted order, against the local DuckDB database. Streams are thread
+workers sharing one database instance (cursors, shared buffer cache) or
+separate worker processes with their own connections.
+
+Every stream runs its queries once as a warm-up, waits for the other
+streams and then runs the measured pass. A single stream run the same way
+provides the isolated latencies that the contention slowdown is relative to.
+
+Reported metrics:
+
+- queries_per_hour: S * Q * 3600 / Ts (Ts = first stream start to last stream end)
+- qphh: queries_per_hour * SF, the TPC-H throughput metric
+- per-stream latency distribution (p50, p95, max) and elapsed time
+- contention_slowdown: geometric mean of loaded / isolated latency per query
+- latency_spread: p95 / p50 of loaded latencies normalized by isolated
+  latency, the input of the Stability score in score_benchmarks.py
+
+Usage:
+    python throughput.py --scale-factor 1 --streams 4 --mode thread
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+import numpy as np
+
+from run_benchmark import RESULTS_DIR, connect_local, execute_query, generate_data, list_query_files
+from translate import translate_file
+
+
+def stream_order(queries: List[str], stream: int, seed: int) -> List[str]:
+    """Permuted query order of one stream (reproducible for a given seed)."""
+    order = list(queries)
+    random.Random(seed * 1000 + stream).shuffle(order)
+    return order
+
+
+def run_stream(stream: int,
+               database: Path,
+               translations: Dict[str, List[Dict]],
+               order: List[str],
+               threads: Optional[int],
+               barrier,
+               con: Optional[duckdb.DuckDBPyConnection] = None) -> Dict:
+    """
+    Execute one query stream: a warm-up pass, then the measured pass.
+    
+    Args:
+        stream: Stream number (also names the schema for the stream's tables)
+        database: TPC-H database file
+        translations: Translated statements per query name
+        order: Query names in execution order
+        threads: DuckDB threads (only used when the stream opens its own connection)
+        barrier: Barrier shared by all streams, passed before the measured pass
+        con: Shared connection to take a cursor from (thread mode); None opens a new one
+    
+    Returns:
+        Dictionary with stream, start, end (epoch seconds), latencies and errors
+    """
+    try:
+        cursor = con.cursor() if con is not None else connect_local(database, threads)
+        schema = f"stream_{stream}"
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS memory.{schema}")
+        cursor.execute(f"SET search_path = 'memory.{schema},tpch.main'")
+        
+        errors = {}
+        for name in order:
+            try:
+                execute_query(cursor, translations[name])
+            except duckdb.Error as exc:
+                errors[name] = str(exc).splitlines()[0]
+    except BaseException:
+        # Release the other streams waiting at the barrier (they raise BrokenBarrierError)
+        barrier.abort()
+        raise
+    
+    barrier.wait()
+    
+    latencies = {}
+    start = time.time()
+    for name in order:
+        if name in errors:
+            continue
+        query_start = time.perf_counter()
+        try:
+            execute_query(cursor, translations[name])
+            latencies[name] = time.perf_counter() - query_start
+        except duckdb.Error as exc:
+            errors[name] = str(exc).splitlines()[0]
+    end = time.time()
+    
+    cursor.close()
+    return {'stream': stream, 'order': order, 'start': start, 'end': end, 'latencies': latencies, 'errors': errors}
+
+
+def _stream_results(futures) -> List[Dict]:
+    """
+    Results of all stream futures.
+    
+    Raises:
+        The exception of the stream that failed first, rather than the
+        BrokenBarrierError of the streams it released
+    """
+    wait(futures)
+    failures = [future.exception() for future in futures if future.exception() is not None]
+    causes = [exc for exc in failures if not isinstance(exc, threading.BrokenBarrierError)]
+    if failures:
+        raise (causes or failures)[0]
+    return [future.result() for future in futures]
+
+
+def run_streams(database: Path,
+                translations: Dict[str, List[Dict]],
+                streams: int,
+                mode: str = "thread",
+                threads: Optional[int] = None,
+                seed: int = 0) -> List[Dict]:
+    """
+    Run concurrent streams with permuted query orders.
+    
+    Args:
+        database: TPC-H database file
+        translations: Translated statements per query name
+        streams: Number of concurrent streams
+        mode: 'thread' (cursors on one database instance) or 'process'
+        threads: DuckDB threads per connection
+        seed: Seed of the query order permutations
+    
+    Returns:
+        List of stream results (see run_stream)
+    """
+    orders = [stream_order(sorted(translations), stream, seed) for stream in range(streams)]
+    
+    if mode == "thread":
+        con = connect_local(database, threads)
+        barrier = threading.Barrier(streams)
+        try:
+            with ThreadPoolExecutor(max_workers=streams) as executor:
+                futures = [executor.submit(run_stream, stream, database, translations, orders[stream],
+                                           threads, barrier, con)
+                           for stream in range(streams)]
+                return _stream_results(futures)
+        finally:
+            con.close()
+    
+    if mode == "process":
+        with multiprocessing.Manager() as manager:
+            barrier = manager.Barrier(streams)
+            with ProcessPoolExecutor(max_workers=streams) as executor:
+                futures = [executor.submit(run_stream, stream, database, translations, orders[stream],
+                                           threads, barrier)
+                           for stream in range(streams)]
+                return _stream_results(futures)
+    
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+def summarize(stream_results: List[Dict], isolated: Dict[str, float], scale_factor: float) -> Dict:
+    """
+    Throughput, latency and contention metrics of a set of streams.
+    
+    Args:
+        stream_results: Results of run_streams
+        isolated: Latency per query of a single stream run alone
+        scale_factor: TPC-H scale factor of the data
+    
+    Returns:
+        Dictionary with the metrics listed in the module docstring
+    """
+    elapsed = max(r['end'] for r in stream_results) - min(r['start'] for r in stream_results)
+    completed = sum(len(r['latencies']) for r in stream_results)
+    failed = sum(len(r['errors']) for r in stream_results)
+    queries_per_hour = completed * 3600 / elapsed if elapsed > 0 else 0.0
+    
+    per_stream = []
+    for r in stream_results:
+        latencies = np.array(list(r['latencies'].values()))
+        per_stream.append({
+            'stream': r['stream'],
+            'order': r['order'],
+            'elapsed_s': r['end'] - r['start'],
+            'p50_s': float(np.percentile(latencies, 50)) if latencies.size else None,
+            'p95_s': float(np.percentile(latencies, 95)) if latencies.size else None,
+            'max_s': float(latencies.max()) if latencies.size else None,
+            'errors': r['errors']
+        })
+    
+    normalized = np.array([latency / isolated[name]
+                           for r in stream_results for name, latency in r['latencies'].items()
+                           if isolated.get(name)])
+    per_query = {}
+    for name in sorted(isolated):
+        loaded = [r['latencies'][name] for r in stream_results if name in r['latencies']]
+        if loaded and isolated[name]:
+            per_query[name] = {'isolated_s': isolated[name], 'loaded_median_s': float(np.median(loaded)),
+                               'slowdown': float(np.median(loaded)) / isolated[name]}
+    
+    slowdowns = np.array([q['slowdown'] for q in per_query.values()])
+    return {
+        'elapsed_s': elapsed,
+        'queries_completed': completed,
+        'queries_failed': failed,
+        'failure_rate': failed / (completed + failed) if completed + failed else 0.0,
+        'queries_per_hour': queries_per_hour,
+        'qphh': queries_per_hour * scale_factor,
+        'contention_slowdown': float(np.exp(np.log(slowdowns).mean())) if slowdowns.size else None,
+        'latency_spread': (float(np.percentile(normalized, 95) / np.percentile(normalized, 50))
+                           if normalized.size else None),
+        'streams': per_stream,
+        'queries': per_query
+    }
+
+
+def run_throughput(scale_factor: float,
+                   streams: int = 4,
+                   mode: str = "thread",
+                   threads: Optional[int] = None,
+                   pattern: str = "query_*.sql",
+                   seed: int = 0,
+                   platform_name: str = "duckdb-local") -> Dict:
+    """
+    Generate data if needed, measure isolated latencies and run the throughput test.
+    
+    Returns:
+        Machine-readable result dictionary with "test": "throughput"
+    """
+    database = generate_data(scale_factor)
+    translations = {path.stem: translate_file(path, dialect='duckdb')['statements']
+                    for path in list_query_files(pattern)}
+    
+    baseline = run_streams(database, translations, 1, mode, threads, seed)[0]
+    summary = summarize(run_streams(database, translations, streams, mode, threads, seed),
+                        baseline['latencies'], scale_factor)
+    
+    return {
+        'test': 'throughput',
+        'platform': platform_name,
+        'engine': f"duckdb {duckdb.__version__}",
+        'scale_factor': scale_factor,
+        'stream_count': streams,
+        'mode': mode,
+        'threads': threads,
+        'seed': seed,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': {
+            'system': platform.system(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version()
+        },
+        **summary
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run concurrent TPC-H query streams against local DuckDB")
+    parser.add_argument("--scale-factor", type=float, default=1.0)
+    parser.add_argument("--streams", type=int, default=4, help="Concurrent query streams")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--threads", type=int, default=None, help="DuckDB threads per connection")
+    parser.add_argument("--queries", default="query_*.sql", help="Glob of query files in queries/")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the stream permutations")
+    parser.add_argument("--platform", default="duckdb-local", help="Platform label stored in the results")
+    parser.add_argument("--output", type=Path, default=None, help="Result JSON file")
+    args = parser.parse_args()
+    
+    results = run_throughput(args.scale_factor, args.streams, args.mode, args.threads,
+                             args.queries, args.seed, args.platform)
+    
+    output = args.output or RESULTS_DIR / f"{args.platform}_throughput_sf{args.scale_factor:g}_s{args.streams}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    
+    for stream in results['streams']:
+        print(f"stream {stream['stream']:<3} elapsed {stream['elapsed_s']:8.3f} s   "
+              f"p50 {stream['p50_s'] or 0:7.3f} s   p95 {stream['p95_s'] or 0:7.3f} s   "
+              f"max {stream['max_s'] or 0:7.3f} s   errors {len(stream['errors'])}")
+    
+    print(f"\n{results['queries_completed']} queries in {results['elapsed_s']:.2f} s "
+          f"({results['stream_count']} {results['mode']} streams)")
+    print(f"Queries per hour:     {results['queries_per_hour']:.0f}")
+    print(f"QphH@SF{args.scale_factor:g}:           {results['qphh']:.1f}")
+    print(f"Contention slowdown:  {results['contention_slowdown'] or 0:.2f}x")
+    print(f"Latency spread:       {results['latency_spread'] or 0:.2f} (p95 / p50 of normalized latency)")
+    print(f"-> {output}")
+
+
+if __name__ == "__main__":
+    main()
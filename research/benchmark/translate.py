@@ -0,0 +1,193 @@
+"""
+SQL dialect translation for the benchmark query files.
+The query files are written for Snowflake (DATEADD, CREATE OR REPLACE TABLE
+with quoted names, ...). They are parsed with sqlglot and rendered in the
+dialect of a local engine, so the same files run unchanged on a laptop.
+
+Translations are cached per SQL text in cache/ (whole query files, and the
+blocks of original.sql run by run_blocks.py): the cache key is a hash of the
+SQL text, both dialects and the sqlglot version, so editing a query file or
+upgrading the parser invalidates its entry automatically.
+
+Usage:
+    python translate.py --dialect duckdb --output translated/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import sqlglot
+from sqlglot import exp
+
+
+BENCHMARK_DIR = Path(__file__).parent
+QUERIES_DIR = BENCHMARK_DIR / "queries"
+CACHE_DIR = BENCHMARK_DIR / "cache"
+
+SOURCE_DIALECT = "snowflake"
+
+# Bump when the structure of cached translations changes
+TRANSLATOR_VERSION = 1
+
+_memory_cache: Dict[str, Dict] = {}
+
+
+def translation_key(sql: str, dialect: str, source_dialect: str = SOURCE_DIALECT) -> str:
+    """
+    Cache key of one translation.
+    
+    Args:
+        sql: Source SQL text
+        dialect: Target dialect
+        source_dialect: Dialect the SQL is written in
+    
+    Returns:
+        Hex digest identifying the SQL text, dialects, parser and translator version
+    """
+    digest = hashlib.sha256()
+    for part in (source_dialect, dialect, sqlglot.__version__, str(TRANSLATOR_VERSION), sql):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _referenced_tables(statement: exp.Expression, created: Optional[str]) -> List[str]:
+    """Names of the tables a statement reads, excluding CTEs and its own target."""
+    ctes = {cte.alias_or_name for cte in statement.find_all(exp.CTE)}
+    source = statement.expression if isinstance(statement, exp.Create) else statement
+    tables: Set[str] = set()
+    if source is not None:
+        for table in source.find_all(exp.Table):
+            if table.name and table.name not in ctes and table.name != created:
+                tables.add(table.name)
+    return sorted(tables)
+
+
+def translate_sql(sql: str, dialect: str = "duckdb", source_dialect: str = SOURCE_DIALECT) -> List[Dict]:
+    """
+    Translate a SQL script statement by statement.
+    
+    Args:
+        sql: SQL script in the source dialect
+        dialect: Target dialect (any dialect supported by sqlglot)
+        source_dialect: Dialect the script is written in
+    
+    Returns:
+        List of dictionaries with the translated 'sql', the table it 'creates'
+        (None for other statements) and the tables it 'reads'
+    """
+    statements = []
+    for statement in sqlglot.parse(sql, read=source_dialect):
+        if statement is None:
+            continue
+        
+        created = None
+        if isinstance(statement, exp.Create) and statement.kind == 'TABLE':
+            created = statement.this.name
+        
+        statements.append({
+            'sql': statement.sql(dialect=dialect, pretty=True),
+            'creates': created,
+            'reads': _referenced_tables(statement, created)
+        })
+    return statements
+
+
+def _write_cache(path: Path, translation: Dict) -> None:
+    """Write a cache entry atomically so concurrent workers never read a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(translation, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def translate_text(sql: str, name: str, dialect: str = "duckdb", cache_dir: Optional[Path] = CACHE_DIR) -> Dict:
+    """
+    Translate a SQL text, reusing the cached translation of identical text.
+    
+    Args:
+        sql: SQL script in the source dialect
+        name: Label of the script (query file stem, block name), used in the cache file name
+        dialect: Target dialect
+        cache_dir: Directory of cached translations (None disables the disk cache)
+    
+    Returns:
+        Dictionary with query, dialect, key and statements (see translate_sql)
+    """
+    key = translation_key(sql, dialect)
+    
+    if key in _memory_cache:
+        return _memory_cache[key]
+    
+    cache_path = None
+    if cache_dir is not None:
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'sql'
+        cache_path = Path(cache_dir) / f"{slug}.{dialect}.{key[:16]}.json"
+        if cache_path.exists():
+            translation = json.loads(cache_path.read_text(encoding='utf-8'))
+            _memory_cache[key] = translation
+            return translation
+    
+    translation = {
+        'query': name,
+        'dialect': dialect,
+        'key': key,
+        'statements': translate_sql(sql, dialect)
+    }
+    if cache_path is not None:
+        _write_cache(cache_path, translation)
+    _memory_cache[key] = translation
+    return translation
+
+
+def translate_file(query_file: Path, dialect: str = "duckdb", cache_dir: Optional[Path] = CACHE_DIR) -> Dict:
+    """
+    Translate a query file, reusing the cached translation if the file is unchanged.
+    
+    Args:
+        query_file: SQL file in the source dialect
+        dialect: Target dialect
+        cache_dir: Directory of cached translations (None disables the disk cache)
+    
+    Returns:
+        Dictionary with query, dialect, key and statements (see translate_sql)
+    """
+    sql = Path(query_file).read_text(encoding='utf-8')
+    return translate_text(sql, Path(query_file).stem, dialect, cache_dir)
+
+
+def render_script(translation: Dict) -> str:
+    """Join translated statements into an executable script."""
+    return ''.join(f"{statement['sql']};\n\n" for statement in translation['statements'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate the benchmark query files to a local SQL dialect")
+    parser.add_argument("--dialect", default="duckdb", help="Target sqlglot dialect")
+    parser.add_argument("--queries", default="*.sql", help="Glob of query files in queries/")
+    parser.add_argument("--output", type=Path, default=None, help="Directory for the translated .sql files")
+    args = parser.parse_args()
+    
+    for query_file in sorted(QUERIES_DIR.glob(args.queries)):
+        translation = translate_file(query_file, args.dialect)
+        if args.output:
+            args.output.mkdir(parents=True, exist_ok=True)
+            (args.output / query_file.name).write_text(render_script(translation), encoding='utf-8')
+        created = [s['creates'] for s in translation['statements'] if s['creates']]
+        print(f"{query_file.name:<16} {len(translation['statements']):>3} statements   "
+              f"creates {', '.join(created) or '-'}")
+
+
+if __name__ == "__main__":
+    main()